@@ -7,22 +7,26 @@ ant
 """
 from abc import ABCMeta
 from abc import abstractmethod
+from bisect import bisect_right
+from itertools import accumulate
 
 from math import sqrt
 from numpy import array
-from pygame import Surface
+from pygame import Rect
 
+from ant.agents.mixins import LazySurface
+from ant.agents.trail import Trail
 from ant.settings import ALPHA
 from ant.settings import ANT_WITHOUT_NUTRIENT_COLOR, ANT_WITH_NUTRIENT_COLOR
 from ant.settings import BETA
 from ant.settings import GAMMA
-from ant.settings import GLOBAL_RNG
 from ant.settings import Q
 
 
-class BaseAnt(metaclass=ABCMeta):
+class BaseAnt(LazySurface, metaclass=ABCMeta):
 
     INSTANCES = 0
+    _HEURISTICS = dict()  # (1/distance)**beta per beta and squared distance, shared by all Ants
 
     def __init__(
             self,
@@ -32,38 +36,44 @@ class BaseAnt(metaclass=ABCMeta):
             gamma=GAMMA,
             beta=BETA,
             alpha=ALPHA,
-            q=Q
+            q=Q,
+            memory=None,
+            home=None
     ):
 
-        self._rng = GLOBAL_RNG
+        # a bad memory fails before the Ant takes a name or draws from the spawn stream
+        self._visited = Trail(cell.cells, memory)  # contains visited cells, at most memory of them
+
+        self._streams = cell.streams
         self._name = __class__.INSTANCES
         __class__.INSTANCES += 1
+        self._home = home
 
         self.pos = cell.pos
         self.background = background
 
         width, height = 0.2*rect.width, 0.2*rect.height
 
-        self.surface = Surface((width, height))
-        self.rect = background.get_rect(
-            top=self._rng.uniform(rect.top, rect.bottom - height),
-            left=self._rng.uniform(rect.left, rect.right - width),
-            width=width,
-            height=height
-        )
-        self.x_off, self.y_off = self.rect.left - rect.left, self.rect.top - rect.top
+        # offsets are drawn even if headless, keeps the random stream equal to a rendered run
+        top = self._streams.spawn.uniform(rect.top, rect.bottom - height)
+        left = self._streams.spawn.uniform(rect.left, rect.right - width)
+
+        # only the offsets are kept, surface and rect are allocated on first draw
+        offset = Rect(left, top, width, height)
+        self.x_off, self.y_off = offset.left - rect.left, offset.top - rect.top
+        self._size = offset.size
 
         # algorithm parameter
         self._gamma = gamma
         self._alpha = alpha
         self._beta = beta
         self._q = q
+        self._heuristic = __class__._HEURISTICS.setdefault(beta, dict())
 
         self._mandible = 0
         self._current_cell = cell
         self._movement_cell = None
 
-        self._visited = list()  # contains visited cells
         self._allowed = list()  # allowed movement cells
 
         self._trail_length = 0
@@ -76,6 +86,16 @@ class BaseAnt(metaclass=ABCMeta):
     def move(self, cells):
         pass
 
+    @property
+    def home(self):
+        """:obj:`int`: Id of the Hole which spawned the Ant, None if it has no home."""
+        return self._home
+
+    @property
+    def visited(self):
+        """:obj:`Trail`: Cells visited since the Ant left its Hole."""
+        return self._visited
+
     def mandible_full(self):
         return self._mandible > 0
 
@@ -89,6 +109,10 @@ class BaseAnt(metaclass=ABCMeta):
         self._update_rect()
         self.background.blit(self.surface, self.rect)
 
+    def _make_rect(self):
+        cell = self._current_cell.rect
+        return Rect(cell.left + self.x_off, cell.top + self.y_off, *self._size)
+
     def _update_rect(self):
         dx = (self._current_cell.rect.left + self.x_off) - self.rect.left
         dy = (self._current_cell.rect.top + self.y_off) - self.rect.top
@@ -96,19 +120,45 @@ class BaseAnt(metaclass=ABCMeta):
         self.rect.move_ip(dx, dy)
 
     def _allowed_cells(self, cells):
-        # filter for obstacles
-        self._allowed = list(set(cells) - set(self._visited))
-        self._allowed = list(filter(lambda cell: not cell.has_obstacle(), self._allowed))
+        # keeps the order of cells, a set order depends on the hash seed and a run could not be repeated
+        visited = self._visited
+        self._allowed = [cell for cell in cells if cell not in visited and not cell.has_obstacle()]
 
-    def _probabilities(self, target):
-        probabilities = array([
-            cell.pheromone.intensity ** self._alpha * (1 / __class__.euclidean(cell, target)) ** self._beta
-            if cell.has_pheromone() else
-            self._gamma ** self._alpha * (1 / __class__.euclidean(cell, target)) ** self._beta
-            for cell in self._allowed
-        ])
+    def _weights(self, target):
+        # the distance of a neighbour takes one of few values, its heuristic term is looked up by the
+        # squared distance and computed once per beta, the pheromone term is looked up in the weight layer
+        heuristic, alpha, gamma = self._heuristic, self._alpha, self._gamma
+        x, y = target.pos.x, target.pos.y
+        weights = list()
 
-        return probabilities / probabilities.sum()
+        for cell in self._allowed:
+            squared = (cell.pos.x - x)**2 + (cell.pos.y - y)**2
+            eta = heuristic.get(squared)
+
+            if eta is None:
+                eta = __class__.heuristic(squared, self._beta)
+
+            weights.append(cell.attraction(alpha, gamma) * eta)
+
+        return weights
+
+    @staticmethod
+    def heuristic(squared, beta):
+        """Heuristic term (1/distance)**beta of the movement weight.
+
+        Args:
+            squared (:obj:`int`): Squared distance of the cells.
+            beta (:obj:`float`): Importance move attractiveness.
+
+        Returns:
+            :obj:`float`
+        """
+        cache = __class__._HEURISTICS.setdefault(beta, dict())
+
+        if squared not in cache:
+            cache[squared] = (1 / sqrt(squared + 0.0000001)) ** beta
+
+        return cache[squared]
 
     @staticmethod
     def euclidean(origin, target):
@@ -140,39 +190,72 @@ class SimpleAnt(BaseAnt):
 
     def move(self, cells):
         if self.mandible_full():
-            self._update_pheromone()
-            self._movement_cell = self._visited.pop()
-
-            if self._movement_cell.has_hole() and self._movement_cell.hole.home(self):
-                self._movement_cell.hole.nutrients += self._mandible
-                self._mandible -= 1
-                self._trail_length = 0
+            self._return_home()
 
         else:
             self._visited.append(self._current_cell)
             self._allowed_cells(cells)
             self._select()
+            self._collect()
 
-            if self._movement_cell.has_nutrient() and not self._movement_cell.nutrient.empty():
-                self._mandible += self._movement_cell.nutrient.nutrient_unit
+        self._enter()
 
-        self._current_cell = self._movement_cell
-        self.pos = self._current_cell.pos
+    def forage(self, cell):
+        """Moves a foraging Ant to a pre-selected cell.
+
+        Used by colony steppers which select the movement cells of many Ants at once.
+
+        Args:
+            cell (:obj:`Cell`): The selected cell out of the allowed neighbour cells,
+                None if no neighbour cell is allowed.
+        """
+        self._visited.append(self._current_cell)
+
+        if cell is None:
+            self._dead_end()
+
+        else:
+            self._advance(cell)
+
+        self._collect()
+        self._enter()
+
+    def _return_home(self):
+        self._update_pheromone()
+        self._movement_cell = self._visited.pop()
+
+        if self._movement_cell.has_hole() and self._movement_cell.hole.home(self):
+            self._movement_cell.hole.nutrients += self._mandible
+            self._mandible -= 1
+            self._trail_length = 0
 
     def _select(self):
         if self._allowed:
-            self._movement_cell = self._rng.choice(
-                self._allowed,
-                size=1,
-                p=self._probabilities(self._current_cell)
-            )[0]
+            # inverse transform sampling like ColonyStepper.sample, the uniform comes from the pre-drawn block
+            cumulative = list(accumulate(self._weights(self._current_cell)))
+            selected = bisect_right(cumulative, self._streams.uniform() * cumulative[-1])
 
-            self._trail_length += __class__.euclidean(self._current_cell, self._movement_cell)
+            self._advance(self._allowed[min(selected, len(cumulative) - 1)])
 
         else:
-            self._movement_cell = self._visited[0]
-            self._visited = []
-            self._trail_length = 0
+            self._dead_end()
+
+    def _advance(self, cell):
+        self._movement_cell = cell
+        self._trail_length += __class__.euclidean(self._current_cell, self._movement_cell)
+
+    def _dead_end(self):
+        self._movement_cell = self._visited.origin
+        self._visited.clear()
+        self._trail_length = 0
+
+    def _collect(self):
+        if self._movement_cell.has_nutrient() and not self._movement_cell.nutrient.empty():
+            self._mandible += self._movement_cell.nutrient.nutrient_unit
+
+    def _enter(self):
+        self._current_cell = self._movement_cell
+        self.pos = self._current_cell.pos
 
     def _update_pheromone(self):
         if not self._current_cell.has_pheromone():
@@ -199,7 +282,7 @@ class Ant:
 
         self._name = __class__.INSTANCES
         __class__.INSTANCES += 1
-        self._rng = GLOBAL_RNG
+        self._rng = cell.streams.move
 
         self.pos = cell.pos
         self.rect = Rect(rect.centerx, rect.centery, rect.width/2, rect.height/2)
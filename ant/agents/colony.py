@@ -0,0 +1,447 @@
+"""
+colony
+******
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from numpy import arange
+from numpy import argsort
+from numpy import asarray
+from numpy import concatenate
+from numpy import delete
+from numpy import float64
+from numpy import full
+from numpy import int64
+from numpy import minimum
+from numpy import sqrt
+from numpy import unique
+from numpy import zeros
+from pygame import Rect
+from pygame.draw import rect as square
+
+from ant.agents.ant import BaseAnt
+from ant.agents.trail import TrailSet
+from ant.layers import HOLE
+from ant.layers import NUTRIENT
+from ant.settings import ALPHA
+from ant.settings import ANT_WITHOUT_NUTRIENT_COLOR, ANT_WITH_NUTRIENT_COLOR
+from ant.settings import BETA
+from ant.settings import GAMMA
+from ant.settings import Q
+from ant.settings import RHO
+from ant.stepper import ColonyStepper
+
+
+class Colony:
+    """Structure of arrays storage of SimpleAnts.
+
+    Instead of a Python object per Ant the colony stores the Ant state in NumPy arrays: the flat field
+    index of the current cell, the mandible load, the trail length, the id of the home Hole and the
+    visited cells of each Ant. The visited cells are ring buffers of at most memory cells, the first
+    cell of a trip is kept as origin like in Trail. They are also kept in a hashed set of (Ant, cell)
+    keys, so checking the neighbours of an Ant does not scan its trail. All Ants move in one vectorized step with
+    the same rules as SimpleAnt. Code that needs objects can index the colony, which returns a thin
+    ColonyAnt view, or a list of views for a slice.
+
+    Args:
+        environment (:obj:`Environment`): The environment the Ants move in.
+        gamma (:obj:`float`, optional): Pheromone init value.
+        alpha (:obj:`float`, optional): Importance of pheromone deposit.
+        beta (:obj:`float`, optional): Importance move attractiveness.
+        rho (:obj:`float`, optional): Pheromone decay of a deposit.
+        q (:obj:`float`, optional): Pheromone increment of a deposit.
+        streams (:obj:`RandomStreams`, optional): Random streams of the movement draw, those of the environment by
+            default.
+        capacity (:obj:`int`, optional): Initial number of Ants the arrays can hold.
+        memory (:obj:`int`, optional): Maximal number of cells an Ant remembers of its path, unbounded if None.
+
+    Raises:
+        ValueError: If memory is smaller than one.
+    """
+    def __init__(self, environment, gamma=GAMMA, alpha=ALPHA, beta=BETA, rho=RHO, q=Q, streams=None,
+                 capacity=64, memory=None):
+        if memory is not None and memory < 1:
+            raise ValueError('An Ant has to remember at least one cell, got memory {}'.format(memory))
+
+        self._environment = environment
+        self._rho = rho
+        self._q = q
+        self._streams = environment.streams if streams is None else streams
+        self._stepper = ColonyStepper(environment, gamma, alpha, beta, self._streams)
+
+        self._size = 0
+        self._position = zeros(capacity, dtype=int64)
+        self._mandible = zeros(capacity, dtype=int64)
+        self._trail_length = zeros(capacity, dtype=float64)
+        self._home = zeros(capacity, dtype=int64)
+
+        # visited cells per Ant as ring buffers of flat field indices, unused entries are -1, the head is
+        # the entry written next. Without memory the buffers widen and never wrap.
+        self._memory = memory
+        self._trail = full((capacity, 16 if memory is None else memory), -1, dtype=int64)
+        self._head = zeros(capacity, dtype=int64)
+        self._depth = zeros(capacity, dtype=int64)
+        self._origin = zeros(capacity, dtype=int64)
+        self._forgotten = zeros(capacity, dtype=int64)
+        self._visits = TrailSet()
+
+    @property
+    def position(self):
+        """:obj:`ndarray`: Flat field index of the current cell per Ant."""
+        return self._position[:self._size]
+
+    @property
+    def mandible(self):
+        """:obj:`ndarray`: Nutrient units carried per Ant."""
+        return self._mandible[:self._size]
+
+    @property
+    def trail_length(self):
+        """:obj:`ndarray`: Length of the trail since the Ant left its Hole."""
+        return self._trail_length[:self._size]
+
+    @property
+    def home(self):
+        """:obj:`ndarray`: Id of the home Hole per Ant."""
+        return self._home[:self._size]
+
+    @property
+    def memory(self):
+        """:obj:`int`: Maximal number of cells an Ant remembers of its path, None if unbounded."""
+        return self._memory
+
+    @property
+    def environment(self):
+        """:obj:`Environment`: The environment the Ants move in."""
+        return self._environment
+
+    def spawn(self, cell, n=1):
+        """Spawns Ants on a Cell with a Hole.
+
+        Args:
+            cell (:obj:`Cell`): A Cell with a Hole.
+            n (:obj:`int`, optional): Number of Ants to spawn.
+
+        Returns:
+            :obj:`ndarray`: The indices of the spawned Ants.
+
+        Raises:
+            CellAgentError: If the Cell does not have a Hole.
+        """
+        hole = cell.hole
+        _, cols = self._environment.size
+
+        self._reserve(self._size + n)
+
+        indices = arange(self._size, self._size + n)
+        self._position[indices] = cell.pos.y * cols + cell.pos.x
+        self._mandible[indices] = 0
+        self._trail_length[indices] = 0
+        self._home[indices] = hole.id
+        self._trail[indices] = -1
+        self._head[indices] = 0
+        self._depth[indices] = 0
+        self._origin[indices] = -1
+        self._forgotten[indices] = 0
+        self._size += n
+
+        return indices
+
+    def step(self, indices=None):
+        """Moves Ants one cell.
+
+        All foraging Ants select their movement cells on the field state at the beginning of the step,
+        afterwards Ants with a nutrient deposit their Pheromones and trace back their path.
+
+        Args:
+            indices (:obj:`ndarray`, optional): Indices of the Ants to move, by default all Ants.
+        """
+        indices = arange(self._size) if indices is None else asarray(indices, dtype=int64)
+        loaded = indices[self._mandible[indices] > 0]
+        foraging = indices[self._mandible[indices] == 0]
+
+        if foraging.size:
+            cells = self._position[foraging]
+
+            # the current cell is visited by the upcoming move
+            self._push(foraging)
+
+            neighbours, allowed = self._stepper.neighbourhood(cells)
+            allowed &= ~self._visited(foraging, neighbours)
+
+            weights = self._stepper.attractiveness(cells, neighbours, allowed)
+            selected = ColonyStepper.sample(weights, self._streams.uniforms(foraging.size))
+
+        if loaded.size:
+            self._return_home(loaded)
+
+        if foraging.size:
+            self._forage(foraging, cells, neighbours, selected)
+
+    def _return_home(self, ants):
+        layers = self._environment.layers
+        _, cols = self._environment.size
+
+        self._deposit(self._position[ants], self._trail_length[ants])
+
+        # a cut short path is used up, the Ant returns to its origin directly
+        cut = ants[(self._depth[ants] == 0) & (self._forgotten[ants] > 0)]
+        self._position[cut] = self._origin[cut]
+        self._forgotten[cut] = 0
+
+        ants = ants[self._depth[ants] > 0]
+        self._head[ants] = (self._head[ants] - 1) % self._trail.shape[1]
+        self._depth[ants] -= 1
+        self._position[ants] = self._trail[ants, self._head[ants]]
+        self._trail[ants, self._head[ants]] = -1
+        self._visits.remove(self._keys(ants, self._position[ants]))
+
+        ants = concatenate([cut, ants])
+
+        at_hole = ants[layers.occupancy.reshape(-1)[self._position[ants]] == HOLE]
+
+        for ant in at_hole:
+            hole = layers.holes[divmod(int(self._position[ant]), cols)]
+
+            if hole.id == self._home[ant]:
+                hole.nutrients += int(self._mandible[ant])
+                self._mandible[ant] -= 1
+                self._trail_length[ant] = 0
+
+    def _deposit(self, cells, lengths):
+        layers = self._environment.layers
+        intensity = layers.intensity.reshape(-1)
+        pheromone = layers.pheromone.reshape(-1)
+
+        # Ants sharing a cell deposit one after another like in the per Ant path
+        remaining = arange(cells.size)
+
+        while remaining.size:
+            _, first = unique(cells[remaining], return_index=True)
+            current = remaining[first]
+            targets = cells[current]
+
+            pheromone[targets] = True
+            intensity[targets] = (1 - self._rho) * intensity[targets] + self._q / lengths[current]
+
+            remaining = delete(remaining, first)
+
+        cells = unique(cells)
+        layers.weight.reshape(-1)[cells] = intensity[cells] ** layers.alpha
+        layers.stats.update_many(cells, intensity[cells])
+
+    def _forage(self, ants, cells, neighbours, selected):
+        _, cols = self._environment.size
+
+        dead = selected < 0
+        moved = ants[~dead]
+        targets = neighbours[~dead, selected[~dead]]
+
+        y, x = divmod(cells[~dead], cols)
+        ny, nx = divmod(targets, cols)
+
+        self._trail_length[moved] += sqrt((nx - x)**2 + (ny - y)**2 + 0.0000001)
+        self._position[moved] = targets
+
+        # dead end, the Ant returns to the origin of its trip and forgets its path
+        stuck = ants[dead]
+        self._position[stuck] = self._origin[stuck]
+        self._forget(stuck)
+        self._trail_length[stuck] = 0
+
+        self._collect(ants)
+
+    def _collect(self, ants):
+        layers = self._environment.layers
+        occupancy = layers.occupancy.reshape(-1)
+        amount = layers.amount.reshape(-1)
+
+        ants = ants[occupancy[self._position[ants]] == NUTRIENT]
+
+        if not ants.size:
+            return
+
+        # Ants entering the same Nutrient take one unit each in order until the Nutrient is empty
+        ants = ants[argsort(self._position[ants], kind='stable')]
+        cells = self._position[ants]
+        targets, first, counts = unique(cells, return_index=True, return_counts=True)
+        rank = arange(ants.size) - first.repeat(counts)
+
+        self._mandible[ants[rank < amount[cells]]] += 1
+        amount[targets] -= minimum(counts, amount[targets])
+
+    def trail(self, index):
+        """Visited cells of an Ant.
+
+        Args:
+            index (:obj:`int`): Index of the Ant.
+
+        Returns:
+            :obj:`ndarray`: Flat field indices of the visited cells, oldest first.
+        """
+        width = self._trail.shape[1]
+        return self._trail[index, (self._head[index] - self._depth[index] + arange(self._depth[index])) % width]
+
+    def _push(self, ants):
+        needed = self._depth[ants].max() + 1
+
+        # without memory a buffer keeps a free entry, its head never wraps and widening keeps the order
+        if self._memory is None and needed >= self._trail.shape[1]:
+            width = self._trail.shape[1]
+
+            while width <= needed:
+                width *= 2
+
+            grown = full((self._trail.shape[0], width), -1, dtype=int64)
+            grown[:, :self._trail.shape[1]] = self._trail
+            self._trail = grown
+
+        width = self._trail.shape[1]
+        cells = self._position[ants]
+
+        fresh = ants[(self._depth[ants] == 0) & (self._forgotten[ants] == 0)]
+        self._origin[fresh] = self._position[fresh]
+
+        # a full buffer forgets its oldest cell, which is the one under the head
+        overflow = ants[self._depth[ants] == width]
+        self._visits.remove(self._keys(overflow, self._trail[overflow, self._head[overflow]]))
+        self._forgotten[overflow] += 1
+
+        self._trail[ants, self._head[ants]] = cells
+        self._head[ants] = (self._head[ants] + 1) % width
+        self._depth[ants] = minimum(self._depth[ants] + 1, width)
+        self._visits.add(self._keys(ants, cells))
+
+    def _visited(self, ants, cells):
+        return self._visits.contains(self._keys(ants[:, None], cells))
+
+    def _forget(self, ants):
+        trail = self._trail[ants]
+        visited = trail >= 0
+
+        self._visits.remove(self._keys(ants[:, None].repeat(trail.shape[1], axis=1)[visited], trail[visited]))
+        self._trail[ants] = -1
+        self._head[ants] = 0
+        self._depth[ants] = 0
+        self._origin[ants] = -1
+        self._forgotten[ants] = 0
+
+    def _index(self):
+        # rebuilds the visited set from the trails, e.g. after the arrays were restored
+        trail = self._trail[:self._size]
+        ants, _ = (trail >= 0).nonzero()
+
+        self._visits.clear()
+        self._visits.add(self._keys(ants, trail[trail >= 0]))
+
+    def _keys(self, ants, cells):
+        rows, cols = self._environment.size
+        return ants * (rows * cols) + cells
+
+    def _reserve(self, capacity):
+        if capacity <= self._position.size:
+            return
+
+        size = self._position.size
+
+        while size < capacity:
+            size *= 2
+
+        for attr in ['_position', '_mandible', '_trail_length', '_home', '_head', '_depth', '_origin', '_forgotten']:
+            old = self.__getattribute__(attr)
+            new = zeros(size, dtype=old.dtype)
+            new[:old.size] = old
+            self.__setattr__(attr, new)
+
+        trail = full((size, self._trail.shape[1]), -1, dtype=int64)
+        trail[:self._trail.shape[0]] = self._trail
+        self._trail = trail
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, item):
+        indices = range(self._size)[item]
+
+        if isinstance(item, slice):
+            return [ColonyAnt(self, idx) for idx in indices]
+
+        return ColonyAnt(self, indices)
+
+    def __iter__(self):
+        return (ColonyAnt(self, idx) for idx in range(self._size))
+
+    def __repr__(self):
+        return '<{}(ants={}) at {}>'.format(__class__.__name__, self._size, hex(id(self)))
+
+
+class ColonyAnt:
+    """View of a single Ant of a Colony.
+
+    Provides the BaseAnt interface for code that needs Ant objects, the state stays in the Colony arrays.
+
+    Args:
+        colony (:obj:`Colony`): The colony storing the Ant.
+        index (:obj:`int`): Index of the Ant in the colony.
+    """
+    def __init__(self, colony, index):
+        self._colony = colony
+        self._index = index
+
+    @property
+    def pos(self):
+        """:obj:`Position`: Position of the current cell."""
+        return self._colony.environment.get_flat_position(int(self._colony.position[self._index]))
+
+    @property
+    def home(self):
+        """:obj:`int`: Id of the Hole which spawned the Ant."""
+        return int(self._colony.home[self._index])
+
+    @property
+    def visited(self):
+        """:obj:`list(Cell)`: Cells visited since the Ant left its Hole."""
+        environment = self._colony.environment
+        return [environment.get_flat_cell(int(cell)) for cell in self._colony.trail(self._index)]
+
+    def collide(self, cells):
+        pass
+
+    def move(self, cells):
+        """Moves the Ant one cell, the neighbour cells are determined by the colony."""
+        self._colony.step([self._index])
+
+    def mandible_full(self):
+        return self._colony.mandible[self._index] > 0
+
+    def draw(self):
+        cell = self._colony.environment.get_cell(self.pos)
+        width, height = 0.2 * cell.rect.width, 0.2 * cell.rect.height
+
+        rect = Rect(0, 0, width, height)
+        rect.center = cell.rect.center
+
+        color = ANT_WITH_NUTRIENT_COLOR if self.mandible_full() else ANT_WITHOUT_NUTRIENT_COLOR
+        square(self._colony.environment.background, color, rect)
+
+    def __eq__(self, other):
+        if isinstance(other, ColonyAnt):
+            return self._colony is other._colony and self._index == other._index
+
+        return False
+
+    def __hash__(self):
+        return hash((self.__class__.__name__, id(self._colony), self._index))
+
+    def __str__(self):
+        return '{}{} POS{} -> NUTRIENT {}u'.format(self.__class__.__name__, self._index,
+                                                   str(self.pos), self._colony.mandible[self._index])
+
+    def __repr__(self):
+        return '<{}(index={}, colony={}) at {}>'.format(
+            self.__class__.__name__, self._index, self._colony, hex(id(self))
+        )
+
+
+BaseAnt.register(ColonyAnt)
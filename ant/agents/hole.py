@@ -5,15 +5,16 @@ hole
 :Author: tobijjah
 :Date: 31.05.19
 """
-from pygame import Surface
+from pygame import Rect
 from pygame.draw import circle
 
 from ant.agents.ant import SimpleAnt
+from ant.agents.mixins import LazySurface
 from ant.settings import BG_COLOR
 from ant.settings import HOLE_COLOR
 
 
-class Hole:
+class Hole(LazySurface):
     """
 
     Args:
@@ -21,7 +22,7 @@ class Hole:
         surface (:obj:`Surface`): The surface to draw the Hole on.
 
     Attributes:
-        ants (:obj:`list(Ant)`):
+        ants (:obj:`list(Ant)`): The Ants spawned by the Hole.
         rect (:obj:`Rect`): The position of the Hole on the display.
         surface (:obj:`Surface`): The surface to draw the Hole on.
     """
@@ -32,19 +33,21 @@ class Hole:
         __class__.INSTANCES += 1
 
         self.ants = []
+        self._count = 0
         self._nutrients = 0
 
         self.background = background
+        self._width, self._height = width, height
 
-        dwidth, dheight = .9*width, .9*height
+    @property
+    def id(self):
+        """:obj:`int`: Unique id of the Hole."""
+        return self._name
 
-        self.surface = Surface((dwidth, dheight))
-        self.rect = self.surface.get_rect(
-            height=dheight,
-            width=dwidth,
-            centerx=width/2,
-            centery=height/2
-        )
+    @property
+    def count(self):
+        """:obj:`int`: Number of Ants spawned by the Hole."""
+        return self._count
 
     @property
     def nutrients(self):
@@ -52,7 +55,13 @@ class Hole:
 
     @nutrients.setter
     def nutrients(self, value):
-        self._nutrients += value
+        self._nutrients = value
+
+    def _make_rect(self):
+        rect = Rect(0, 0, .9*self._width, .9*self._height)
+        rect.center = self._width/2, self._height/2
+
+        return rect
 
     def draw(self):
         self.surface.fill(BG_COLOR)
@@ -60,19 +69,30 @@ class Hole:
         self.background.blit(self.surface, self.rect)
 
     def spawn_ant(self, position, rect, surface, **kwargs):
-        ant = SimpleAnt(position, rect, surface, **kwargs)
+        ant = SimpleAnt(position, rect, surface, home=self._name, **kwargs)
         self.ants.append(ant)
+        self._count += 1
 
         return ant
 
     def home(self, ant):
-        return ant in self.ants
+        """Is the Hole the home of an Ant?
+
+        Compares the home id the Ant carries, constant time regardless of the number of Ants.
+
+        Args:
+            ant (:obj:`Ant`): The Ant.
+
+        Returns:
+            :obj:`bool`
+        """
+        return ant.home == self._name
 
     def __hash__(self):
         return hash((__class__.__name__, self._name))
 
     def __str__(self):
-        return '{} {}a {}u'.format(__class__.__name__, len(self.ants), self._nutrients)
+        return '{} {}a {}u'.format(__class__.__name__, self._count, self._nutrients)
 
     def __repr__(self):
         return '<{}(name={}) at {}>'.format(__class__.__name__, self._name, hex(id(self)))
\ No newline at end of file
@@ -5,6 +5,36 @@ mixins
 :Author: tobijjah
 :Date: 02.06.19
 """
+from pygame import Surface
+
+
+class LazySurface:
+    """Allocates the surface and rect of a drawable agent on first access.
+
+    Agents which are never drawn, e.g. in headless runs or off display, allocate nothing. Classes
+    implement _make_rect which returns the rect of the agent on its background.
+    """
+    _surface = None
+    _rect = None
+
+    @property
+    def rect(self):
+        """:obj:`Rect`: The position of the agent on its background."""
+        if self._rect is None:
+            self._rect = self._make_rect()
+
+        return self._rect
+
+    @property
+    def surface(self):
+        """:obj:`Surface`: The surface of the agent."""
+        if self._surface is None:
+            self._surface = Surface(self.rect.size)
+
+        return self._surface
+
+    def _make_rect(self):
+        raise NotImplementedError
 
 
 class AlphaGradient:
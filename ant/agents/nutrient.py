@@ -5,14 +5,17 @@ nutrient
 :Author: tobijjah
 :Date: 31.05.19
 """
-from pygame import Surface
+from numpy import int64
+from numpy import zeros
+from pygame import Rect
 
 from ant.agents.mixins import AlphaGradient
+from ant.agents.mixins import LazySurface
 from ant.errors import NutrientEmptyError
 from ant.settings import NUTRIENT_COLOR
 
 
-class Nutrient(AlphaGradient):
+class Nutrient(AlphaGradient, LazySurface):
     """Nutrient is collected by Ants.
 
     Ants search for Nutrients. Each Ant can collect one Nutrient unit.
@@ -22,23 +25,23 @@ class Nutrient(AlphaGradient):
         amount (:obj:`int`): The amount of nutrient units.
         rect (:obj:`Rect`): The position of the Nutrient on the display.
         surface (:obj:`Surface`): The surface to draw the Nutrient on.
+        store (:obj:`ndarray`, optional): Array which stores the amount, e.g. the amount layer of the field.
+        index (:obj:`tuple(int, int)`, optional): Index of the amount in store.
 
     Attributes:
         rect (:obj:`Rect`): The position of the Nutrient on the display.
         surface (:obj:`Surface`): The surface to draw the Nutrient on.
     """
-    def __init__(self, amount, background, width, height):
+    def __init__(self, amount, background, width, height, store=None, index=0):
         self.background = background
 
-        width, height = width/2, height/2
+        if store is None:
+            store = zeros(1, dtype=int64)
 
-        self.surface = Surface((width, height))
-        self.rect = self.surface.get_rect(
-            width=width,
-            height=height,
-            centerx=width,
-            centery=height
-        )
+        self._store = store
+        self._index = index
+
+        self._width, self._height = width, height
 
         self._amount = int(abs(amount))
 
@@ -48,6 +51,14 @@ class Nutrient(AlphaGradient):
         self._ymin = 0
         self._ymax = 255
 
+    @property
+    def _amount(self):
+        return self._store[self._index]
+
+    @_amount.setter
+    def _amount(self, value):
+        self._store[self._index] = value
+
     @property
     def nutrient_unit(self):
         """:obj:`int`: Get a Nutrient unit."""
@@ -57,6 +68,12 @@ class Nutrient(AlphaGradient):
 
         raise NutrientEmptyError()
 
+    def _make_rect(self):
+        rect = Rect(0, 0, self._width/2, self._height/2)
+        rect.center = self._width/2, self._height/2
+
+        return rect
+
     def draw(self):
         """Draw Nutrient on surface."""
         self.surface.fill(NUTRIENT_COLOR)
@@ -5,24 +5,22 @@ obstacle
 :Author: tobijjah
 :Date: 03.06.19
 """
-from pygame import Surface
+from pygame import Rect
 
+from ant.agents.mixins import LazySurface
 from ant.settings import OBSTACLE_COLOR
 
 
-class Obstacle:
+class Obstacle(LazySurface):
     def __init__(self, background, width, height):
         self.background = background
+        self._width, self._height = width, height
 
-        dwidth, dheight = .9*width, .9*height
+    def _make_rect(self):
+        rect = Rect(0, 0, .9*self._width, .9*self._height)
+        rect.center = self._width/2, self._height/2
 
-        self.surface = Surface((dwidth, dheight))
-        self.rect = self.surface.get_rect(
-            width=dwidth,
-            height=dheight,
-            centerx=width/2,
-            centery=height/2
-        )
+        return rect
 
     def draw(self):
         self.surface.fill(OBSTACLE_COLOR)
@@ -5,16 +5,18 @@ pheromone
 :Author: tobijjah
 :Date: 31.05.19
 """
-from pygame import Surface
+from numpy import full
+from pygame import Rect
 
 from ant.agents.mixins import AlphaGradient
+from ant.agents.mixins import LazySurface
 from ant.settings import GAMMA
 from ant.settings import PHEROMONE_COLOR
 from ant.settings import Q
 from ant.settings import RHO
 
 
-class Pheromone(AlphaGradient):
+class Pheromone(AlphaGradient, LazySurface):
     """Pheromone control Ant movement.
 
     Pheromone are placed by Ants on cells during their movement through the environment.
@@ -26,48 +28,64 @@ class Pheromone(AlphaGradient):
         surface (:obj:`Surface`): The surface to draw the Pheromone on.
         steepness (:obj:`float`, optional): The steepness of the sigmoid function.
         rel_tol (:obj:`float`, optional): Relative tolerance to 1.
+        layers (:obj:`FieldLayers`, optional): Layers which store the intensity, their stats normalize the alpha on
+            display. A standalone Pheromone stores its intensity itself.
+        index (:obj:`tuple(int, int)`, optional): Index of the cell in layers.
 
     Attributes:
         intensity (:obj:`float`): Current intensity of the Pheromone.
         rect (:obj:`Rect`): The position of the Pheromone on the display.
         surface (:obj:`Surface`): The surface to draw the Pheromone on.
     """
-
-    MIN_INTENSITY = GAMMA
-    MAX_INTENSITY = GAMMA
-
-    def __init__(self, background, width, height, gamma=GAMMA, q=Q, rho=RHO):
-        self.intensity = GAMMA
+    def __init__(self, background, width, height, gamma=GAMMA, q=Q, rho=RHO, layers=None, index=0):
+        self._layers = layers
+        self._store = full(1, gamma) if layers is None else layers.intensity
+        self._index = index
 
         self.background = background
-
-        dwidth, dheight = 0.8*width, 0.8*height
-
-        self.surface = Surface((dwidth, dheight))
-        self.rect = self.surface.get_rect(
-            width=dwidth,
-            height=dheight,
-            centerx=width/2,
-            centery=height/2,
-        )
+        self._width, self._height = width, height
 
         self._q = q
         self._gamma = gamma
         self._rho = rho
 
-        self._xmin = __class__.MIN_INTENSITY
-        self._xmax = __class__.MAX_INTENSITY
+        self._xmin = gamma
+        self._xmax = gamma
         self._ymin = 0
         self._ymax = 255
 
+    @property
+    def intensity(self):
+        """:obj:`float`: Current intensity of the Pheromone."""
+        return self._store[self._index]
+
+    @intensity.setter
+    def intensity(self, value):
+        if self._layers is None:
+            self._store[self._index] = value
+
+        else:
+            self._layers.set_intensity(self._index, value)  # keeps weight and stats of the field up to date
+
+    def _make_rect(self):
+        rect = Rect(0, 0, 0.8*self._width, 0.8*self._height)
+        rect.center = self._width/2, self._height/2
+
+        return rect
+
     def draw(self):
         """Draw Pheromone on surface."""
         self.surface.fill(PHEROMONE_COLOR)
 
-        self._xmin = __class__.MIN_INTENSITY
-        self._xmax = __class__.MAX_INTENSITY
+        if self._layers is not None:
+            self._xmin, self._xmax = self._layers.stats.min, self._layers.stats.max
 
-        self.surface.set_alpha(int(self.get_alpha(self.intensity)))
+        else:
+            self._xmin = self._xmax = self.intensity
+
+        # the only or all equally strong Pheromones are drawn opaque
+        alpha = self.get_alpha(self.intensity) if self._xmax > self._xmin else self._ymax
+        self.surface.set_alpha(int(alpha))
 
         self.background.blit(self.surface, self.rect)
 
@@ -77,16 +95,10 @@ class Pheromone(AlphaGradient):
         Args:
             amount (:obj:`float`): Increase Pheromone intensity by this amount
         """
-        self.intensity = (1-RHO) * self.intensity + 1/length
-
-        if self.intensity > __class__.MAX_INTENSITY:
-            __class__.MAX_INTENSITY = self.intensity
-
-        if self.intensity < __class__.MIN_INTENSITY:
-            __class__.MIN_INTENSITY = self.intensity
+        self.intensity = (1-self._rho) * self.intensity + self._q/length
 
     def decoy(self):
-        self.intensity = (1-RHO) * self.intensity
+        self.intensity = (1-self._rho) * self.intensity
 
     def __str__(self):
         return '{} {}i'.format(__class__.__name__, self.intensity)
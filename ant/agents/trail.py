@@ -0,0 +1,322 @@
+"""
+trail
+*****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from array import array
+
+from numpy import arange
+from numpy import asarray
+from numpy import bool_
+from numpy import count_nonzero
+from numpy import full
+from numpy import int64
+from numpy import uint64
+from numpy import unique
+from numpy import zeros
+
+# slot markers of TrailSet, keys are non negative
+EMPTY = -1
+DELETED = -2
+
+
+class Trail:
+    """Path memory of an Ant.
+
+    The flat field indices of the visited Cells are kept in a ring buffer of machine integers, with a
+    capacity the oldest Cell is forgotten once the buffer is full, without one the buffer widens. A
+    count per flat field index is maintained alongside, the membership check is therefore O(1) instead
+    of a scan of the path. Cells are resolved from their indices only when the path is traced back. The
+    first Cell of a trip, the origin, is kept even if it was forgotten, an Ant whose path was cut short
+    returns to it directly once the remembered Cells are used up.
+
+    Args:
+        cells (:obj:`callable`): Returns the Cell at a flat field index, e.g. Environment.get_flat_cell.
+        capacity (:obj:`int`, optional): Maximal number of remembered Cells, unbounded if None.
+
+    Attributes:
+        forgotten (:obj:`int`): Number of Cells of the current trip which were forgotten.
+
+    Raises:
+        ValueError: If capacity is smaller than one.
+    """
+    def __init__(self, cells, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError('A trail has to remember at least one cell, got capacity {}'.format(capacity))
+
+        self._cells = cells
+        self._capacity = capacity
+        self._ring = array('q', bytes(8 * (16 if capacity is None else capacity)))
+        self._head = 0  # entry written next
+        self._length = 0
+        self._counts = dict()
+        self._origin = None
+
+        self.forgotten = 0
+
+    @property
+    def capacity(self):
+        """:obj:`int`: Maximal number of remembered Cells, None if unbounded."""
+        return self._capacity
+
+    @property
+    def origin(self):
+        """:obj:`Cell`: First Cell of the current trip, None if no trip started."""
+        return None if self._origin is None else self._cells(self._origin)
+
+    @origin.setter
+    def origin(self, cell):
+        self._origin = None if cell is None else cell.flat
+
+    def visits(self, index, append=None):
+        """Is a cell part of the remembered path?
+
+        Args:
+            index (:obj:`int`): Flat field index of the cell.
+            append (:obj:`int`, optional): Flat field index of a cell about to be appended, the check then
+                applies to the path after the append, which forgets the oldest cell of a full trail.
+
+        Returns:
+            :obj:`bool`
+        """
+        if append is None:
+            return index in self._counts
+
+        if index == append:
+            return True
+
+        count = self._counts.get(index, 0)
+
+        if self._length == self._capacity and self._ring[self._head] == index:
+            count -= 1
+
+        return count > 0
+
+    def append(self, cell):
+        """Remembers a visited Cell, forgets the oldest one if the trail is full.
+
+        Args:
+            cell (:obj:`Cell`): The visited Cell.
+        """
+        index = cell.flat
+
+        if not self._length and not self.forgotten:
+            self._origin = index
+
+        elif self._length == self._capacity:
+            # the head of a full ring is the oldest entry
+            self._forget(self._ring[self._head])
+            self._length -= 1
+            self.forgotten += 1
+
+        elif self._length == len(self._ring):
+            # an unbounded ring never wrapped, its entries are in order once the head is back at zero
+            self._head = self._length
+            self._ring.frombytes(bytes(8 * self._length))
+
+        self._ring[self._head] = index
+        self._head = (self._head + 1) % len(self._ring)
+        self._length += 1
+        self._counts[index] = self._counts.get(index, 0) + 1
+
+    def pop(self):
+        """Takes the latest Cell of the path, the origin once a cut short path is used up.
+
+        Returns:
+            :obj:`Cell`: The Cell.
+
+        Raises:
+            IndexError: If the trail is empty.
+        """
+        if self._length:
+            self._head = (self._head - 1) % len(self._ring)
+            self._length -= 1
+            index = self._ring[self._head]
+            self._forget(index)
+
+        elif self.forgotten:
+            index, self.forgotten = self._origin, 0
+
+        else:
+            raise IndexError('pop from an empty trail')
+
+        return self._cells(index)
+
+    def clear(self):
+        """Forgets the path and the origin."""
+        self._head = self._length = 0
+        self._counts.clear()
+
+        self._origin = None
+        self.forgotten = 0
+
+    def _forget(self, index):
+        count = self._counts[index] - 1
+
+        if count:
+            self._counts[index] = count
+
+        else:
+            del self._counts[index]
+
+    def __contains__(self, cell):
+        return cell.flat in self._counts
+
+    def __iter__(self):
+        size = len(self._ring)
+        start = self._head - self._length
+
+        return (self._cells(self._ring[(start + idx) % size]) for idx in range(self._length))
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return '<{}(capacity={}, cells={}) at {}>'.format(
+            __class__.__name__, self._capacity, self._length, hex(id(self))
+        )
+
+
+class TrailSet:
+    """Hashed multiset of integer keys, the visited cells of the Ants of a Colony.
+
+    The keys combine the index of an Ant and the flat field index of a visited cell. They are stored by
+    open addressing with linear probing in NumPy arrays, each operation takes an array of keys and runs
+    vectorized. The cost of an operation therefore depends on the number of keys passed and not on the
+    length of the trails. A key is stored with a count, an Ant can visit a cell again once it was
+    forgotten. The table is rebuilt at twice the size once half of its slots are used.
+
+    Args:
+        capacity (:obj:`int`, optional): Initial number of slots, rounded up to a power of two.
+    """
+    def __init__(self, capacity=1024):
+        size = 1
+
+        while size < capacity:
+            size *= 2
+
+        self._keys = full(size, EMPTY, dtype=int64)
+        self._counts = zeros(size, dtype=int64)
+        self._used = 0  # slots which are not empty, including deleted ones
+        self._size = 0
+
+    def contains(self, keys):
+        """Are the keys in the set?
+
+        Args:
+            keys (:obj:`ndarray`): Non negative keys of any shape.
+
+        Returns:
+            :obj:`ndarray`: True per key in the set, of the shape of keys.
+        """
+        keys = asarray(keys, dtype=int64)
+        return (self._find(keys.reshape(-1)) >= 0).reshape(keys.shape)
+
+    def add(self, keys):
+        """Adds keys, a key which is already in the set is counted once more.
+
+        Args:
+            keys (:obj:`ndarray`): Non negative keys.
+        """
+        keys, counts = unique(asarray(keys, dtype=int64), return_counts=True)
+        slots = self._find(keys)
+
+        found = slots >= 0
+        self._counts[slots[found]] += counts[found]
+
+        keys, counts = keys[~found], counts[~found]
+
+        if 2 * (self._used + keys.size) > self._keys.size:
+            self._rebuild(self._size + keys.size)
+
+        self._insert(keys, counts)
+
+    def remove(self, keys):
+        """Removes keys, a key leaves the set once its count drops to zero. Missing keys are ignored.
+
+        Args:
+            keys (:obj:`ndarray`): Non negative keys.
+        """
+        keys, counts = unique(asarray(keys, dtype=int64), return_counts=True)
+        slots = self._find(keys)
+        slots, counts = slots[slots >= 0], counts[slots >= 0]
+
+        self._counts[slots] -= counts
+        gone = slots[self._counts[slots] <= 0]
+
+        self._keys[gone] = DELETED
+        self._counts[gone] = 0
+        self._size -= gone.size
+
+    def clear(self):
+        """Removes all keys."""
+        self._keys[:] = EMPTY
+        self._counts[:] = 0
+        self._used = self._size = 0
+
+    def _slots(self, keys):
+        # fibonacci hashing, the upper bits of the product spread consecutive keys over the table
+        bits = self._keys.size.bit_length() - 1
+        product = keys.astype(uint64) * uint64(0x9E3779B97F4A7C15)
+
+        return (product >> uint64(64 - bits)).astype(int64) if bits else zeros(keys.size, dtype=int64)
+
+    def _find(self, keys):
+        mask = self._keys.size - 1
+        slots = self._slots(keys)
+        found = full(keys.size, -1, dtype=int64)
+        pending = arange(keys.size)
+
+        while pending.size:
+            probe = self._keys[slots[pending]]
+            hit = probe == keys[pending]
+            found[pending[hit]] = slots[pending[hit]]
+
+            pending = pending[~hit & (probe != EMPTY)]
+            slots[pending] = (slots[pending] + 1) & mask
+
+        return found
+
+    def _insert(self, keys, counts):
+        mask = self._keys.size - 1
+        slots = self._slots(keys)
+        pending = arange(keys.size)
+
+        while pending.size:
+            free = pending[self._keys[slots[pending]] < 0]
+
+            # keys probing the same free slot, the first one takes it
+            _, first = unique(slots[free], return_index=True)
+            taken = free[first]
+            targets = slots[taken]
+
+            self._used += count_nonzero(self._keys[targets] == EMPTY)
+            self._keys[targets] = keys[taken]
+            self._counts[targets] = counts[taken]
+            self._size += taken.size
+
+            placed = zeros(keys.size, dtype=bool_)
+            placed[taken] = True
+            pending = pending[~placed[pending]]
+            slots[pending] = (slots[pending] + 1) & mask
+
+    def _rebuild(self, size):
+        live = self._keys >= 0
+        keys, counts = self._keys[live], self._counts[live]
+        capacity = self._keys.size
+
+        while 4 * size > capacity:
+            capacity *= 2
+
+        self._keys = full(capacity, EMPTY, dtype=int64)
+        self._counts = zeros(capacity, dtype=int64)
+        self._used = self._size = 0
+        self._insert(keys, counts)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return '<{}(keys={}, slots={}) at {}>'.format(__class__.__name__, self._size, self._keys.size, hex(id(self)))
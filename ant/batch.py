@@ -0,0 +1,135 @@
+"""
+batch
+*****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from time import perf_counter
+
+from numpy.random import SeedSequence
+
+from ant.agents.ant import BaseAnt
+from ant.agents.hole import Hole
+from ant.monitor import Monitor
+from ant.settings import ALPHA
+from ant.settings import BETA
+from ant.settings import GAMMA
+from ant.settings import Q
+from ant.settings import RHO
+from ant.simulation import Simulation
+
+PARAMETERS = {
+    'alpha': ALPHA,
+    'beta': BETA,
+    'gamma': GAMMA,
+    'rho': RHO,
+    'q': Q,
+    'memory': None,
+    'size': (30, 30),
+    'neighbours': 4,
+    'torus': False,
+    'ants': 10,
+    'holes': 1,
+    'nutrients': 1,
+    'amount': 10000,
+}
+""":obj:`dict`: Parameters of a run and their defaults."""
+
+
+def grid(**axes):
+    """Builds the parameter sets of a sweep.
+
+    Each keyword is a parameter of PARAMETERS and its values, the parameter sets are all combinations
+    of the values. Parameters without values keep their default.
+
+    Args:
+        **axes: Values per parameter, e.g. alpha=(1., 1.3), size=((30, 30), (100, 100)).
+
+    Returns:
+        :obj:`list(dict)`: The parameter sets in the order of itertools.product.
+
+    Raises:
+        ValueError: If a keyword is not a parameter.
+    """
+    unknown = set(axes) - set(PARAMETERS)
+
+    if unknown:
+        raise ValueError('Unknown parameters {}'.format(', '.join(sorted(unknown))))
+
+    names = list(axes)
+    sets = list()
+
+    for values in product(*(axes[name] for name in names)):
+        params = dict(PARAMETERS)
+        params.update(zip(names, values))
+        sets.append(params)
+
+    return sets
+
+
+def run(sets, ticks=1000, workers=None, seed=0):
+    """Runs headless simulations of many parameter sets in parallel.
+
+    Each run is executed in a worker process with its own random stream, which is derived from seed
+    and the index of the parameter set. The results therefore neither depend on the number of workers
+    nor on the order in which the runs finish.
+
+    Args:
+        sets (:obj:`list(dict)`): Parameter sets, e.g. returned by grid.
+        ticks (:obj:`int`, optional): Number of simulated ticks per run.
+        workers (:obj:`int`, optional): Number of worker processes, all cores by default.
+        seed (:obj:`int`, optional): Root seed of the random streams.
+
+    Returns:
+        :obj:`list(dict)`: One result row per parameter set in the order of sets.
+    """
+    count = len(sets)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(simulate, sets, [ticks] * count, [seed] * count, range(count)))
+
+
+def simulate(params, ticks=1000, seed=0, index=0):
+    """Runs one headless simulation.
+
+    The random streams of the simulation are seeded with SeedSequence(seed, spawn_key=(index,)) and the
+    instance counters are reset, the run is therefore reproducible in any process.
+
+    Args:
+        params (:obj:`dict`): Parameters, missing ones keep the defaults of PARAMETERS.
+        ticks (:obj:`int`, optional): Number of simulated ticks.
+        seed (:obj:`int`, optional): Root seed of the random streams.
+        index (:obj:`int`, optional): Index of the random stream.
+
+    Returns:
+        :obj:`dict`: The parameters, the metrics of Monitor.sample after the last tick, the total of
+        the collected nutrients and the runtime in seconds.
+    """
+    params = dict(PARAMETERS, **params)
+
+    Hole.INSTANCES = BaseAnt.INSTANCES = 0
+
+    rows, cols = params['size']
+    start = perf_counter()
+
+    simulation = Simulation((rows, cols), params['neighbours'], params['torus'], rho=params['rho'],
+                            floor=params['gamma'], alpha=params['alpha'], beta=params['beta'],
+                            gamma=params['gamma'], q=params['q'], rng=SeedSequence(seed, spawn_key=(index,)),
+                            memory=params['memory'])
+    simulation.populate(params['holes'], params['nutrients'], params['ants'], params['amount'])
+    simulation.step(ticks)
+
+    seconds = perf_counter() - start
+    metrics = Monitor.sample(simulation)
+    layers = simulation.environment.layers
+
+    row = {'index': index, 'seed': seed, 'rows': rows, 'cols': cols}
+    row.update((name, value) for name, value in params.items() if name != 'size')
+    row.update(metrics)
+    row['collected'] = sum(hole.nutrients for hole in layers.holes.values())
+    row['seconds'] = seconds
+
+    return row
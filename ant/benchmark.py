@@ -0,0 +1,189 @@
+"""
+benchmark
+*********
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import platform
+import tracemalloc
+from itertools import product
+from time import perf_counter
+
+import numpy
+from affine import Affine
+from numpy import percentile
+from pygame import Surface
+
+import ant
+from ant.environment import Environment
+from ant.environment import Position
+from ant.simulation import Simulation
+
+SIZES = ((30, 30), (100, 100), (300, 300))
+""":obj:`tuple`: Default field sizes of the benchmark matrix."""
+
+ANTS = (10, 100, 1000)
+""":obj:`tuple`: Default ant counts of the benchmark matrix."""
+
+NEIGHBOURS = (4, 8)
+""":obj:`tuple`: Default neighbourhoods of the benchmark matrix."""
+
+TORUS = (False, True)
+""":obj:`tuple`: Default torus modes of the benchmark matrix."""
+
+
+def run(sizes=SIZES, ants=ANTS, neighbours=NEIGHBOURS, torus=TORUS, ticks=100, calls=1000, **kwargs):
+    """Runs the simulation benchmark matrix and the hot path benchmarks.
+
+    Args:
+        sizes (:obj:`iterable(tuple(int, int))`, optional): Field sizes.
+        ants (:obj:`iterable(int)`, optional): Number of Ants.
+        neighbours (:obj:`iterable(int)`, optional): Neighbourhoods, four or eight.
+        torus (:obj:`iterable(bool)`, optional): Torus modes.
+        ticks (:obj:`int`, optional): Simulated ticks per matrix entry.
+        calls (:obj:`int`, optional): Calls per hot path.
+        **kwargs: Further Simulation arguments, e.g. storage or batched.
+
+    Returns:
+        :obj:`dict`: The machine info and the results, serializable as JSON.
+    """
+    simulations = [
+        simulation(size, n, rule, wrap, ticks, **kwargs)
+        for size, n, rule, wrap in product(sizes, ants, neighbours, torus)
+    ]
+    paths = [
+        hot_paths(size, rule, wrap, calls)
+        for size, rule, wrap in product(sizes, neighbours, torus)
+    ]
+
+    return {
+        'version': ant.__version__,
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'machine': platform.machine(),
+        'simulations': simulations,
+        'hot_paths': paths,
+    }
+
+
+def simulation(size, ants, neighbours, torus, ticks=100, **kwargs):
+    """Benchmarks a headless Simulation.
+
+    The ticks are timed without memory tracing. The peak memory is traced in a second run of the same
+    configuration, including the construction of the Environment.
+
+    Args:
+        size (:obj:`tuple(int, int)`): Number of rows and columns of the field.
+        ants (:obj:`int`): Number of Ants.
+        neighbours (:obj:`int`): Number of visible neighbour cells, four or eight.
+        torus (:obj:`bool`): Environment is a torus.
+        ticks (:obj:`int`, optional): Number of simulated ticks.
+        **kwargs: Further Simulation arguments.
+
+    Returns:
+        :obj:`dict`: Ticks per second, latency percentiles per tick in seconds and peak memory in bytes.
+    """
+    sim = _populated(size, ants, neighbours, torus, **kwargs)
+    latencies = list()
+
+    for _ in range(ticks):
+        start = perf_counter()
+        sim.step()
+        latencies.append(perf_counter() - start)
+
+    tracemalloc.start()
+
+    try:
+        _populated(size, ants, neighbours, torus, **kwargs).step(ticks)
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'size': list(size),
+        'ants': ants,
+        'neighbours': neighbours,
+        'torus': torus,
+        'ticks': ticks,
+        'ticks_per_second': ticks / sum(latencies),
+        'latency': _percentiles(latencies),
+        'peak_memory': peak,
+    }
+
+
+def hot_paths(size, neighbours, torus, calls=1000):
+    """Benchmarks the single calls of the hot paths.
+
+    Times Environment.visible, SimpleAnt.move, Pheromone.update and Environment.draw, the latter on an
+    offscreen surface of ten pixels per cell.
+
+    Args:
+        size (:obj:`tuple(int, int)`): Number of rows and columns of the field.
+        neighbours (:obj:`int`): Number of visible neighbour cells, four or eight.
+        torus (:obj:`bool`): Environment is a torus.
+        calls (:obj:`int`, optional): Calls per hot path, draw is called calls // 100 times.
+
+    Returns:
+        :obj:`dict`: Latency percentiles per call in seconds by hot path.
+    """
+    rows, cols = size
+    environment = Environment(Affine.identity(), None, size, neighbours, torus)
+    hole = environment.get_cell(Position(cols // 2, rows // 2)).spawn_hole()
+
+    ant_ = hole.spawn_ant()
+    visible = _timed(lambda: environment.visible(ant_), calls)
+
+    def move():
+        cells = environment.visible(ant_)
+        start = perf_counter()
+        ant_.move(cells)
+        return perf_counter() - start
+
+    moves = [move() for _ in range(calls)]
+
+    pheromone = environment.get_cell(Position(0, 0)).spawn_pheromone()
+    update = _timed(lambda: pheromone.update(cols), calls)
+
+    display = Environment(Affine.scale(10), Surface((10 * cols, 10 * rows)), size, neighbours, torus)
+    draw = _timed(display.draw, max(calls // 100, 1))
+
+    return {
+        'size': list(size),
+        'neighbours': neighbours,
+        'torus': torus,
+        'visible': _percentiles(visible),
+        'move': _percentiles(moves),
+        'pheromone_update': _percentiles(update),
+        'draw': _percentiles(draw),
+    }
+
+
+def _populated(size, ants, neighbours, torus, **kwargs):
+    sim = Simulation(size, neighbours, torus, **kwargs)
+    sim.populate(holes=1, nutrients=max(size[0] * size[1] // 500, 1), ants=ants)
+    return sim
+
+
+def _timed(func, calls):
+    latencies = list()
+
+    for _ in range(calls):
+        start = perf_counter()
+        func()
+        latencies.append(perf_counter() - start)
+
+    return latencies
+
+
+def _percentiles(latencies):
+    p50, p90, p99 = percentile(latencies, [50, 90, 99])
+
+    return {
+        'mean': sum(latencies) / len(latencies),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'max': max(latencies),
+    }
@@ -0,0 +1,306 @@
+"""
+checkpoint
+**********
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import json
+import os
+
+from numpy import array
+from numpy import concatenate
+from numpy import cumsum
+from numpy import float64
+from numpy import full
+from numpy import int64
+from numpy import load
+from numpy import savez_compressed
+
+from ant.agents.ant import BaseAnt
+from ant.agents.ant import SimpleAnt
+from ant.agents.hole import Hole
+from ant.simulation import Simulation
+from ant.writer import BackgroundWriter
+
+VERSION = 4
+
+LAYERS = ('occupancy', 'amount', 'intensity', 'weight', 'pheromone', 'selected')
+
+
+class Checkpointer:
+    """Writes snapshots of a simulation periodically without stalling the tick loop.
+
+    Connect the checkpointer to the on_tick signal of a simulation. Every n ticks it captures the
+    simulation state, which copies the layer arrays, and hands the copies to a background writer
+    which compresses and writes them. If the previous snapshot is still being written the snapshot
+    is postponed to the first tick after the writer finished. Snapshots are replaced atomically, a
+    crash while writing keeps the previous snapshot.
+
+    Args:
+        path (:obj:`str`): Path of the snapshot file.
+        every (:obj:`int`, optional): Write a snapshot every n ticks.
+        writer (:obj:`BackgroundWriter`, optional): Writer to share, by default the checkpointer owns one.
+
+    Attributes:
+        path (:obj:`str`): Path of the snapshot file.
+        every (:obj:`int`): Write a snapshot every n ticks.
+    """
+    def __init__(self, path, every=1000, writer=None):
+        self.path = path
+        self.every = every
+
+        self._owner = writer is None
+        self._writer = BackgroundWriter(maxsize=1, name='checkpoint') if writer is None else writer
+        self._due = False
+
+    def __call__(self, simulation):
+        self._due |= simulation.ticks % self.every == 0
+
+        if self._due and not self._writer.busy:
+            self.save(simulation)
+            self._due = False
+
+    def save(self, simulation):
+        """Captures the simulation state and writes it in the background.
+
+        Args:
+            simulation (:obj:`Simulation`): The simulation.
+        """
+        self._writer.submit(write, self.path, capture(simulation))
+
+    def close(self):
+        """Waits for the pending snapshot, closes the writer if the checkpointer owns it."""
+        if self._owner:
+            self._writer.close()
+
+        else:
+            self._writer.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def capture(simulation):
+    """Captures the full state of a simulation.
+
+    The state are copies of the environment layers including the free cell index, the Holes, the
+    per Ant state (position, mandible, visited trail, trail length), the colony arrays, the instance
+    counters and the state of the random streams.
+
+    Args:
+        simulation (:obj:`Simulation`): The simulation, Ants must be SimpleAnts.
+
+    Returns:
+        :obj:`dict(str, ndarray)`: The state.
+    """
+    environment = simulation.environment
+    layers = environment.layers
+    rows, cols = environment.size
+
+    meta = {
+        'version': VERSION,
+        'size': [rows, cols],
+        'neighbours': environment.neighbours,
+        'torus': environment.torus,
+        'storage': environment.storage,
+        'rho': simulation.rho,
+        'floor': simulation.floor,
+        'batched': simulation.batched,
+        'params': simulation.params,
+        'colony': simulation.colony is not None,
+        'ticks': simulation.ticks,
+        'instances': {'hole': Hole.INSTANCES, 'ant': BaseAnt.INSTANCES},
+        'streams': environment.streams.state,
+    }
+
+    state = {'layer_' + name: getattr(layers, name).copy() for name in LAYERS}
+    state['free'] = layers._free[:layers._free_count].copy()
+
+    holes = list(layers.holes.items())
+    state['hole_cell'] = array([y * cols + x for (y, x), _ in holes], dtype=int64)
+    state['hole_id'] = array([hole.id for _, hole in holes], dtype=int64)
+    state['hole_nutrients'] = array([hole.nutrients for _, hole in holes], dtype=int64)
+
+    state['sim_holes'] = _flat(simulation.holes, cols)
+    state['sim_nutrients'] = _flat(simulation.nutrients, cols)
+
+    ants = simulation.ants
+    trails = [_flat(ant.visited, cols) for ant in ants]
+
+    state['ant_cell'] = _flat(ants, cols)
+    state['ant_name'] = array([ant._name for ant in ants], dtype=int64)
+    state['ant_home'] = array([-1 if ant.home is None else ant.home for ant in ants], dtype=int64)
+    state['ant_mandible'] = array([ant._mandible for ant in ants], dtype=int64)
+    state['ant_trail_length'] = array([ant._trail_length for ant in ants], dtype=float64)
+    state['ant_offset'] = array([(ant.x_off, ant.y_off) for ant in ants], dtype=int64).reshape(-1, 2)
+    state['ant_trail'] = concatenate([array([], dtype=int64)] + trails)
+    state['ant_depth'] = array([trail.size for trail in trails], dtype=int64)
+    state['ant_origin'] = array([-1 if ant.visited.origin is None else ant.visited.origin.flat for ant in ants],
+                                dtype=int64)
+    state['ant_forgotten'] = array([ant.visited.forgotten for ant in ants], dtype=int64)
+
+    colony = simulation.colony
+
+    if colony is not None:
+        state['colony_position'] = colony.position.copy()
+        state['colony_mandible'] = colony.mandible.copy()
+        state['colony_trail_length'] = colony.trail_length.copy()
+        state['colony_home'] = colony.home.copy()
+        state['colony_head'] = colony._head[:len(colony)].copy()
+        state['colony_depth'] = colony._depth[:len(colony)].copy()
+        state['colony_origin'] = colony._origin[:len(colony)].copy()
+        state['colony_forgotten'] = colony._forgotten[:len(colony)].copy()
+        state['colony_trail'] = colony._trail[:len(colony)].copy()
+
+    state['meta'] = array(json.dumps(meta))
+
+    return state
+
+
+def write(path, state):
+    """Writes a captured state to a compressed snapshot file, replacing an existing one atomically.
+
+    Args:
+        path (:obj:`str`): Path of the snapshot file.
+        state (:obj:`dict(str, ndarray)`): The state returned by capture.
+    """
+    tmp = path + '.tmp'
+
+    with open(tmp, 'wb') as dst:
+        savez_compressed(dst, **state)
+
+    os.replace(tmp, path)
+
+
+def info(path):
+    """Reads the settings of a snapshot, e.g. the field size.
+
+    Args:
+        path (:obj:`str`): Path of the snapshot file.
+
+    Returns:
+        :obj:`dict`: The settings of the snapshot.
+    """
+    with load(path) as data:
+        return json.loads(str(data['meta']))
+
+
+def restore(path, renderer=None):
+    """Resumes a simulation from a snapshot.
+
+    The resumed simulation continues bit for bit like the captured one. Restoring sets the global
+    state, which are the instance counters.
+
+    Args:
+        path (:obj:`str`): Path of the snapshot file.
+        renderer (:obj:`Renderer`, optional): Renderer of the resumed simulation.
+
+    Returns:
+        :obj:`Simulation`: The resumed simulation.
+
+    Raises:
+        ValueError: If the snapshot was written in another format version.
+    """
+    with load(path) as data:
+        state = {key: data[key] for key in data.files}
+
+    meta = json.loads(str(state['meta']))
+
+    if meta.get('version') != VERSION:
+        raise ValueError('Snapshot {} has format version {}, expected {}'.format(path, meta.get('version'), VERSION))
+
+    params = meta['params']
+    simulation = Simulation(tuple(meta['size']), meta['neighbours'], meta['torus'], renderer, meta['storage'],
+                            meta['rho'], meta['floor'], meta['batched'], meta['colony'], **params)
+    environment = simulation.environment
+    layers = environment.layers
+    _, cols = environment.size
+
+    for name in LAYERS:
+        getattr(layers, name)[...] = state['layer_' + name]
+
+    layers.stats.rebuild(layers.pheromone)
+
+    free = state['free']
+    layers._free[:free.size] = free
+    layers._slot[:] = -1
+    layers._slot[free] = range(free.size)
+    layers._free_count = free.size
+
+    rect = environment.get_flat_cell(0).rect
+
+    for cell, name, nutrients in zip(*[state[key].tolist() for key in ['hole_cell', 'hole_id', 'hole_nutrients']]):
+        hole = Hole(None, rect.width, rect.height)
+        hole._name = name
+        hole.nutrients = nutrients
+
+        layers.holes[divmod(cell, cols)] = hole
+
+    simulation.holes = [environment.get_flat_cell(cell) for cell in state['sim_holes'].tolist()]
+    simulation.nutrients = [environment.get_flat_cell(cell) for cell in state['sim_nutrients'].tolist()]
+
+    homes = {hole.id: hole for hole in layers.holes.values()}
+    ends = cumsum(state['ant_depth']).tolist()
+    trail = state['ant_trail'].tolist()
+
+    for idx, cell in enumerate(state['ant_cell'].tolist()):
+        cell = environment.get_flat_cell(cell)
+        home = homes.get(int(state['ant_home'][idx]))
+
+        if home is None:
+            ant = SimpleAnt(cell, cell.background, cell.rect, **params)
+
+        else:
+            ant = home.spawn_ant(cell, cell.background, cell.rect, **params)
+
+        start = ends[idx] - int(state['ant_depth'][idx])
+
+        ant._name = int(state['ant_name'][idx])
+        ant._mandible = int(state['ant_mandible'][idx])
+        ant._trail_length = float(state['ant_trail_length'][idx])
+        origin = int(state['ant_origin'][idx])
+
+        for visited in trail[start:ends[idx]]:
+            ant.visited.append(environment.get_flat_cell(visited))
+
+        ant.visited.origin = environment.get_flat_cell(origin) if origin >= 0 else None
+        ant.visited.forgotten = int(state['ant_forgotten'][idx])
+        ant.x_off, ant.y_off = state['ant_offset'][idx].tolist()
+
+        simulation.ants.append(ant)
+
+    colony = simulation.colony
+
+    if colony is not None:
+        size = state['colony_position'].size
+        trail = state['colony_trail']
+
+        colony._reserve(size)
+        colony._position[:size] = state['colony_position']
+        colony._mandible[:size] = state['colony_mandible']
+        colony._trail_length[:size] = state['colony_trail_length']
+        colony._home[:size] = state['colony_home']
+        colony._head[:size] = state['colony_head']
+        colony._depth[:size] = state['colony_depth']
+        colony._origin[:size] = state['colony_origin']
+        colony._forgotten[:size] = state['colony_forgotten']
+        colony._trail = full((colony._position.size, max(trail.shape[1], colony._trail.shape[1])), -1, dtype=int64)
+        colony._trail[:size, :trail.shape[1]] = trail
+        colony._size = size
+        colony._index()
+
+    simulation.ticks = meta['ticks']
+
+    Hole.INSTANCES = meta['instances']['hole']
+    BaseAnt.INSTANCES = meta['instances']['ant']
+    environment.streams.state = meta['streams']
+
+    return simulation
+
+
+def _flat(objs, cols):
+    return array([obj.pos.y * cols + obj.pos.x for obj in objs], dtype=int64)
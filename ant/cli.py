@@ -6,14 +6,29 @@ cli
 :Date: 03.06.19
 """
 import click
+import json
 import logging
+import os
 
-from ant.controller import Controller
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # keep stdout clean for the benchmark JSON
+
+from ant import batch
+from ant import benchmark
+from ant import checkpoint
+from ant.monitor import JsonLinesSink
+from ant.monitor import Monitor
+from ant.monitor import Tracer
+from ant.monitor import sink
+from ant.profiler import Profiler
+from ant.scenario import Scenario
+from ant.settings import FPS
+from ant.settings import SEED
+from ant.simulation import Simulation
 
 
 # TODO alter settings
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option('-s', '--screen', 'screen_size', default=(900, 900), nargs=2, type=int,
               help='Size of the display, please enter width and height.')
 @click.option('-f', '--field', 'field_size', default=(30, 30), nargs=2, type=int,
@@ -26,17 +41,187 @@ from ant.controller import Controller
               help='How many nutrient units to spawn per site.')
 @click.option('-at', '--ant_type', 'ant_type', default='simple', type=str,
               help='The ant type, please select simple or smart.')
-def main(screen_size, field_size, neighbours, torus, nutrients, ant_type):
+@click.option('-hl', '--headless', 'headless', is_flag=True,
+              help='Run the simulation without display.')
+@click.option('-tk', '--ticks', 'ticks', default=1000, type=int,
+              help='Number of ticks to simulate in headless mode.')
+@click.option('-sc', '--scenario', 'scenario', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='Start from a scenario file, its size replaces the field size.')
+@click.option('-st', '--storage', 'storage', default=None, type=click.Choice(['cells', 'array']),
+              help='Storage mode of the field in headless mode, array for a scenario and cells otherwise by default.')
+@click.option('-cp', '--checkpoint', 'snapshot', default=None, type=click.Path(dir_okay=False),
+              help='Write checkpoints of the simulation to this file.')
+@click.option('-ce', '--checkpoint-every', 'every', default=1000, type=int,
+              help='Number of ticks between checkpoints.')
+@click.option('-r', '--resume', 'resume', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='Resume the simulation from a checkpoint file.')
+@click.option('-m', '--metrics', 'metrics', default=None, type=click.Path(dir_okay=False),
+              help='Stream metrics to this file, CSV if it ends with .csv otherwise JSON lines.')
+@click.option('-me', '--metrics-every', 'metrics_every', default=100, type=int,
+              help='Number of ticks between metric records.')
+@click.option('-sd', '--seed', 'seed', default=SEED, type=int,
+              help='Seed of the random streams, ignored on resume.')
+@click.option('-tf', '--ticks-per-frame', 'steps', default=1, type=int,
+              help='Number of ticks to simulate per drawn frame.')
+@click.option('-ra', '--rate', 'rate', default=None, type=float,
+              help='Ticks to simulate per second independent of the frame rate, replaces ticks per frame.')
+@click.option('-fp', '--fps', 'fps', default=FPS, type=int,
+              help='Frame rate cap of the display, uncapped if zero. Hold f to fast forward without drawing.')
+@click.option('-tr', '--trace', 'trace', default=None, type=click.Path(dir_okay=False),
+              help='Write the cells and loads of the ants per tick to this JSON lines file.')
+@click.option('-ll', '--log-level', 'log_level', default='WARNING',
+              type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], case_sensitive=False),
+              help='Level of the log messages, DEBUG logs every ant move.')
+@click.option('-pr', '--profile', 'profile', is_flag=True,
+              help='Time the phases of each tick and report them on exit.')
+@click.option('-pw', '--profile-window', 'window', default=None, nargs=2, type=int,
+              help='Profile the ticks from start to stop (exclusive) with cProfile, please enter start and stop.')
+@click.option('-po', '--profile-output', 'profile_output', default='ant.pstats', type=click.Path(dir_okay=False),
+              help='File to dump the pstats of the profile window to.')
+@click.pass_context
+def main(ctx, screen_size, field_size, neighbours, torus, nutrients, ant_type, headless, ticks, scenario, storage,
+         snapshot, every, resume, metrics, metrics_every, seed, steps, rate, fps, trace, log_level, profile, window,
+         profile_output):
+    if ctx.invoked_subcommand is not None:
+        return
+
     logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(log_level.upper())
     handler = logging.StreamHandler()
-    handler.setLevel(logging.DEBUG)
+    handler.setLevel(log_level.upper())
     fmt = logging.Formatter('%(asctime)s %(module)s.%(name)s.%(funcName)s: %(message)s')
     handler.setFormatter(fmt)
     logger.addHandler(handler)
 
-    controller = Controller(screen_size, field_size, neighbours, torus, nutrients, ant_type)
-    controller.run()
+    if scenario is not None:
+        scenario = Scenario.load(scenario)
+
+    checkpointer = checkpoint.Checkpointer(snapshot, every) if snapshot is not None else None
+    monitor = Monitor(sink(metrics), metrics_every) if metrics is not None else None
+    tracer = Tracer(JsonLinesSink(trace)) if trace is not None else None
+    profiler = Profiler(window, profile_output) if profile or window else None
+
+    if headless:
+        if resume is not None:
+            simulation = checkpoint.restore(resume)
+
+        else:
+            # a scenario spawns the whole field in bulk, array storage does so without a Cell object per cell
+            if storage is None:
+                storage = 'cells' if scenario is None else 'array'
+
+            simulation = Simulation(field_size, neighbours, torus, storage=storage, scenario=scenario, rng=seed)
+
+            if simulation.holes:
+                simulation.populate(holes=0, nutrients=0, ants=1)
+
+            else:
+                simulation.populate(holes=1, nutrients=1, ants=1, amount=10000)
+
+        if checkpointer is not None:
+            simulation.on_tick.connect(checkpointer)
+
+        if monitor is not None:
+            simulation.on_tick.connect(monitor)
+
+        if tracer is not None:
+            simulation.on_tick.connect(tracer)
+
+        simulation.profiler = profiler
+        simulation.run(until=simulation.ticks + ticks)
+
+        if checkpointer is not None:
+            checkpointer.save(simulation)
+            checkpointer.close()
+
+        if monitor is not None:
+            monitor.close()
+
+        if tracer is not None:
+            tracer.close()
+
+        if profiler is not None:
+            profiler.close()
+            click.echo(profiler.report(), err=True)
+
+        for cell in simulation.holes:
+            click.echo('{} after {} ticks'.format(cell.hole, simulation.ticks))
+
+    else:
+        # the controller opens a display, import it only if we need one
+        from ant.controller import Controller
+
+        controller = Controller(screen_size, field_size, neighbours, torus, nutrients, ant_type, scenario,
+                                resume, checkpointer, monitor, seed, profiler, tracer, steps, rate, fps)
+
+        # the controller exits once the window is closed, the report is written on the way out
+        try:
+            controller.run()
+
+        finally:
+            if profiler is not None:
+                click.echo(profiler.report(), err=True)
+
+
+@main.command()
+@click.option('-f', '--field', 'sizes', default=benchmark.SIZES, nargs=2, type=int, multiple=True,
+              help='Field size of the matrix, please enter rows and columns, repeat for more sizes.')
+@click.option('-a', '--ants', 'ants', default=benchmark.ANTS, type=int, multiple=True,
+              help='Number of ants of the matrix, repeat for more counts.')
+@click.option('-tk', '--ticks', 'ticks', default=100, type=int,
+              help='Number of ticks to simulate per matrix entry.')
+@click.option('-c', '--calls', 'calls', default=1000, type=int,
+              help='Number of calls per hot path.')
+@click.option('-st', '--storage', 'storage', default='cells', type=click.Choice(['cells', 'array']),
+              help='Storage mode of the environment.')
+@click.option('-b', '--batched', 'batched', is_flag=True,
+              help='Select the moves of all ants in one vectorized step.')
+@click.option('-o', '--output', 'output', default='-', type=click.File('w'),
+              help='JSON file to write the results to, stdout by default.')
+def bench(sizes, ants, ticks, calls, storage, batched, output):
+    """Benchmark the simulation hot paths and emit the results as JSON."""
+    results = benchmark.run(sizes, ants, ticks=ticks, calls=calls, storage=storage, batched=batched)
+    json.dump(results, output, indent=2)
+    output.write('\n')
+
+
+@main.command()
+@click.option('-al', '--alpha', 'alpha', type=float, multiple=True,
+              help='Importance of pheromone deposit, repeat for more values.')
+@click.option('-be', '--beta', 'beta', type=float, multiple=True,
+              help='Importance move attractiveness, repeat for more values.')
+@click.option('-ga', '--gamma', 'gamma', type=float, multiple=True,
+              help='Pheromone init value, repeat for more values.')
+@click.option('-rh', '--rho', 'rho', type=float, multiple=True,
+              help='Pheromone decay, repeat for more values.')
+@click.option('-q', '--q', 'q', type=float, multiple=True,
+              help='Pheromone increment, repeat for more values.')
+@click.option('-f', '--field', 'size', nargs=2, type=int, multiple=True,
+              help='Size of the game field, please enter rows and columns, repeat for more sizes.')
+@click.option('-nh', '--neighbours', 'neighbours', type=int, multiple=True,
+              help='Number of neighbours, please select 4 or 8, repeat for both.')
+@click.option('-t', '--torus', 'torus', type=bool, multiple=True,
+              help='Should be the game field a torus, repeat for both.')
+@click.option('-a', '--ants', 'ants', type=int, multiple=True,
+              help='Number of ants, repeat for more counts.')
+@click.option('-tk', '--ticks', 'ticks', default=1000, type=int,
+              help='Number of ticks to simulate per run.')
+@click.option('-w', '--workers', 'workers', default=None, type=int,
+              help='Number of worker processes, all cores by default.')
+@click.option('-sd', '--seed', 'seed', default=0, type=int,
+              help='Root seed of the random streams of the runs.')
+@click.option('-o', '--output', 'output', required=True, type=click.Path(dir_okay=False),
+              help='File to write the result table to, CSV if it ends with .csv otherwise JSON lines.')
+def sweep(ticks, workers, seed, output, **axes):
+    """Run headless simulations over a parameter grid in parallel and write a result table."""
+    sets = batch.grid(**{name: values for name, values in axes.items() if values})
+    table = sink(output)
+
+    for row in batch.run(sets, ticks, workers, seed):
+        table.write(row)
+
+    table.close()
+    click.echo('{} runs written to {}'.format(len(sets), output))
 
 
 if __name__ == '__main__':
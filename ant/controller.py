@@ -6,51 +6,98 @@ controller
 :Date: 03.06.19
 """
 import sys
+from time import perf_counter
 
 import pygame
-from affine import Affine
 from pygame.locals import *
 
-from ant.environment import Environment
+from ant import checkpoint
+from ant.renderer import Renderer
+from ant.settings import FPS
+from ant.simulation import Simulation
+
+FAST_FORWARD_KEY = K_f
+""":obj:`int`: Key which skips drawing while it is held down."""
+
+FAST_FORWARD_SLICE = .05
+""":obj:`float`: Seconds simulated without drawing between two polls of the events while fast forwarding."""
 
 
 class Controller:
-    def __init__(self, screen_size, field_size, neighbours, torus, nutrients, ant_type):
-        self.screen, self.background, self.transform = self.init_display(screen_size, field_size)
+    """Runs a simulation on the display and handles the user input.
+
+    The simulation advances at a fixed timestep independent of the frame rate. Each frame simulates
+    steps ticks or, if rate is set, the ticks due since the previous frame at rate ticks per second.
+    Frames are drawn at most fps times per second. While FAST_FORWARD_KEY is held down the simulation
+    runs as fast as possible without drawing.
+
+    Args:
+        steps (:obj:`int`, optional): Ticks simulated per frame.
+        rate (:obj:`float`, optional): Ticks simulated per second, replaces steps if set.
+        fps (:obj:`int`, optional): Frame rate cap, uncapped if zero.
+
+    Please refer to the command line interface for the further arguments.
+    """
+    def __init__(self, screen_size, field_size, neighbours, torus, nutrients, ant_type, scenario=None, resume=None,
+                 checkpointer=None, monitor=None, seed=None, profiler=None, tracer=None, steps=1, rate=None, fps=FPS):
+        if scenario is not None:
+            field_size = scenario.size
+
+        if resume is not None:
+            field_size = tuple(checkpoint.info(resume)['size'])
+
+        self.renderer = Renderer(screen_size, field_size)
         self.clock = pygame.time.Clock()
 
         self.size = nutrients
 
-        self.nature = self.init_nature(field_size, neighbours, torus)
-        self.ants = list()  # Later Ant monitor
-        self.holes = list()  # LAte Holes monitor
-        self.nutrients = list()  # Later Nutrients monitor
-        self.pheromones = list()  # Later Pheromone monitor
-        self.selected_cell = None
+        if resume is not None:
+            self.simulation = checkpoint.restore(resume, self.renderer)
+
+        else:
+            self.simulation = Simulation(field_size, neighbours, torus, renderer=self.renderer, scenario=scenario,
+                                         rng=seed)
 
-    def init_display(self, screen_size, field_size):
-        pygame.init()
+        if checkpointer is not None:
+            self.simulation.on_tick.connect(checkpointer)
 
-        screen = pygame.display.set_mode(screen_size)
-        background = pygame.Surface((screen.get_width(), screen.get_height()))
-        transform = Affine(
-            screen_size[0] / field_size[1], 0, 0,
-            0, screen_size[1] / field_size[0], 0
-        )
+        if monitor is not None:
+            self.simulation.on_tick.connect(monitor)
 
-        return screen, background, transform
+        if tracer is not None:
+            self.simulation.on_tick.connect(tracer)
 
-    def init_nature(self, field_size, neighbours, torus):
-        return Environment(self.transform, self.background, field_size, neighbours, torus)
+        self.simulation.profiler = profiler
+
+        self.checkpointer = checkpointer
+        self.monitor = monitor
+        self.tracer = tracer
+        self.profiler = profiler
+
+        self.nature = self.simulation.environment
+        self.selected_cell = None
+
+        self.steps = steps
+        self.rate = rate
+        self.fps = fps
+        self.fast_forward = False
+        self._due = 0.  # fraction of a tick carried over to the next frame
 
     def event_loop(self):
         for event in pygame.event.get():
             if event.type == QUIT:
+                self.close()
                 sys.exit()
 
             elif event.type == MOUSEBUTTONDOWN and event.button == 1:
                 self.handle_select(event)
 
+            elif event.type == KEYDOWN and event.key == FAST_FORWARD_KEY:
+                self.fast_forward = True
+
+            elif event.type == KEYUP and event.key == FAST_FORWARD_KEY:
+                self.fast_forward = False
+
             elif event.type == KEYDOWN:
                 self.handle_keydown(event)
 
@@ -67,11 +114,11 @@ class Controller:
         if self.selected_cell and not self.selected_cell.occupied():
             if event.unicode == 'h':
                 cell = self.selected_cell.spawn_hole()
-                self.holes.append(cell)
+                self.simulation.holes.append(cell)
 
             elif event.unicode == 'n':
                 cell = self.selected_cell.spawn_nutrient(self.size)
-                self.nutrients.append(cell)
+                self.simulation.nutrients.append(cell)
 
             elif event.unicode == 'o':
                 self.selected_cell.spawn_obstacle()
@@ -80,7 +127,7 @@ class Controller:
             # later ant type
             if event.unicode == 'a':
                 ant = self.selected_cell.spawn_ant()
-                self.ants.append(ant)
+                self.simulation.ants.append(ant)
 
         if self.selected_cell and self.selected_cell.occupied():
             if event.unicode == 'd':
@@ -88,21 +135,57 @@ class Controller:
                 del self.selected_cell.nutrient
                 del self.selected_cell.obstacle
 
+    def close(self):
+        for writer in (self.checkpointer, self.monitor, self.tracer):
+            if writer is not None:
+                writer.close()
+
+        if self.profiler is not None:
+            self.profiler.close()
+
+    def due(self, elapsed):
+        """Number of ticks to simulate in a frame.
+
+        Without rate a frame simulates steps ticks. With rate the ticks accumulate with the elapsed wall
+        time, a slow frame catches up at most one second of ticks.
+
+        Args:
+            elapsed (:obj:`float`): Seconds since the previous frame.
+
+        Returns:
+            :obj:`int`
+        """
+        if self.rate is None:
+            return self.steps
+
+        self._due = min(self._due + elapsed * self.rate, self.rate)
+        ticks = int(self._due)
+        self._due -= ticks
+
+        return ticks
+
     def run(self):
-        hole = self.nature.spawn_hole()
-        self.nutrients = [self.nature.spawn_nutrient(amount=10000) for i in range(1)]
-        self.ants = [hole.spawn_ant() for i in range(1)]
+        if not self.simulation.ticks:  # resumed simulations are already populated
+            if self.simulation.holes:  # started from a scenario
+                self.simulation.populate(holes=0, nutrients=0, ants=1)
+
+            else:
+                self.simulation.populate(holes=1, nutrients=1, ants=1, amount=10000)
 
         while True:
-            self.clock.tick()
-            self.event_loop()
+            if self.fast_forward:
+                self.clock.tick()
+                self.event_loop()
 
-            for ant in self.ants:
-                ant.collide(self.nutrients + self.holes)
-                ant.move(self.nature.visible(ant))
+                deadline = perf_counter() + FAST_FORWARD_SLICE
 
-            self.nature.draw()
-            [ant.draw() for ant in self.ants]
+                while perf_counter() < deadline:
+                    self.simulation.step()
+
+                continue
+
+            elapsed = self.clock.tick(self.fps) / 1000
+            self.event_loop()
 
-            self.screen.blit(self.background, self.background.get_rect())
-            pygame.display.update()
+            self.simulation.step(self.due(elapsed))
+            self.renderer.render(self.simulation)
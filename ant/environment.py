@@ -5,10 +5,19 @@ environment
 :Author: tobijjah
 :Date: 07.05.2019
 """
+from logging import DEBUG
 from logging import getLogger
+from numbers import Integral
 
 from math import floor
-from numpy import ravel
+from numpy import arange
+from numpy import array
+from numpy import asarray
+from numpy import broadcast_to
+from numpy import flatnonzero
+from numpy import int32
+from numpy import int64
+from numpy import where
 from pygame import Rect
 from pygame import Surface
 from pygame.draw import rect as square
@@ -21,9 +30,19 @@ from ant.errors import CellAgentError
 from ant.errors import CellOccupiedError
 from ant.errors import EnvironmentFullError
 from ant.errors import EnvironmentOutOfBoundsError
+from ant.errors import ScenarioError
+from ant.layers import EMPTY
+from ant.layers import HOLE
+from ant.layers import NUTRIENT
+from ant.layers import OBSTACLE
+from ant.layers import FieldLayers
+from ant.settings import ALPHA
 from ant.settings import CELL_COLOR
-from ant.settings import GLOBAL_RNG
+from ant.settings import GAMMA
+from ant.settings import Q
+from ant.settings import RHO
 from ant.settings import SELECTION_COLOR
+from ant.streams import RandomStreams
 
 
 # i want to log if anything is spawned on a cell, do we really need it
@@ -32,14 +51,17 @@ from ant.settings import SELECTION_COLOR
 class Environment:
     """Class is the environment where the other classes/agents (Pheromone, Hole and Nutrient) lives.
 
-    Basically it is a 2D list where each list element is a Cell object which holds
-    a reference to other classes/agents. This class can be used to spawn Holes, Nutrients, and Obstacles
-    at a random position. Further it provides an interface to get the visible Cells for an Ant.
-    To instantiate the class two arguments are required while three additional arguments are optional.
+    The field state is stored in NumPy arrays (FieldLayers) indexed by (row, col). With the default cells
+    storage the field is additionally a 2D list where each list element is a Cell object reading and writing
+    the layers. With the array storage no Cell objects are kept, get_cell returns a lightweight Cell view
+    created on demand, which keeps memory and startup time low for large fields.
+    This class can be used to spawn Holes, Nutrients, and Obstacles at a random position.
+    Further it provides an interface to get the visible Cells for an Ant.
+    To instantiate the class two arguments are required while four additional arguments are optional.
 
     Args:
         transform (:obj:`Affine`): Affine transformation matrix of the display.
-        background (:obj:`Surface`): The surface to draw on.
+        background (:obj:`Surface`): The surface to draw on, None for a headless Environment.
         size (:obj:`tuple(int, int)`, optional): Defines the size of the 2D environment must
             be a tuple of two integers. First element is number of rows and second element is
             number of columns.
@@ -48,31 +70,57 @@ class Environment:
         torus (:obj:`bool`, optional): If an Ant is at an edge or corner of the
             environment and torus is false the visible cells are only in bounds of the field.
             If true the Ant perceives the opposite of the field.
+        storage (:obj:`str`, optional): Either cells to keep a Cell object per field position or array
+            to create Cell views on demand.
+        gamma (:obj:`float`, optional): Pheromone init value.
+        rho (:obj:`float`, optional): Pheromone decay of a deposit.
+        q (:obj:`float`, optional): Pheromone increment of a deposit.
+        rng (:obj:`Generator` or :obj:`int` or :obj:`SeedSequence`, optional): Parent generator or seed of the
+            random streams, SEED by default.
+        alpha (:obj:`float`, optional): Importance of pheromone deposit, the exponent of the weight layer.
 
     Attributes:
         neighbours (:obj:`int`): The total number of neighbours of a Cell.
         torus (:obj:`bool`): Environment is torus.
+        storage (:obj:`str`): The storage mode, cells or array.
+        streams (:obj:`RandomStreams`): The independent spawn and move random streams.
     """
-    def __init__(self, transform, background, size=(10, 10), neighbours=4, torus=False):
-        self.torus = torus
+    def __init__(self, transform, background, size=(10, 10), neighbours=4, torus=False, storage='cells', gamma=GAMMA,
+                 rho=RHO, q=Q, rng=None, alpha=ALPHA):
+        self.storage = storage
         # affine transform matrices to transform from display coords to field coords
         self._transform = transform
         self._inverse_transform = ~self._transform
 
         self._rows, self._cols = size
-        self._rng = GLOBAL_RNG
+        self.streams = RandomStreams(rng)
+        self._rng = self.streams.spawn
 
-        # init field with cell objects
-        self._field = [
-            [
-                Cell(Position(x, y), background, Rect(*((x, y)*self._transform), self._transform.a, self._transform.e))
-                for x in range(self._cols)
+        self._background = background
+        self._layers = FieldLayers(size, gamma, rho, q, self.streams, alpha)
+        self._layers.cells = self.get_flat_cell
+        self._positions = [None] * (self._rows * self._cols)  # interned Positions, created on first access
+
+        if storage == 'array':
+            # cell views share a single surface, cells are drawn one after another
+            self._field = None
+            self._scratch = Surface((transform.a, transform.e)) if background is not None else None
+
+        else:
+            # init field with cell objects
+            self._field = [
+                [
+                    Cell(self.get_flat_position(y * self._cols + x), background, self._display_rect(x, y), self._layers)
+                    for x in range(self._cols)
+                ]
+                for y in range(self._rows)
             ]
-            for y in range(self._rows)
-        ]
+            self._cells = [cell for row in self._field for cell in row]
+            self._scratch = None
 
-        self._field_flat = ravel(self._field)
-        self._rng.shuffle(self._field_flat)
+        # random order of flat field indices used to spawn at random positions
+        self._order = self._rng.permutation(self._rows * self._cols)
+        self._layers.order_free(self._order, self._rng)
 
         if neighbours <= 4:  # von Neumann neighbourhood
             self.neighbours = 4
@@ -83,16 +131,82 @@ class Environment:
             self._rules = (Position(-1, 0), Position(-1, 1), Position(0, 1), Position(1, 1),
                            Position(1, 0), Position(1, -1), Position(0, -1), Position(-1, -1))
 
+        self.torus = torus  # builds the neighbour table
+
         self._logger = getLogger('%s' % (__class__.__name__,))
 
-    def draw(self):
+    @property
+    def torus(self):
+        """:obj:`bool`: Environment is torus, setting it rebuilds the neighbour table."""
+        return self._torus
+
+    @torus.setter
+    def torus(self, value):
+        self._torus = value
+        self._neighbour_table = self._build_neighbour_table()
+
+    @property
+    def neighbour_table(self):
+        """:obj:`ndarray`: Flat field indices of the neighbour cells of shape (cells, neighbours).
+
+        The row of a cell is its flat field index (row * cols + col). Neighbours which are not on
+        field are -1.
+        """
+        return self._neighbour_table
+
+    @property
+    def layers(self):
+        """:obj:`FieldLayers`: The array storage of the field state."""
+        return self._layers
+
+    @property
+    def background(self):
+        """:obj:`Surface`: The surface to draw on, None if headless."""
+        return self._background
+
+    @property
+    def rules(self):
+        """:obj:`tuple(Position)`: Offsets from a cell to its neighbour cells."""
+        return self._rules
+
+    @property
+    def size(self):
+        """:obj:`tuple(int, int)`: Number of rows and columns of the field."""
+        return self._rows, self._cols
+
+    def draw(self, indices=None):
         """Draw Environment on surface.
 
-        Attention, this redraws the entire field.
+        Attention, without indices this redraws the entire field.
+
+        Args:
+            indices (:obj:`ndarray`, optional): Flat field indices of the cells to draw, all cells if None.
+
+        Returns:
+            :obj:`list(Rect)`: The display rects of the drawn cells.
         """
-        for row in self._field:
-            for cell in row:
-                cell.draw()
+        if indices is None:
+            indices = range(self._rows * self._cols)
+
+        else:
+            indices = indices.tolist()
+
+        cells = [self.get_flat_cell(index) for index in indices]
+
+        for cell in cells:
+            cell.draw()
+
+        return [cell.rect for cell in cells]
+
+    def evaporate(self, rho=RHO, floor=None):
+        """Evaporates the Pheromones of the entire field in one array operation.
+
+        Args:
+            rho (:obj:`float`, optional): Pheromone decay (0 < rho < 1).
+            floor (:obj:`float`, optional): Pheromones with a lower intensity are removed and their
+                intensity drops back to GAMMA. Pheromones are never removed if None.
+        """
+        self._layers.evaporate(rho, floor)
 
     def spawn_hole(self):
         """Spawns a Hole on field.
@@ -105,11 +219,7 @@ class Environment:
         Raises:
             EnvironmentFullError: If all Cells are occupied by a Hole or Nutrient.
         """
-        for cell in self._field_flat:
-            if not cell.occupied():
-                return cell.spawn_hole()
-
-        raise EnvironmentFullError('No space to spawn a hole')
+        return self._free_cell('a hole').spawn_hole()
 
     def spawn_nutrient(self, amount=100):
         """Spawns a Nutrient on field.
@@ -125,11 +235,7 @@ class Environment:
         Raises:
             EnvironmentFullError: If all Cells are occupied by a Hole or Nutrient.
         """
-        for cell in self._field_flat:
-            if not cell.occupied():
-                return cell.spawn_nutrient(amount)
-
-        raise EnvironmentFullError('No space to spawn a nutrient')
+        return self._free_cell('a nutrient').spawn_nutrient(amount)
 
     def spawn_obstacle(self):
         """Spawns an Obstacle on field.
@@ -142,11 +248,150 @@ class Environment:
         Raises:
             EnvironmentFullError: If all Cells are occupied by a Hole or Nutrient.
         """
-        for cell in self._field_flat:
-            if not cell.occupied():
-                return cell.spawn_obstacle()
+        return self._free_cell('an obstacle').spawn_obstacle()
+
+    def spawn_holes(self, cells):
+        """Spawns Holes on many cells in one pass.
+
+        Args:
+            cells (:obj:`int` or :obj:`ndarray`): Number of Holes to spawn at random positions, a boolean
+                mask of the field shape or flat field indices.
+
+        Returns:
+            :obj:`ndarray`: Flat field indices of the cells with a new Hole.
+
+        Raises:
+            EnvironmentFullError: If the field has not enough free cells.
+            CellOccupiedError: If a requested cell is already occupied.
+            EnvironmentOutOfBoundsError: If a flat field index is not on the field.
+            ValueError: If a mask differs from the field shape or the indices are not one dimensional integers.
+        """
+        cells = self._bulk_cells(cells, 'holes')
+        self._layers.occupy_many(cells, HOLE)
+
+        rect = self._display_rect(0, 0)
+
+        for index in cells.tolist():
+            self._layers.holes[divmod(index, self._cols)] = Hole(None, rect.width, rect.height)
+
+        return cells
+
+    def spawn_nutrients(self, cells, amounts=100):
+        """Spawns Nutrients on many cells in one pass.
+
+        Args:
+            cells (:obj:`int` or :obj:`ndarray`): Number of Nutrients to spawn at random positions, a boolean
+                mask of the field shape or flat field indices.
+            amounts (:obj:`int` or :obj:`ndarray`, optional): Nutrient units per cell or for all cells.
+
+        Returns:
+            :obj:`ndarray`: Flat field indices of the cells with a new Nutrient.
+
+        Raises:
+            EnvironmentFullError: If the field has not enough free cells.
+            CellOccupiedError: If a requested cell is already occupied.
+            EnvironmentOutOfBoundsError: If a flat field index is not on the field.
+            ValueError: If a mask differs from the field shape or the indices are not one dimensional integers, or
+                the amounts do not broadcast to the cells.
+        """
+        cells = self._bulk_cells(cells, 'nutrients')
+
+        # the amounts are checked before the layers are written, a bad call leaves the field unchanged
+        try:
+            amounts = broadcast_to(abs(asarray(amounts)), cells.shape)
+
+        except ValueError as err:
+            raise ValueError('Amounts of shape {} do not fit {} nutrients'.format(asarray(amounts).shape,
+                                                                                  cells.size)) from err
+
+        self._layers.occupy_many(cells, NUTRIENT)
+        self._layers.amount.reshape(-1)[cells] = amounts
+
+        return cells
+
+    def spawn_obstacles(self, cells):
+        """Spawns Obstacles on many cells in one pass, e.g. a maze given as mask.
+
+        Args:
+            cells (:obj:`int` or :obj:`ndarray`): Number of Obstacles to spawn at random positions, a boolean
+                mask of the field shape or flat field indices.
+
+        Returns:
+            :obj:`ndarray`: Flat field indices of the cells with a new Obstacle.
+
+        Raises:
+            EnvironmentFullError: If the field has not enough free cells.
+            CellOccupiedError: If a requested cell is already occupied.
+            EnvironmentOutOfBoundsError: If a flat field index is not on the field.
+            ValueError: If a mask differs from the field shape or the indices are not one dimensional integers.
+        """
+        cells = self._bulk_cells(cells, 'obstacles')
+        self._layers.occupy_many(cells, OBSTACLE)
+
+        return cells
+
+    def load(self, scenario):
+        """Spawns the Holes, Nutrients and Obstacles of a scenario.
+
+        Args:
+            scenario (:obj:`Scenario`): A scenario of the field size.
+
+        Returns:
+            :obj:`tuple(ndarray, ndarray)`: Flat field indices of the cells with a Hole and with a Nutrient.
+
+        Raises:
+            ScenarioError: If the scenario size differs from the field size.
+            CellOccupiedError: If a cell of the scenario is already occupied.
+        """
+        if tuple(scenario.size) != self.size:
+            raise ScenarioError('Scenario size {} differs from field size {}'.format(scenario.size, self.size))
+
+        occupancy = asarray(scenario.occupancy)
+        nutrients = occupancy == NUTRIENT
+
+        self.spawn_obstacles(occupancy == OBSTACLE)
+
+        return self.spawn_holes(occupancy == HOLE), self.spawn_nutrients(nutrients, scenario.amount[nutrients])
+
+    def _bulk_cells(self, cells, agents):
+        if isinstance(cells, Integral):
+            free = self._layers.free_cells(cells)
+
+            if free.size < cells:
+                raise EnvironmentFullError('No space to spawn {} {}'.format(cells, agents))
+
+            return free
+
+        cells = asarray(cells)
 
-        raise EnvironmentFullError('No space to spawn an obstacle')
+        if cells.dtype == bool:
+            if cells.shape != self.size:
+                raise ValueError('Mask of {} has shape {}, field size is {}'.format(agents, cells.shape, self.size))
+
+            return flatnonzero(cells)
+
+        if cells.ndim != 1 or (cells.size and cells.dtype.kind not in 'iu'):
+            raise ValueError('Cells of {} need to be flat field indices, got {} of shape {}'.format(
+                agents, cells.dtype, cells.shape
+            ))
+
+        cells = cells.astype(int64)
+        outside = (cells < 0) | (cells >= self._rows * self._cols)
+
+        if outside.any():
+            raise EnvironmentOutOfBoundsError('Flat field indices {} of {} out of bounds'.format(
+                cells[outside].tolist(), agents
+            ))
+
+        return cells
+
+    def _free_cell(self, agent):
+        index = self._layers.free_cell()
+
+        if index is None:
+            raise EnvironmentFullError('No space to spawn {}'.format(agent))
+
+        return self.get_flat_cell(index)
 
     # TODO rename
     def visible(self, ant):
@@ -160,13 +405,11 @@ class Environment:
         Returns:
             :obj:`list(Cell)`: A list of neighbouring cells.
         """
-        if self.torus:
-            neighbours = [self.get_torus_cell(ant.pos + rule) for rule in self._rules]
+        row = self._neighbour_table[ant.pos.y * self._cols + ant.pos.x]
+        neighbours = [self.get_flat_cell(index) for index in row.tolist() if index >= 0]
 
-        else:
-            neighbours = [self.get_cell(ant.pos + rule) for rule in self._rules if self.on_field(ant.pos + rule)]
-
-        self._logger.debug('%s %s', ant, list(map(str, neighbours)))
+        if self._logger.isEnabledFor(DEBUG):  # formatting the Cells costs more than the move itself
+            self._logger.debug('%s %s', ant, list(map(str, neighbours)))
 
         return neighbours
 
@@ -183,10 +426,48 @@ class Environment:
             EnvironmentOutOfBoundsError: If position is not on field.
         """
         if self.on_field(position):
+            if self._field is None:
+                return self.get_flat_cell(position.y * self._cols + position.x)
+
             return self._field[position.y][position.x]
 
         raise EnvironmentOutOfBoundsError('Position {} out of bounds'.format(position))
 
+    def get_flat_cell(self, index):
+        """Returns Cell at a flat field index.
+
+        Args:
+            index (:obj:`int`): The flat field index (row * cols + col).
+
+        Returns:
+            :obj:`Cell`: Cell at the index.
+        """
+        if self._field is None:
+            position = self.get_flat_position(index)
+            return Cell(position, self._background, self._display_rect(position.x, position.y), self._layers,
+                        self._scratch)
+
+        return self._cells[index]
+
+    def get_flat_position(self, index):
+        """Returns the interned Position of a flat field index.
+
+        Each field position has one Position instance per Environment, the Cells and their Ants share it.
+
+        Args:
+            index (:obj:`int`): The flat field index (row * cols + col).
+
+        Returns:
+            :obj:`Position`: Position at the index.
+        """
+        position = self._positions[index]
+
+        if position is None:
+            y, x = divmod(index, self._cols)
+            position = self._positions[index] = Position(x, y)
+
+        return position
+
     def get_display_cell(self, event):
         """Returns Cell at the display position.
 
@@ -232,6 +513,32 @@ class Environment:
         """
         return 0 <= position.x < self._cols and 0 <= position.y < self._rows
 
+    def _build_neighbour_table(self):
+        y, x = divmod(arange(self._rows * self._cols), self._cols)
+        xs = x[:, None] + array([rule.x for rule in self._rules])
+        ys = y[:, None] + array([rule.y for rule in self._rules])
+
+        if self._torus:
+            table = (ys % self._rows) * self._cols + xs % self._cols
+
+            # on tiny torus fields different rules can reach the same cell, keep the first one
+            for rule in range(1, table.shape[1]):
+                duplicate = (table[:, :rule] == table[:, rule:rule + 1]).any(axis=1)
+                table[duplicate, rule] = -1
+
+        else:
+            table = where((0 <= xs) & (xs < self._cols) & (0 <= ys) & (ys < self._rows), ys * self._cols + xs, -1)
+
+        return table.astype(int32 if self._rows * self._cols < 2**31 else int64)
+
+    def _display_rect(self, x, y):
+        # (x, y) * transform written out, the affine operator is too slow for a rect per cell
+        t = self._transform
+        return Rect(t.a * x + t.b * y + t.c, t.d * x + t.e * y + t.f, t.a, t.e)
+
+    def _row(self, y):
+        return [self.get_cell(Position(x, y)) for x in range(self._cols)]
+
     def __repr__(self):
         msg = '<{}(transform={}, size=({},{}), neighbours={}, torus={}) at {}>'.format(
             __class__.__name__, self._rows, self._transform,
@@ -240,124 +547,178 @@ class Environment:
         return msg
 
     def __len__(self):
-        return self._field.__len__()
+        return self._rows
 
     def __getitem__(self, item):
+        if self._field is None:
+            rows = range(self._rows)[item]
+            return [self._row(y) for y in rows] if isinstance(item, slice) else self._row(rows)
+
         return self._field.__getitem__(item)
 
     def __iter__(self):
+        if self._field is None:
+            return (self._row(y) for y in range(self._rows))
+
         return self._field.__iter__()
 
 
 class Cell:
     """Cell is a component of the Environment field.
 
-    This class holds references to the static classes/agents (Hole, Nutrient, Obstacles and Pheromone) of the model.
+    This class provides access to the static classes/agents (Hole, Nutrient, Obstacles and Pheromone) of the model.
     Further this class provides an interface to spawn the following classes: Hole, Nutrient, Obstacle, and Ant.
     A Cell can have only a Hole or Nutrient or Obstacle classes can not exists in parallel on a Cell.
+    The state of a Cell lives in the FieldLayers of the Environment, a Cell is therefore a view of the layers
+    at its position. A Cell without layers stores its state in private layers of size one.
 
     Args:
         position (:obj:`Position`): Cell position on Environment field.
-        background (:obj:`Surface`): The surface to draw the Cell on.
+        background (:obj:`Surface`): The surface to draw the Cell on, None if headless.
         rect (:obj:`Rect`): The position of the cell on the display.
+        layers (:obj:`FieldLayers`, optional): The field layers storing the Cell state.
+        surface (:obj:`Surface`, optional): Surface to draw on, by default the Cell allocates its own on first
+            draw.
 
     Attributes:
         pos (:obj:`Position`): Cell position on Environment field.
+        flat (:obj:`int`): Flat field index of the Cell, row * cols + col.
         rect (:obj:`Rect`): Pygame rect stores Cell position on display.
-        surface (:obj:`Surface`): Surface to draw on.
     """
-    def __init__(self, position, background, rect):
+    __slots__ = ('pos', 'background', 'flat', 'rect', '_layers', '_index', '_hash', '_surface', '_nutrient',
+                 '_pheromone', '_obstacle')
+
+    def __init__(self, position, background, rect, layers=None, surface=None):
         self.pos = position
         self.background = background
 
-        self.surface = Surface((rect.width, rect.height))
-        self.rect = self.surface.get_rect(
-            top=rect.top,
-            left=rect.left,
-            width=rect.width,
-            height=rect.height
-        )
+        if layers is None:
+            self._layers, self._index = FieldLayers((1, 1)), (0, 0)
+            self._layers.cells = lambda index: self  # a standalone Cell is a field of its own
+
+        else:
+            self._layers, self._index = layers, (position.y, position.x)
+
+        self.flat = self._index[0] * self._layers.shape[1] + self._index[1]
+        self._hash = position._hash  # shares the hash object of the Position
 
-        self._hole = None
-        self._selected = False  # true if the cell is selected on display
+        self._surface = surface
+        self.rect = Rect(rect.left, rect.top, rect.width, rect.height)
+
+        # agents are created on first access and cached, their state lives in the layers
         self._nutrient = None
         self._pheromone = None
         self._obstacle = None
 
+    @property
+    def surface(self):
+        """:obj:`Surface`: Surface to draw on, allocated on first access, None if headless."""
+        if self._surface is None and self.background is not None:
+            self._surface = Surface((self.rect.width, self.rect.height))
+
+        return self._surface
+
+    @property
+    def streams(self):
+        """:obj:`RandomStreams`: Random streams of the field, used by the Ants spawned on the Cell."""
+        return self._layers.streams
+
+    @property
+    def cells(self):
+        """:obj:`callable`: Returns the Cell at a flat field index, used by the Ants spawned on the Cell."""
+        return self._layers.cells
+
     @property
     def hole(self):
         """:obj:`Hole`: The Hole, raises CellAgentError if Cell has no Hole."""
         if self.has_hole():
-            return self._hole
+            return self._layers.holes[self._index]
 
         raise CellAgentError('Cell has no hole agents')
 
     @hole.deleter
     def hole(self):
-        self._hole = None
+        self._layers.vacate(self._index, HOLE)
 
     @property
     def nutrient(self):
         """:obj:`Nutrient`: The Nutrient, raises CellAgentError if Cell has no Nutrient."""
         if self.has_nutrient():
+            if self._nutrient is None:
+                self._nutrient = Nutrient(self._layers.amount[self._index], self._surface, self.rect.width,
+                                          self.rect.height, store=self._layers.amount, index=self._index)
+
             return self._nutrient
 
+        self._nutrient = None  # removed through the layers, release the agent and its surface
         raise CellAgentError('Cell has no nutrient agents')
 
     @nutrient.deleter
     def nutrient(self):
+        self._layers.vacate(self._index, NUTRIENT)
         self._nutrient = None
 
     @property
     def obstacle(self):
         """:obj:`Nutrient`: The Obstacle, raises CellAgentError if Cell has no Nutrient."""
         if self.has_obstacle():
+            if self._obstacle is None:
+                self._obstacle = Obstacle(self._surface, self.rect.width, self.rect.height)
+
             return self._obstacle
 
+        self._obstacle = None
         raise CellAgentError('Cell has no obstacle agents')
 
     @obstacle.deleter
     def obstacle(self):
+        self._layers.vacate(self._index, OBSTACLE)
         self._obstacle = None
 
     @property
     def pheromone(self):
         """:obj:`Pheromone`: The Pheromone, raises CellAgentError if Cell has no Pheromone."""
         if self.has_pheromone():
+            if self._pheromone is None:
+                layers = self._layers
+                self._pheromone = Pheromone(self._surface, self.rect.width, self.rect.height, layers.gamma, layers.q,
+                                            layers.rho, layers, self._index)
+
             return self._pheromone
 
+        self._pheromone = None  # e.g. evaporated, release the agent and its surface
         raise CellAgentError('Cell has no pheromone agents')
 
     @pheromone.deleter
     def pheromone(self):
+        self._layers.remove_pheromone(self._index)
         self._pheromone = None
 
     def set_selected(self):
         """Flip selection state"""
-        self._selected = not self._selected
+        self._layers.selected[self._index] = not self._layers.selected[self._index]
 
     def draw(self):
         """Draw Cell on surface."""
-        # uncomment for disco mode
-        # self.surface.fill([GLOBAL_RNG.randint(0,255,1), GLOBAL_RNG.randint(0,255,1), GLOBAL_RNG.randint(0,255,1)])
+        # uncomment for disco mode, the colors come from the spawn stream, the move stream drives the Ants
+        # self.surface.fill(self.streams.spawn.integers(0, 256, 3).tolist())
 
-        self.surface.fill(CELL_COLOR)  # clear cell content for new draw
+        surface = self.surface
+        surface.fill(CELL_COLOR)  # clear cell content for new draw
 
-        if self._selected:
-            square(self.surface, SELECTION_COLOR, self.surface.get_rect(), 1)
+        if self._layers.selected[self._index]:
+            square(surface, SELECTION_COLOR, surface.get_rect(), 1)
 
         # order matters pheromones can exist on all cells, drawing them first ensures that they dont cover the other
         # agents
         for attr in ['pheromone', 'nutrient', 'hole', 'obstacle']:
+            obj = self._agent(attr)
 
-            try:
-                obj = self.__getattribute__(attr)
+            if obj is not None:
+                obj.background = surface  # agents are created before the cell surface is allocated
                 obj.draw()
 
-            except CellAgentError:
-                continue
-
-        self.background.blit(self.surface, self.rect)
+        self.background.blit(surface, self.rect)
 
     def spawn_hole(self):
         """Spawns a Hole on the Cell.
@@ -368,11 +729,9 @@ class Cell:
         Raises:
             CellOccupiedError: If the Cell is already occupied by a Hole or Nutrient.
         """
-        if not self.occupied():
-            self._hole = Hole(self.surface, self.rect.width, self.rect.height)
-            return self
-
-        raise CellOccupiedError("Cell has already a Nutrient or Hole or Obstacle")
+        self._layers.occupy(self._index, HOLE)
+        self._layers.holes[self._index] = Hole(self._surface, self.rect.width, self.rect.height)
+        return self
 
     def spawn_nutrient(self, amount):
         """Spawns a Nutrient on the Cell.
@@ -383,11 +742,10 @@ class Cell:
         Raises:
             CellOccupiedError: If the Cell is already occupied by a Hole or Nutrient.
         """
-        if not self.occupied():
-            self._nutrient = Nutrient(amount, self.surface, self.rect.width, self.rect.height)
-            return self
-
-        raise CellOccupiedError("Cell has already a Nutrient or Hole or Obstacle")
+        self._layers.occupy(self._index, NUTRIENT)
+        self._nutrient = Nutrient(amount, self._surface, self.rect.width, self.rect.height,
+                                  store=self._layers.amount, index=self._index)
+        return self
 
     def spawn_obstacle(self):
         """Spawns an Obstacle on the Cell.
@@ -398,11 +756,9 @@ class Cell:
         Raises:
             CellOccupiedError: If the Cell is already occupied by a Hole or Nutrient or Obstacle.
         """
-        if not self.occupied():
-            self._obstacle = Obstacle(self.surface, self.rect.width, self.rect.height)
-            return self
-
-        raise CellOccupiedError("Cell has already a Nutrient or Hole or Obstacle")
+        self._layers.occupy(self._index, OBSTACLE)
+        self._obstacle = Obstacle(self._surface, self.rect.width, self.rect.height)
+        return self
 
     def spawn_pheromone(self):
         """Spawns a Pheromone on the Cell.
@@ -414,11 +770,27 @@ class Cell:
             CellOccupiedError: If the Cell is already occupied by a Hole or Nutrient or Obstacle.
         """
         if not self.has_pheromone():
-            self._pheromone = Pheromone(self.surface, self.rect.width, self.rect.height)
+            self._layers.add_pheromone(self._index)
             return self.pheromone
 
         raise CellOccupiedError('Cell has already a Pheromone')
 
+    def spawn_ants(self, n, **kwargs):
+        """Spawns many Ant agents.
+
+        Args:
+            n (:obj:`int`): Number of Ants to spawn.
+            **kwargs: Please refer to Ant factory method or Ant base class for further details
+
+        Returns:
+            :obj:`list(Ant)`: The spawned Ants.
+
+        Raises:
+            CellAgentError: If the Cell does not have a Hole.
+        """
+        hole = self.hole  # raises if the Cell has no Hole
+        return [hole.spawn_ant(self, self.background, self.rect, **kwargs) for _ in range(n)]
+
     def spawn_ant(self, **kwargs):
         """Spawns an Ant agents.
 
@@ -435,7 +807,7 @@ class Cell:
         """
         if self.has_hole():
             # receives the background and the cell rect
-            return self._hole.spawn_ant(self, self.background, self.rect, **kwargs)
+            return self.hole.spawn_ant(self, self.background, self.rect, **kwargs)
 
         raise CellAgentError("Ant spawn requires a hole agents")
 
@@ -445,7 +817,7 @@ class Cell:
         Returns:
             :obj:`bool`
         """
-        return self._hole is not None
+        return self._layers.occupancy[self._index] == HOLE
 
     def has_nutrient(self):
         """Does the Cell have a Nutrient?
@@ -453,7 +825,7 @@ class Cell:
         Returns:
             :obj:`bool`
         """
-        return self._nutrient is not None
+        return self._layers.occupancy[self._index] == NUTRIENT
 
     def has_obstacle(self):
         """Does the Cell have an Obstacle?
@@ -461,7 +833,7 @@ class Cell:
         Returns:
             :obj:`bool`
         """
-        return self._obstacle is not None
+        return self._layers.occupancy[self._index] == OBSTACLE
 
     def has_pheromone(self):
         """Does the Cell have a Pheromone?
@@ -469,34 +841,61 @@ class Cell:
         Returns:
             :obj:`bool`
         """
-        return self._pheromone is not None
+        return self._layers.pheromone[self._index]
+
+    def attraction(self, alpha, gamma):
+        """Pheromone term intensity**alpha of the Ant movement weight.
+
+        Looked up in the weight layer if alpha and gamma equal those of the field, computed otherwise.
+
+        Args:
+            alpha (:obj:`float`): Importance of pheromone deposit of the Ant.
+            gamma (:obj:`float`): Pheromone init value of the Ant, used if the Cell has no Pheromone.
+
+        Returns:
+            :obj:`float`
+        """
+        layers = self._layers
+
+        if alpha == layers.alpha and gamma == layers.gamma:
+            return layers.weight.item(self._index)
+
+        return (layers.intensity.item(self._index) if layers.pheromone[self._index] else gamma) ** alpha
 
     def occupied(self):
         """Is the Cell occupied?
 
-        True if has_hole or has_nutrient evaluate to true.
+        True if has_hole or has_nutrient or has_obstacle evaluate to true.
 
         Returns:
             :obj:`bool`
         """
-        return self._hole or self._nutrient or self._obstacle
+        return self._layers.occupancy[self._index] != EMPTY
+
+    def _agent(self, attr):
+        try:
+            return self.__getattribute__(attr)
+
+        except CellAgentError:
+            return None
 
     def __eq__(self, other):
         if isinstance(other, Cell):
-            return self.pos == other.pos
+            return self is other or self.pos == other.pos
 
         return False
 
     def __hash__(self):
-        return hash((__class__.__name__, hash(self.pos)))
+        return self._hash
 
     def __str__(self):
-        return '{} POS{} -> {}/ {}/ {}/ {}'.format(__class__.__name__, self.pos, self._pheromone, self._hole,
-                                                   self._nutrient, self._obstacle)
+        return '{} POS{} -> {}/ {}/ {}/ {}'.format(__class__.__name__, self.pos, self._agent('pheromone'),
+                                                   self._agent('hole'), self._agent('nutrient'),
+                                                   self._agent('obstacle'))
 
     def __repr__(self):
         return '<{}(position={}, rect={}, surface={}) at {}>'.format(
-            __class__.__name__, self.pos, self.rect, self.surface, hex(id(self))
+            __class__.__name__, self.pos, self.rect, self._surface, hex(id(self))
         )
 
 
@@ -505,6 +904,8 @@ class Position:
 
     Provides an interface to add and compare positions by python dunder methods.
     Positions are hashable therefore operations like position in positions are possible.
+    Positions are immutable, their hash is computed once. The Environment interns the
+    Position of each field cell.
 
     Args:
         x (:obj:`int`): X-coord
@@ -514,9 +915,15 @@ class Position:
         x (:obj:`int`): X-coord
         y (:obj:`int`): Y-coord
     """
+    __slots__ = ('x', 'y', '_hash')
+
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, '_hash', hash((x, y)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(__class__.__name__))
 
     def __add__(self, other):
         if isinstance(other, Position):
@@ -525,7 +932,7 @@ class Position:
         raise ValueError()
 
     def __hash__(self):
-        return hash((__class__.__name__, self.x, self.y))
+        return self._hash
 
     def __eq__(self, other):
         if isinstance(other, Position):
@@ -533,6 +940,9 @@ class Position:
 
         return False
 
+    def __reduce__(self):
+        return __class__, (self.x, self.y)
+
     def __str__(self):
         return '({}, {})'.format(self.x, self.y)
 
@@ -37,3 +37,7 @@ class AgentBaseException(Exception):
 
 class NutrientEmptyError(Exception):
     """Raise if nutrient stack is empty"""
+
+
+class ScenarioError(Exception):
+    """Raise if a scenario file is malformed or does not fit the environment"""
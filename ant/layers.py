@@ -0,0 +1,300 @@
+"""
+layers
+******
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from numpy import arange
+from numpy import copyto
+from numpy import float64
+from numpy import full
+from numpy import int64
+from numpy import less
+from numpy import logical_and
+from numpy import logical_xor
+from numpy import multiply
+from numpy import sort
+from numpy import uint8
+from numpy import zeros
+
+from ant.errors import CellOccupiedError
+from ant.settings import ALPHA
+from ant.settings import GAMMA
+from ant.settings import Q
+from ant.settings import RHO
+from ant.stats import PheromoneStats
+from ant.streams import RandomStreams
+
+# occupancy codes, a cell holds at most one of these agents
+EMPTY = 0
+HOLE = 1
+NUTRIENT = 2
+OBSTACLE = 3
+
+
+class FieldLayers:
+    """Array storage of the Environment field state.
+
+    Each layer is a NumPy array indexed by (row, col). The layers are the single source of truth
+    for the field state, Cells only read and write them. Holes keep their colony bookkeeping and
+    are therefore stored as objects keyed by their (row, col) index.
+
+    The layers maintain an index of the free cells. It is a swap-remove array of flat field indices plus
+    the slot of each cell in it, kept up to date by occupy and vacate. The next free cell and the check
+    for a full field are therefore O(1). Likewise they maintain the statistics of the Pheromone intensities
+    and the weight layer, intensity**alpha per cell, which turns the pheromone term of the Ant movement
+    weights into a lookup. Writes of the intensity layer therefore go through set_intensity, add_pheromone,
+    remove_pheromone or evaporate, or update stats and weight themselves.
+
+    Args:
+        size (:obj:`tuple(int, int)`): Number of rows and columns of the field.
+        gamma (:obj:`float`, optional): Pheromone init value.
+        rho (:obj:`float`, optional): Pheromone decay of a deposit.
+        q (:obj:`float`, optional): Pheromone increment of a deposit.
+        streams (:obj:`RandomStreams`, optional): Random streams of the field, seeded with SEED by default.
+        alpha (:obj:`float`, optional): Importance of pheromone deposit, the exponent of the weight layer.
+
+    Attributes:
+        gamma (:obj:`float`): Pheromone init value.
+        rho (:obj:`float`): Pheromone decay of a deposit.
+        q (:obj:`float`): Pheromone increment of a deposit.
+        alpha (:obj:`float`): Importance of pheromone deposit.
+        streams (:obj:`RandomStreams`): Random streams of the field, Cells hand them to their Ants.
+        cells (:obj:`callable`): Returns the Cell at a flat field index, set by the Environment, Cells hand it to
+            their Ants.
+        occupancy (:obj:`ndarray`): One of EMPTY, HOLE, NUTRIENT or OBSTACLE per cell.
+        amount (:obj:`ndarray`): Nutrient units per cell.
+        intensity (:obj:`ndarray`): Pheromone intensity per cell, gamma if the cell has no Pheromone.
+        weight (:obj:`ndarray`): Pheromone intensity**alpha per cell.
+        pheromone (:obj:`ndarray`): True if the cell has a Pheromone.
+        selected (:obj:`ndarray`): True if the cell is selected on display.
+        holes (:obj:`dict`): Hole objects keyed by their (row, col) index.
+        stats (:obj:`PheromoneStats`): Count, min, max and mean of the Pheromone intensities.
+    """
+    def __init__(self, size, gamma=GAMMA, rho=RHO, q=Q, streams=None, alpha=ALPHA):
+        self.gamma = gamma
+        self.rho = rho
+        self.q = q
+        self.alpha = alpha
+        self.streams = RandomStreams() if streams is None else streams
+        self.cells = None
+
+        self.occupancy = zeros(size, dtype=uint8)
+        self.amount = zeros(size, dtype=int64)
+        self.intensity = full(size, gamma, dtype=float64)
+        self.weight = full(size, gamma ** alpha, dtype=float64)
+        self.pheromone = zeros(size, dtype=bool)
+        self.selected = zeros(size, dtype=bool)
+        self.holes = dict()
+        self.stats = PheromoneStats(self.intensity)
+
+        self._evaporated = zeros(size, dtype=bool)  # buffer, avoids allocations per evaporation
+
+        # free cells, the next free cell is at the end, slot is -1 for occupied cells
+        cells = self.occupancy.size
+        self._free = arange(cells - 1, -1, -1, dtype=int64)
+        self._slot = arange(cells - 1, -1, -1, dtype=int64)
+        self._free_count = cells
+        self._rng = None
+
+    @property
+    def shape(self):
+        """:obj:`tuple(int, int)`: Number of rows and columns of the field."""
+        return self.occupancy.shape
+
+    @property
+    def free_count(self):
+        """:obj:`int`: Number of cells without a Hole, Nutrient or Obstacle."""
+        return self._free_count
+
+    def order_free(self, order, rng=None):
+        """Sets the order in which free_cell returns the free cells.
+
+        Args:
+            order (:obj:`ndarray`): Flat field indices, a permutation of all cells.
+            rng (:obj:`Generator`, optional): If set vacated cells are put at a random position of the
+                order, otherwise they are returned next.
+        """
+        order = order[::-1]
+        free = order[self.occupancy.reshape(-1)[order] == EMPTY]
+
+        self._free[:free.size] = free
+        self._slot[:] = -1
+        self._slot[free] = arange(free.size)
+        self._free_count = free.size
+        self._rng = rng
+
+    def free_cell(self):
+        """Returns the next free cell.
+
+        Returns:
+            :obj:`int`: The flat field index of the cell or None if all cells are occupied.
+        """
+        if not self._free_count:
+            return None
+
+        return int(self._free[self._free_count - 1])
+
+    def free_cells(self, count):
+        """Returns the next free cells.
+
+        Args:
+            count (:obj:`int`): Number of free cells.
+
+        Returns:
+            :obj:`ndarray`: Flat field indices in the order of free_cell, fewer than count if the field has
+            less free cells.
+        """
+        start = max(self._free_count - count, 0)
+        return self._free[start:self._free_count][::-1].copy()
+
+    def occupy(self, index, kind):
+        """Marks a cell as occupied.
+
+        Args:
+            index (:obj:`tuple(int, int)`): The (row, col) index of the cell.
+            kind (:obj:`int`): One of HOLE, NUTRIENT or OBSTACLE.
+
+        Raises:
+            CellOccupiedError: If the cell is already occupied.
+        """
+        if self.occupancy[index] != EMPTY:
+            raise CellOccupiedError("Cell has already a Nutrient or Hole or Obstacle")
+
+        self.occupancy[index] = kind
+        self._take(index[0] * self.shape[1] + index[1])
+
+    def occupy_many(self, cells, kind):
+        """Marks many cells as occupied at once.
+
+        Args:
+            cells (:obj:`ndarray`): Flat field indices of the cells.
+            kind (:obj:`int`): One of HOLE, NUTRIENT or OBSTACLE.
+
+        Raises:
+            CellOccupiedError: If a cell is already occupied or listed twice.
+        """
+        if not cells.size:
+            return
+
+        occupancy = self.occupancy.reshape(-1)
+        ordered = sort(cells)
+
+        if (occupancy[cells] != EMPTY).any() or (ordered[1:] == ordered[:-1]).any():
+            raise CellOccupiedError("Cells have already a Nutrient or Hole or Obstacle")
+
+        occupancy[cells] = kind
+
+        # compact the free cells, keeps the order of the remaining ones
+        free = self._free[:self._free_count]
+        free = free[occupancy[free] == EMPTY]
+
+        self._free[:free.size] = free
+        self._slot[cells] = -1
+        self._slot[free] = arange(free.size)
+        self._free_count = free.size
+
+    def vacate(self, index, kind):
+        """Clears a cell if it is occupied by kind.
+
+        Args:
+            index (:obj:`tuple(int, int)`): The (row, col) index of the cell.
+            kind (:obj:`int`): One of HOLE, NUTRIENT or OBSTACLE.
+        """
+        if self.occupancy[index] != kind:
+            return
+
+        self.occupancy[index] = EMPTY
+        self._give(index[0] * self.shape[1] + index[1])
+
+        if kind == HOLE:
+            del self.holes[index]
+
+        elif kind == NUTRIENT:
+            self.amount[index] = 0
+
+    def _take(self, cell):
+        # swap remove, the last free cell moves into the slot of the occupied one
+        slot, last = self._slot[cell], self._free_count - 1
+        moved = self._free[last]
+
+        self._free[slot] = moved
+        self._slot[moved] = slot
+        self._slot[cell] = -1
+        self._free_count = last
+
+    def _give(self, cell):
+        slot = self._free_count
+
+        self._free[slot] = cell
+        self._slot[cell] = slot
+        self._free_count += 1
+
+        if self._rng is not None:
+            # keep the order random, swap with a random free cell
+            other = self._rng.integers(slot + 1)
+            swapped = self._free[other]
+
+            self._free[slot], self._free[other] = swapped, cell
+            self._slot[swapped], self._slot[cell] = slot, other
+
+    def set_intensity(self, index, value):
+        """Writes the Pheromone intensity of a cell.
+
+        Args:
+            index (:obj:`tuple(int, int)`): The (row, col) index of the cell.
+            value (:obj:`float`): The intensity.
+        """
+        self.intensity[index] = value
+        self.weight[index] = value ** self.alpha
+        self.stats.update(index, value)
+
+    def add_pheromone(self, index):
+        """Adds a Pheromone with the current intensity to a cell.
+
+        Args:
+            index (:obj:`tuple(int, int)`): The (row, col) index of the cell.
+        """
+        self.pheromone[index] = True
+        self.stats.update(index, self.intensity[index])
+
+    def remove_pheromone(self, index):
+        """Removes the Pheromone of a cell and resets its intensity.
+
+        Args:
+            index (:obj:`tuple(int, int)`): The (row, col) index of the cell.
+        """
+        self.pheromone[index] = False
+        self.intensity[index] = self.gamma
+        self.weight[index] = self.gamma ** self.alpha
+        self.stats.remove(index)
+
+    def evaporate(self, rho=RHO, floor=None):
+        """Evaporates all Pheromones of the field at once.
+
+        Decays the intensity of each cell with a Pheromone by (1 - rho) and its weight by (1 - rho)**alpha.
+        If floor is set Pheromones whose intensity drops below floor are removed and their intensity drops
+        back to gamma.
+
+        Args:
+            rho (:obj:`float`, optional): Pheromone decay (0 < rho < 1).
+            floor (:obj:`float`, optional): Intensity below which a Pheromone is removed.
+        """
+        multiply(self.intensity, 1 - rho, out=self.intensity, where=self.pheromone)
+        multiply(self.weight, (1 - rho) ** self.alpha, out=self.weight, where=self.pheromone)
+        self.stats.scale(1 - rho)
+
+        if floor is None:
+            return
+
+        less(self.intensity, floor, out=self._evaporated)
+        logical_and(self._evaporated, self.pheromone, out=self._evaporated)
+
+        copyto(self.intensity, self.gamma, where=self._evaporated)
+        copyto(self.weight, self.gamma ** self.alpha, where=self._evaporated)
+        logical_xor(self.pheromone, self._evaporated, out=self.pheromone)
+        self.stats.remove_many(self._evaporated)
+
+    def __repr__(self):
+        return '<{}(size={}, gamma={}) at {}>'.format(__class__.__name__, self.shape, self.gamma, hex(id(self)))
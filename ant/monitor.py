@@ -5,21 +5,202 @@ monitor
 :Author: tobijjah
 :Date: 02.06.19
 """
+import csv
+import json
 
+from numpy import array
+from numpy import bool_
+from numpy import concatenate
+from numpy import count_nonzero
+from numpy import generic
+from numpy import int64
+from numpy import ndarray
 
-class PheromoneMonitor:
-    def __init__(self, environment):
-        environment.on_pheromone.connect(self.add_cell)
-        self.monitored_cell = []
+from ant.layers import NUTRIENT
+from ant.writer import BackgroundWriter
 
-    def add_cell(self, cell):
-        self.monitored_cell.append(cell)
 
-    def run(self):
-        intensities = [cell.pheromone.intensity for cell in self.monitored_cell]
+class Monitor:
+    """Streams metrics of a simulation to a sink.
 
-        if intensities:
-            min_intensity = min(intensities)
-            max_intensity = max(intensities)
+    Connect the monitor to the on_tick signal of a simulation. Every n ticks it samples the pheromone
+    count, min, max and mean, the nutrients collected per Hole, the remaining nutrient units and sites
+    and the number of foraging and returning Ants. The pheromone statistics are maintained by the layers,
+    the nutrient statistics are vectorized reductions of the layers computed on sampled ticks only.
+    Records are written by the background writer of the sink.
 
-            print(min_intensity, max_intensity)
+    Args:
+        sink (:obj:`CsvSink` or :obj:`JsonLinesSink`): Destination of the records.
+        every (:obj:`int`, optional): Sample every n ticks.
+    """
+    def __init__(self, sink, every=1):
+        self._sink = sink
+        self._every = every
+
+    def __call__(self, simulation):
+        if simulation.ticks % self._every == 0:
+            self._sink.write(self.sample(simulation))
+
+    @staticmethod
+    def sample(simulation):
+        """Samples the metrics of a simulation.
+
+        Args:
+            simulation (:obj:`Simulation`): The simulation.
+
+        Returns:
+            :obj:`dict`: The metrics, the nutrients collected per Hole are keyed by hole_<id>.
+        """
+        layers = simulation.environment.layers
+        stats = layers.stats
+
+        returning = sum(ant.mandible_full() for ant in simulation.ants)
+        ants = len(simulation.ants)
+
+        if simulation.colony is not None:
+            returning += count_nonzero(simulation.colony.mandible)
+            ants += len(simulation.colony)
+
+        nutrients = layers.occupancy == NUTRIENT
+
+        record = {
+            'tick': simulation.ticks,
+            'pheromone_count': stats.count,
+            'pheromone_min': stats.min,
+            'pheromone_max': stats.max,
+            'pheromone_mean': stats.mean,
+            'nutrient_remaining': int(layers.amount[nutrients].sum()),
+            'nutrient_sites': int(count_nonzero(layers.amount[nutrients])),
+            'ants_foraging': int(ants - returning),
+            'ants_returning': int(returning),
+        }
+
+        for hole in layers.holes.values():
+            record['hole_{}'.format(hole.id)] = hole.nutrients
+
+        return record
+
+    def close(self):
+        """Closes the sink."""
+        self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class Tracer(Monitor):
+    """Streams a structured trace of the Ants of a simulation to a sink.
+
+    Connect the tracer to the on_tick signal of a simulation. Every n ticks it records the flat field index
+    of the cell of each Ant and whether the Ant carries a nutrient, the Ants of a Colony follow the
+    Ant objects. The tick loop only copies these into arrays, they are converted and written by the
+    background writer of the sink.
+
+    Args:
+        sink (:obj:`JsonLinesSink`): Destination of the records.
+        every (:obj:`int`, optional): Record every n ticks.
+    """
+    @staticmethod
+    def sample(simulation):
+        """Records the Ants of a simulation.
+
+        Args:
+            simulation (:obj:`Simulation`): The simulation.
+
+        Returns:
+            :obj:`dict`: The tick, the cells and the loaded flags of the Ants.
+        """
+        _, cols = simulation.environment.size
+
+        cells = array([ant.pos.y * cols + ant.pos.x for ant in simulation.ants], dtype=int64)
+        loaded = array([ant.mandible_full() for ant in simulation.ants], dtype=bool_)
+
+        if simulation.colony is not None:
+            cells = concatenate([cells, simulation.colony.position])
+            loaded = concatenate([loaded, simulation.colony.mandible > 0])
+
+        return {'tick': simulation.ticks, 'cells': cells, 'loaded': loaded}
+
+
+class JsonLinesSink:
+    """Appends records as JSON lines to a file on a background writer.
+
+    Args:
+        path (:obj:`str`): Path of the file.
+        writer (:obj:`BackgroundWriter`, optional): Writer to share, by default the sink owns one.
+    """
+    def __init__(self, path, writer=None):
+        self._file = open(path, 'w')
+
+        self._owner = writer is None
+        self._writer = BackgroundWriter(name='metrics') if writer is None else writer
+
+    def write(self, record):
+        """Queues a record.
+
+        Args:
+            record (:obj:`dict`): The record.
+        """
+        self._writer.submit(self._write, record)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, default=_plain) + '\n')
+
+    def close(self):
+        """Writes the queued records and closes the file."""
+        if self._owner:
+            self._writer.close()
+
+        else:
+            self._writer.flush()
+
+        self._file.close()
+
+
+class CsvSink(JsonLinesSink):
+    """Appends records as CSV rows to a file on a background writer.
+
+    The columns are the keys of the first record, later keys are dropped, e.g. of Holes spawned
+    after the first record.
+
+    Args:
+        path (:obj:`str`): Path of the file.
+        writer (:obj:`BackgroundWriter`, optional): Writer to share, by default the sink owns one.
+    """
+    def __init__(self, path, writer=None):
+        super().__init__(path, writer)
+        self._csv = None
+
+    def _write(self, record):
+        if self._csv is None:
+            self._csv = csv.DictWriter(self._file, fieldnames=list(record), extrasaction='ignore')
+            self._csv.writeheader()
+
+        self._csv.writerow(record)
+
+
+def _plain(value):
+    # arrays and scalars of numpy records are converted on the writer thread
+    if isinstance(value, (ndarray, generic)):
+        return value.tolist()
+
+    raise TypeError('{} is not JSON serializable'.format(type(value).__name__))
+
+
+def sink(path, writer=None):
+    """Creates the sink of a file, CSV if the path ends with .csv otherwise JSON lines.
+
+    Args:
+        path (:obj:`str`): Path of the file.
+        writer (:obj:`BackgroundWriter`, optional): Writer to share.
+
+    Returns:
+        :obj:`CsvSink` or :obj:`JsonLinesSink`
+    """
+    if path.endswith('.csv'):
+        return CsvSink(path, writer)
+
+    return JsonLinesSink(path, writer)
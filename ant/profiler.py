@@ -0,0 +1,117 @@
+"""
+profiler
+********
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from cProfile import Profile
+from time import perf_counter
+
+PHASES = ('collide', 'move', 'colony', 'evaporate', 'signal', 'draw', 'display')
+""":obj:`tuple`: Phases of a tick in the order they run."""
+
+
+class Profiler:
+    """Wall time and call counters of the phases of the simulation ticks.
+
+    Profiling is opt-in, a Simulation only times its phases if a Profiler is attached. The phases are
+    timed as laps, each lap adds the time since the previous lap or mark to its phase. A tick therefore
+    costs a few clock reads regardless of the number of Ants. Optionally a window of ticks is profiled
+    with cProfile and its stats are dumped in the pstats format.
+
+    Args:
+        window (:obj:`tuple(int, int)`, optional): First and last tick (exclusive) profiled with cProfile,
+            no ticks are profiled if None.
+        path (:obj:`str`, optional): File to dump the pstats of the window to.
+
+    Attributes:
+        seconds (:obj:`dict`): Wall time in seconds per phase.
+        calls (:obj:`dict`): Number of timed calls per phase.
+        ticks (:obj:`int`): Number of profiled ticks.
+    """
+    def __init__(self, window=None, path=None):
+        self.seconds = dict.fromkeys(PHASES, 0.)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.ticks = 0
+
+        self._window = window
+        self._path = path
+        self._profile = None
+        self._last = perf_counter()
+
+    def begin(self, tick):
+        """Starts a tick, enables or disables cProfile at the bounds of the window.
+
+        Args:
+            tick (:obj:`int`): Number of the tick.
+        """
+        if self._window is not None:
+            start, stop = self._window
+
+            if tick == start:
+                self._profile = Profile()
+                self._profile.enable()
+
+            elif tick == stop:
+                self._dump()
+
+        self.ticks += 1
+        self.mark()
+
+    def mark(self):
+        """Starts the next lap without recording the time since the previous one."""
+        self._last = perf_counter()
+
+    def lap(self, phase):
+        """Adds the time since the previous lap or mark to a phase.
+
+        Args:
+            phase (:obj:`str`): One of PHASES.
+        """
+        now = perf_counter()
+        self.seconds[phase] += now - self._last
+        self.calls[phase] += 1
+        self._last = now
+
+    def report(self):
+        """Formats the counters as table.
+
+        Returns:
+            :obj:`str`: One line per timed phase with its calls, total and mean wall time.
+        """
+        lines = ['{:<10}{:>10}{:>12}{:>12}'.format('phase', 'calls', 'total s', 'mean ms')]
+
+        for phase in PHASES:
+            calls = self.calls[phase]
+
+            if calls:
+                seconds = self.seconds[phase]
+                lines.append('{:<10}{:>10}{:>12.3f}{:>12.3f}'.format(phase, calls, seconds, 1000 * seconds / calls))
+
+        lines.append('{} ticks, {:.3f} s'.format(self.ticks, sum(self.seconds.values())))
+        return '\n'.join(lines)
+
+    def close(self):
+        """Dumps the stats of a window which is still profiled."""
+        self._dump()
+
+    def _dump(self):
+        if self._profile is None:
+            return
+
+        self._profile.disable()
+
+        if self._path is not None:
+            self._profile.dump_stats(self._path)
+
+        self._profile = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return '<{}(window={}, ticks={}) at {}>'.format(__class__.__name__, self._window, self.ticks, hex(id(self)))
@@ -0,0 +1,263 @@
+"""
+renderer
+********
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import pygame
+from affine import Affine
+from numpy import array
+from numpy import bool_
+from numpy import clip
+from numpy import concatenate
+from numpy import flatnonzero
+from numpy import full
+from numpy import int16
+from numpy import int64
+from numpy import ones
+from numpy import uint8
+from numpy import where
+from numpy import zeros
+from pygame import Surface
+from pygame.surfarray import blit_array
+from pygame.transform import scale
+
+from ant.layers import EMPTY
+from ant.settings import CELL_COLOR
+from ant.settings import PHEROMONE_COLOR
+
+# above this share of dirty cells the display is updated at once instead of rect by rect
+FULL_UPDATE_RATIO = 0.25
+
+
+class Renderer:
+    """Draws a Simulation on a pygame display.
+
+    The renderer owns the display, the background surface the Environment draws on and the affine
+    transformation from field coordinates to display coordinates.
+
+    By default the renderer draws incrementally. It remembers the drawn state of each cell (occupancy,
+    nutrient amount, pheromone alpha, selection) and the cells of the Ants. Each frame only cells whose
+    state changed or which an Ant entered or left are marked dirty. Only those cells and the Ants on
+    them are redrawn and only their rects are passed to the display update.
+
+    In heatmap mode the pheromone layer is drawn as one image. The colors of all cells are computed
+    from the intensity array, written to a surface with one pixel per cell and scaled onto the
+    background in a single blit. Only cells with a Hole, Nutrient or Obstacle or a selection and
+    the Ants are drawn on top of it.
+
+    Args:
+        screen_size (:obj:`tuple(int, int)`): Width and height of the display.
+        field_size (:obj:`tuple(int, int)`): Number of rows and columns of the Environment field.
+        incremental (:obj:`bool`, optional): Redraw dirty cells only, otherwise the entire field each frame.
+        heatmap (:obj:`bool`, optional): Draw the pheromone layer as one image, takes precedence over
+            incremental.
+
+    Attributes:
+        screen (:obj:`Surface`): The display surface.
+        background (:obj:`Surface`): The surface the Environment and Ants draw on.
+        transform (:obj:`Affine`): Affine transformation matrix of the display.
+        incremental (:obj:`bool`): Redraw dirty cells only.
+        heatmap (:obj:`bool`): Draw the pheromone layer as one image.
+    """
+    def __init__(self, screen_size, field_size, incremental=True, heatmap=False):
+        pygame.init()
+
+        self.screen = pygame.display.set_mode(screen_size)
+        self.background = Surface((self.screen.get_width(), self.screen.get_height()))
+        self.transform = Affine(
+            screen_size[0] / field_size[1], 0, 0,
+            0, screen_size[1] / field_size[0], 0
+        )
+
+        self.incremental = incremental
+        self.heatmap = heatmap
+
+        self._drawn = None
+        self._image = Surface((field_size[1], field_size[0]))  # one pixel per cell
+
+    def render(self, simulation):
+        """Draws the Environment and Ants of a simulation and updates the display.
+
+        Args:
+            simulation (:obj:`Simulation`): The simulation to draw.
+        """
+        profiler = simulation.profiler
+
+        if profiler is not None:
+            profiler.mark()
+
+        rects = self.draw(simulation)
+
+        if profiler is not None:
+            profiler.lap('draw')
+
+        if rects is None:
+            pygame.display.update()
+
+        elif rects:
+            pygame.display.update(rects)
+
+        if profiler is not None:
+            profiler.lap('display')
+
+    def draw(self, simulation):
+        """Draws the Environment and Ants of a simulation onto the screen.
+
+        Args:
+            simulation (:obj:`Simulation`): The simulation to draw.
+
+        Returns:
+            :obj:`list(Rect)`: The changed areas of the screen, None if the entire screen changed.
+        """
+        if self.heatmap:
+            return self._render_heatmap(simulation)
+
+        if not self.incremental:
+            return self._render_all(simulation)
+
+        state = self.state(simulation)
+        dirty = self.dirty(state)
+        self._drawn = state
+
+        indices = flatnonzero(dirty)
+
+        if not indices.size:
+            return []
+
+        environment = simulation.environment
+        rects = environment.draw(indices)
+
+        # redrawn cells erased the Ants on them
+        for idx in flatnonzero(dirty[state['ants'][:len(simulation.ants)]]).tolist():
+            simulation.ants[idx].draw()
+
+        if simulation.colony is not None:
+            for idx in flatnonzero(dirty[simulation.colony.position]).tolist():
+                simulation.colony[idx].draw()
+
+        if indices.size > FULL_UPDATE_RATIO * dirty.size:
+            self.screen.blit(self.background, self.background.get_rect())
+            return None
+
+        for rect in rects:
+            self.screen.blit(self.background, rect, rect)
+
+        return rects
+
+    def invalidate(self):
+        """Forces a redraw of the entire field on the next frame, e.g. after the display was cleared."""
+        self._drawn = None
+
+    def state(self, simulation):
+        """Captures the drawn state of a simulation.
+
+        Args:
+            simulation (:obj:`Simulation`): The simulation to capture.
+
+        Returns:
+            :obj:`dict`: Flat arrays of the cell layers as drawn and the flat cell index and mandible state
+            of each Ant, Ant objects first followed by the colony.
+        """
+        layers = simulation.environment.layers
+        _, cols = simulation.environment.size
+
+        ants = array([ant.pos.y * cols + ant.pos.x for ant in simulation.ants], dtype=int64)
+        loaded = array([ant.mandible_full() for ant in simulation.ants], dtype=bool_)
+
+        if simulation.colony is not None:
+            ants = concatenate([ants, simulation.colony.position])
+            loaded = concatenate([loaded, simulation.colony.mandible > 0])
+
+        return {
+            'occupancy': layers.occupancy.reshape(-1).copy(),
+            'amount': layers.amount.reshape(-1).copy(),
+            'selected': layers.selected.reshape(-1).copy(),
+            'pheromone': self._pheromone_alpha(layers),
+            'ants': ants,
+            'loaded': loaded,
+        }
+
+    def dirty(self, state):
+        """Determines the cells which changed since the last drawn state.
+
+        Args:
+            state (:obj:`dict`): The current state, see state.
+
+        Returns:
+            :obj:`ndarray`: Flat mask of the dirty cells, all cells if nothing was drawn yet.
+        """
+        drawn = self._drawn
+
+        if drawn is None or drawn['occupancy'].size != state['occupancy'].size:
+            return ones(state['occupancy'].size, dtype=bool_)
+
+        dirty = zeros(state['occupancy'].size, dtype=bool_)
+
+        for layer in ['occupancy', 'amount', 'selected', 'pheromone']:
+            dirty |= state[layer] != drawn[layer]
+
+        ants, before = state['ants'], drawn['ants']
+
+        if ants.size == before.size:
+            moved = (ants != before) | (state['loaded'] != drawn['loaded'])
+            ants, before = ants[moved], before[moved]
+
+        dirty[ants] = True
+        dirty[before] = True
+
+        return dirty
+
+    @staticmethod
+    def _pheromone_alpha(layers):
+        # alpha as computed by Pheromone.draw, -1 for cells without a Pheromone
+        low, high = layers.stats.min, layers.stats.max
+        intensity = layers.intensity.reshape(-1)
+
+        if low is None or high == low:
+            alpha = full(intensity.size, 255, dtype=int16)
+
+        else:
+            alpha = ((intensity - low) / (high - low) * 255).astype(int16)
+
+        return where(layers.pheromone.reshape(-1), alpha, -1)
+
+    def _render_heatmap(self, simulation):
+        environment = simulation.environment
+        layers = environment.layers
+        rows, cols = environment.size
+
+        if self._image.get_size() != (cols, rows):
+            self._image = Surface((cols, rows))
+
+        # blend like a Pheromone surface with its alpha on the cell color, cells without one get -1
+        weight = clip(self._pheromone_alpha(layers), 0, 255).reshape(rows, cols, 1) / 255
+        colors = (1 - weight) * array(CELL_COLOR) + weight * array(PHEROMONE_COLOR)
+
+        blit_array(self._image, colors.astype(uint8).transpose(1, 0, 2))  # surfarrays are indexed by (x, y)
+        scale(self._image, self.background.get_size(), self.background)
+
+        environment.draw(flatnonzero((layers.occupancy != EMPTY) | layers.selected))
+
+        for ant in simulation.ants:
+            ant.draw()
+
+        if simulation.colony is not None:
+            for ant in simulation.colony:
+                ant.draw()
+
+        self.screen.blit(self.background, self.background.get_rect())
+        self._drawn = None  # the cells of the field were not drawn
+
+    def _render_all(self, simulation):
+        simulation.environment.draw()
+
+        for ant in simulation.ants:
+            ant.draw()
+
+        if simulation.colony is not None:
+            for ant in simulation.colony:
+                ant.draw()
+
+        self.screen.blit(self.background, self.background.get_rect())
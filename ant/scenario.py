@@ -0,0 +1,129 @@
+"""
+scenario
+********
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from struct import Struct
+
+from numpy import dtype
+from numpy import memmap
+from numpy import uint8
+from numpy import zeros
+
+from ant.errors import ScenarioError
+from ant.layers import OBSTACLE
+
+MAGIC = b'ANTS'
+VERSION = 1
+
+# magic, version, reserved, rows, cols
+HEADER = Struct('<4sHHII')
+
+AMOUNT = dtype('<u4')
+
+
+class Scenario:
+    """Predefined world of an Environment.
+
+    A scenario file is a 16 byte header (magic ANTS, version, rows and columns) followed by the occupancy
+    layer with one uint8 per cell (EMPTY, HOLE, NUTRIENT or OBSTACLE) and the nutrient amount layer with one
+    little endian uint32 per cell, aligned to four bytes. Both layers are in row major order. Loaded
+    scenarios are memory mapped, nothing is parsed per cell.
+
+    Args:
+        occupancy (:obj:`ndarray`): One of EMPTY, HOLE, NUTRIENT or OBSTACLE per cell, shape (rows, cols).
+        amount (:obj:`ndarray`, optional): Nutrient units per cell, zero by default.
+
+    Attributes:
+        occupancy (:obj:`ndarray`): One of EMPTY, HOLE, NUTRIENT or OBSTACLE per cell.
+        amount (:obj:`ndarray`): Nutrient units per cell.
+    """
+    def __init__(self, occupancy, amount=None):
+        if amount is None:
+            amount = zeros(occupancy.shape, dtype=AMOUNT)
+
+        if occupancy.ndim != 2 or occupancy.shape != amount.shape:
+            raise ScenarioError('Layers must be two dimensional and of equal shape')
+
+        self.occupancy = occupancy
+        self.amount = amount
+
+    @property
+    def size(self):
+        """:obj:`tuple(int, int)`: Number of rows and columns of the field."""
+        return self.occupancy.shape
+
+    @classmethod
+    def load(cls, path):
+        """Memory maps a scenario file.
+
+        Args:
+            path (:obj:`str`): Path of the scenario file.
+
+        Returns:
+            :obj:`Scenario`: The scenario, its layers are read only memory maps of the file.
+
+        Raises:
+            ScenarioError: If the file is not a scenario file or truncated.
+        """
+        with open(path, 'rb') as src:
+            header = src.read(HEADER.size)
+
+        if len(header) < HEADER.size:
+            raise ScenarioError('{} is not a scenario file'.format(path))
+
+        magic, version, _, rows, cols = HEADER.unpack(header)
+
+        if magic != MAGIC or version != VERSION:
+            raise ScenarioError('{} is not a scenario file of version {}'.format(path, VERSION))
+
+        try:
+            occupancy = memmap(path, dtype=uint8, mode='r', offset=HEADER.size, shape=(rows, cols))
+            amount = memmap(path, dtype=AMOUNT, mode='r', offset=_amount_offset(rows * cols), shape=(rows, cols))
+
+        except ValueError as err:
+            raise ScenarioError('{} is truncated'.format(path)) from err
+
+        if occupancy.size and occupancy.max() > OBSTACLE:
+            raise ScenarioError('{} has unknown occupancy codes'.format(path))
+
+        return cls(occupancy, amount)
+
+    @classmethod
+    def from_environment(cls, environment):
+        """Captures the Holes, Nutrients and Obstacles of an Environment.
+
+        Args:
+            environment (:obj:`Environment`): The environment.
+
+        Returns:
+            :obj:`Scenario`
+        """
+        layers = environment.layers
+        return cls(layers.occupancy.copy(), layers.amount.astype(AMOUNT))
+
+    def save(self, path):
+        """Writes the scenario to a file.
+
+        Args:
+            path (:obj:`str`): Path of the scenario file.
+        """
+        rows, cols = self.size
+        padding = _amount_offset(rows * cols) - HEADER.size - rows * cols
+
+        with open(path, 'wb') as dst:
+            dst.write(HEADER.pack(MAGIC, VERSION, 0, rows, cols))
+            dst.write(self.occupancy.astype(uint8).tobytes())
+            dst.write(bytes(padding))
+            dst.write(self.amount.astype(AMOUNT).tobytes())
+
+    def __repr__(self):
+        return '<{}(size={}) at {}>'.format(__class__.__name__, self.size, hex(id(self)))
+
+
+def _amount_offset(cells):
+    # the amount layer starts at the next multiple of its item size after the occupancy layer
+    end = HEADER.size + cells
+    return -(-end // AMOUNT.itemsize) * AMOUNT.itemsize
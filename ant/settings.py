@@ -5,9 +5,11 @@ settings
 :Author: tobijjah
 :Date: 07.05.2019
 """
-from numpy.random import RandomState
+SEED = 42
+""":obj:`int`: Default seed of the random streams of an Environment."""
 
-GLOBAL_RNG = RandomState(42)
+FPS = 60
+""":obj:`int`: Frame rate cap of the display, uncapped if zero."""
 
 # display colors
 BG_COLOR = 255, 255, 255  # white
@@ -0,0 +1,215 @@
+"""
+simulation
+**********
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from affine import Affine
+
+from ant.agents.colony import Colony
+from ant.environment import Environment
+from ant.observer import Signal
+from ant.settings import ALPHA
+from ant.settings import BETA
+from ant.settings import GAMMA
+from ant.settings import Q
+from ant.settings import RHO
+from ant.stepper import ColonyStepper
+
+
+class Simulation:
+    """Headless simulation of the ant colony model.
+
+    The Simulation holds the Environment and the colony state (Holes, Nutrients and Ants) and advances
+    the model tick by tick. Nothing is drawn unless a renderer is attached, therefore the model runs
+    without a display and as fast as the CPU allows.
+
+    Args:
+        size (:obj:`tuple(int, int)`, optional): Number of rows and columns of the Environment field.
+        neighbours (:obj:`int`, optional): Number of visible neighbour cells, four or eight.
+        torus (:obj:`bool`, optional): Environment is a torus.
+        renderer (:obj:`Renderer`, optional): Draws the simulation after each tick of run.
+        storage (:obj:`str`, optional): Storage mode of the Environment, cells or array.
+        rho (:obj:`float`, optional): Pheromone evaporation per tick (0 < rho < 1).
+        floor (:obj:`float`, optional): Evaporated Pheromones below this intensity are removed, never if None.
+        batched (:obj:`bool`, optional): Select the movement cells of all Ants in one vectorized step.
+        colony (:obj:`bool`, optional): Store the Ants spawned by populate in a structure of arrays Colony.
+        scenario (:obj:`Scenario`, optional): Predefined world to load, its size replaces size.
+        alpha (:obj:`float`, optional): Importance of pheromone deposit.
+        beta (:obj:`float`, optional): Importance move attractiveness.
+        gamma (:obj:`float`, optional): Pheromone init value.
+        q (:obj:`float`, optional): Pheromone increment of a deposit.
+        rng (:obj:`Generator` or :obj:`int` or :obj:`SeedSequence`, optional): Parent generator or seed of the
+            random streams of the Environment, SEED by default.
+        memory (:obj:`int`, optional): Maximal number of Cells an Ant remembers of its path, unbounded if None.
+
+    Attributes:
+        environment (:obj:`Environment`): The environment of the simulation.
+        renderer (:obj:`Renderer`): The attached renderer or None if headless.
+        ants (:obj:`list(Ant)`): The spawned Ant objects.
+        colony (:obj:`Colony`): The structure of arrays Ants or None.
+        holes (:obj:`list(Cell)`): Cells with a Hole.
+        nutrients (:obj:`list(Cell)`): Cells with a Nutrient.
+        ticks (:obj:`int`): Number of simulated ticks.
+        on_tick (:obj:`Signal`): Fired with the simulation after each tick, e.g. to write checkpoints.
+        profiler (:obj:`Profiler`): Times the phases of each tick if set, None by default.
+
+    Raises:
+        ValueError: If memory is smaller than one.
+    """
+    def __init__(self, size=(30, 30), neighbours=4, torus=False, renderer=None, storage='cells', rho=RHO,
+                 floor=GAMMA, batched=False, colony=False, scenario=None, alpha=ALPHA, beta=BETA, gamma=GAMMA, q=Q,
+                 rng=None, memory=None):
+        if memory is not None and memory < 1:
+            raise ValueError('An Ant has to remember at least one cell, got memory {}'.format(memory))
+
+        self.renderer = renderer
+
+        self._rho = rho
+        self._floor = floor
+        self._params = {'gamma': gamma, 'beta': beta, 'alpha': alpha, 'q': q, 'memory': memory}
+
+        if renderer is None:
+            # field coords equal display coords, cells and agents allocate no surfaces
+            transform, background = Affine.identity(), None
+
+        else:
+            transform, background = renderer.transform, renderer.background
+
+        if scenario is not None:
+            size = scenario.size
+
+        self.environment = Environment(transform, background, size, neighbours, torus, storage, gamma, rho, q, rng,
+                                       alpha)
+        self._stepper = ColonyStepper(self.environment, gamma, alpha, beta) if batched else None
+        self.colony = Colony(self.environment, gamma, alpha, beta, rho, q, memory=memory) if colony else None
+
+        self.ants = list()
+        self.holes = list()
+        self.nutrients = list()
+
+        self.ticks = 0
+        self.on_tick = Signal('tick')
+        self.profiler = None
+
+        if scenario is not None:
+            holes, nutrients = self.environment.load(scenario)
+
+            self.holes.extend(map(self.environment.get_flat_cell, holes.tolist()))
+            self.nutrients.extend(map(self.environment.get_flat_cell, nutrients.tolist()))
+
+    @property
+    def rho(self):
+        """:obj:`float`: Pheromone evaporation per tick."""
+        return self._rho
+
+    @property
+    def floor(self):
+        """:obj:`float`: Evaporated Pheromones below this intensity are removed, never if None."""
+        return self._floor
+
+    @property
+    def params(self):
+        """:obj:`dict`: The algorithm parameters gamma, beta, alpha, q and memory of the Ants."""
+        return dict(self._params)
+
+    @property
+    def batched(self):
+        """:obj:`bool`: The movement cells of all Ants are selected in one vectorized step."""
+        return self._stepper is not None
+
+    def populate(self, holes=1, nutrients=1, ants=1, amount=10000):
+        """Spawns Holes and Nutrients at random positions and Ants on the first Hole.
+
+        Args:
+            holes (:obj:`int`, optional): Number of Holes to spawn.
+            nutrients (:obj:`int`, optional): Number of Nutrients to spawn.
+            ants (:obj:`int`, optional): Number of Ants to spawn.
+            amount (:obj:`int`, optional): Nutrient units per Nutrient.
+
+        Raises:
+            EnvironmentFullError: If the field has no space left.
+        """
+        environment = self.environment
+
+        holes = environment.spawn_holes(holes)
+        nutrients = environment.spawn_nutrients(nutrients, amount)
+
+        self.holes.extend(map(environment.get_flat_cell, holes.tolist()))
+        self.nutrients.extend(map(environment.get_flat_cell, nutrients.tolist()))
+
+        if self.holes and self.colony is not None:
+            self.colony.spawn(self.holes[0], ants)
+
+        elif self.holes:
+            self.ants.extend(self.holes[0].spawn_ants(ants, **self._params))
+
+    def step(self, n=1):
+        """Advances the simulation.
+
+        Args:
+            n (:obj:`int`, optional): Number of ticks to simulate.
+        """
+        for _ in range(n):
+            if self.profiler is not None:
+                self.profiler.begin(self.ticks)
+
+            cells = self.nutrients + self.holes
+
+            # an Ant collides with the cells at its position before its move, other Ants do not matter
+            for ant in self.ants:
+                ant.collide(cells)
+
+            self._lap('collide')
+
+            if self._stepper is None:
+                for ant in self.ants:
+                    ant.move(self.environment.visible(ant))
+
+            else:
+                self._stepper.step(self.ants)
+
+            self._lap('move')
+
+            if self.colony is not None:
+                self.colony.step()
+                self._lap('colony')
+
+            self.environment.evaporate(self._rho, self._floor)
+            self.ticks += 1
+            self._lap('evaporate')
+
+            self.on_tick.fire(self)
+            self._lap('signal')
+
+    def run(self, until=None):
+        """Runs the simulation and renders each tick if a renderer is attached.
+
+        Args:
+            until (:obj:`int` or :obj:`callable`, optional): Stop at this tick or as soon as the callable
+                returns true for the simulation. Runs forever if None.
+        """
+        while not self._finished(until):
+            self.step()
+
+            if self.renderer is not None:
+                self.renderer.render(self)
+
+    def _lap(self, phase):
+        if self.profiler is not None:
+            self.profiler.lap(phase)
+
+    def _finished(self, until):
+        if until is None:
+            return False
+
+        if callable(until):
+            return until(self)
+
+        return self.ticks >= until
+
+    def __repr__(self):
+        return '<{}(environment={}, ants={}, ticks={}) at {}>'.format(
+            __class__.__name__, self.environment, len(self.ants), self.ticks, hex(id(self))
+        )
@@ -0,0 +1,199 @@
+"""
+stats
+*****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+
+from numpy import flatnonzero
+from numpy import float64
+from numpy import int64
+from numpy import zeros
+
+# below this evaporation scale the keys are recomputed from the intensities, long before float underflow
+MIN_SCALE = 1e-100
+
+
+class PheromoneStats:
+    """Current count, min, max and mean of the Pheromone intensities of a field.
+
+    The statistics follow each write instead of scanning the field. Intensities are kept as keys
+    relative to a common scale, evaporation multiplies only the scale and leaves the order of the
+    keys untouched. Min and max are the tops of two heaps of (key, stamp, cell) entries. Writing
+    or removing a cell bumps its stamp, outdated entries are dropped lazily when they reach the top
+    and the heaps are rebuilt once they hold more than twice the live entries. Updates are therefore
+    O(log n) amortized, evaporation is O(1) plus the removed cells.
+
+    Min and max are read from the intensity layer, they are exact.
+
+    Args:
+        intensity (:obj:`ndarray`): The intensity layer.
+    """
+    def __init__(self, intensity):
+        self._intensity = intensity.reshape(-1)
+        self._cols = intensity.shape[-1]
+
+        cells = self._intensity.size
+        self._key = zeros(cells, dtype=float64)
+        self._stamp = zeros(cells, dtype=int64)
+        self._live = zeros(cells, dtype=bool)
+
+        self._low = list()
+        self._high = list()
+        self._scale = 1.
+        self._count = 0
+        self._total = 0.
+
+    @property
+    def count(self):
+        """:obj:`int`: Number of Pheromones."""
+        return self._count
+
+    @property
+    def min(self):
+        """:obj:`float`: Lowest intensity, None without Pheromones."""
+        cell = self._top(self._low)
+        return None if cell is None else float(self._intensity[cell])
+
+    @property
+    def max(self):
+        """:obj:`float`: Highest intensity, None without Pheromones."""
+        cell = self._top(self._high)
+        return None if cell is None else float(self._intensity[cell])
+
+    @property
+    def mean(self):
+        """:obj:`float`: Mean intensity, None without Pheromones."""
+        return self._total * self._scale / self._count if self._count else None
+
+    def update(self, index, value):
+        """Records the intensity of a cell, adds the cell if it had no Pheromone.
+
+        Args:
+            index (:obj:`tuple(int, int)`): The (row, col) index of the cell.
+            value (:obj:`float`): The intensity.
+        """
+        self._set(index[0] * self._cols + index[1], value)
+        self._compact()
+
+    def update_many(self, cells, values):
+        """Records the intensities of many cells.
+
+        Args:
+            cells (:obj:`ndarray`): Unique flat field indices of the cells.
+            values (:obj:`ndarray`): The intensities.
+        """
+        for cell, value in zip(cells.tolist(), values.tolist()):
+            self._set(cell, value)
+
+        self._compact()
+
+    def remove(self, index):
+        """Removes the Pheromone of a cell.
+
+        Args:
+            index (:obj:`tuple(int, int)`): The (row, col) index of the cell.
+        """
+        cell = index[0] * self._cols + index[1]
+
+        if self._live[cell]:
+            self._live[cell] = False
+            self._stamp[cell] += 1
+            self._count -= 1
+            self._total -= self._key[cell]
+
+    def remove_many(self, mask):
+        """Removes the Pheromones of many cells.
+
+        Args:
+            mask (:obj:`ndarray`): True for the cells to remove, shaped like the field.
+        """
+        mask = mask.reshape(-1) & self._live
+
+        self._live[mask] = False
+        self._stamp[mask] += 1
+        self._count -= int(mask.sum())
+        self._total -= self._key[mask].sum()
+
+    def scale(self, factor):
+        """Multiplies all intensities by factor, e.g. (1 - rho) on evaporation.
+
+        Args:
+            factor (:obj:`float`): Positive factor.
+        """
+        self._scale *= factor
+
+        if self._scale < MIN_SCALE:
+            self.rebuild(self._live.copy())
+
+    def rebuild(self, pheromone):
+        """Recomputes the statistics from the intensity layer, e.g. after the layers were restored.
+
+        Args:
+            pheromone (:obj:`ndarray`): True for the cells with a Pheromone.
+        """
+        self._live[:] = pheromone.reshape(-1)
+        self._stamp += 1
+        self._scale = 1.
+
+        self._key[:] = 0
+        self._key[self._live] = self._intensity[self._live]
+
+        self._count = int(self._live.sum())
+        self._total = float(self._key.sum())
+
+        self._heapify()
+
+    def _set(self, cell, value):
+        key = value / self._scale
+        stamp = int(self._stamp[cell]) + 1
+
+        if self._live[cell]:
+            self._total += key - self._key[cell]
+
+        else:
+            self._live[cell] = True
+            self._count += 1
+            self._total += key
+
+        self._key[cell] = key
+        self._stamp[cell] = stamp
+
+        heappush(self._low, (key, stamp, cell))
+        heappush(self._high, (-key, stamp, cell))
+
+    def _top(self, heap):
+        while heap:
+            _, stamp, cell = heap[0]
+
+            if self._stamp[cell] == stamp:
+                return cell
+
+            heappop(heap)
+
+        return None
+
+    def _compact(self):
+        if len(self._low) + len(self._high) > 4 * self._count + 64:
+            self._heapify()
+
+    def _heapify(self):
+        cells = flatnonzero(self._live)
+        keys = self._key[cells].tolist()
+        stamps = self._stamp[cells].tolist()
+        cells = cells.tolist()
+
+        self._low = list(zip(keys, stamps, cells))
+        self._high = [(-key, stamp, cell) for key, stamp, cell in self._low]
+
+        heapify(self._low)
+        heapify(self._high)
+
+    def __repr__(self):
+        return '<{}(count={}, min={}, max={}) at {}>'.format(
+            __class__.__name__, self._count, self.min, self.max, hex(id(self))
+        )
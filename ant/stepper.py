@@ -0,0 +1,173 @@
+"""
+stepper
+*******
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from numpy import array
+from numpy import sqrt
+from numpy import tile
+from numpy import where
+
+from ant.agents.ant import BaseAnt
+from ant.layers import OBSTACLE
+from ant.settings import ALPHA
+from ant.settings import BETA
+from ant.settings import GAMMA
+
+
+class ColonyStepper:
+    """Moves all Ants of a colony in one vectorized step.
+
+    The per Ant path (SimpleAnt.move) computes the movement probabilities of each Ant in a Python
+    list and samples its movement cell with one uniform of the move stream per Ant. The stepper gathers
+    the neighbourhoods of all foraging Ants into arrays, computes the weights
+    pheromone**alpha * (1/distance)**beta for all of them at once and samples every movement cell
+    with one block of uniforms on the cumulative weights. Like on the per Ant path the pheromone term is
+    looked up in the weight layer of the field and the heuristic term of each neighbourhood rule is
+    computed once, only the long moves across the edges of a torus compute their distance. The
+    distribution of a movement cell equals the distribution of the per Ant path. All Ants select their
+    movement cells on the field state at the beginning of the step. Ants returning home with a nutrient
+    do not select and follow the per Ant path.
+
+    Args:
+        environment (:obj:`Environment`): The environment the Ants move in.
+        gamma (:obj:`float`, optional): Pheromone init value, must equal the gamma of the Ants.
+        alpha (:obj:`float`, optional): Importance of pheromone deposit, must equal the alpha of the Ants.
+        beta (:obj:`float`, optional): Importance move attractiveness, must equal the beta of the Ants.
+        streams (:obj:`RandomStreams`, optional): Random streams of the movement draw, those of the environment by
+            default.
+    """
+    def __init__(self, environment, gamma=GAMMA, alpha=ALPHA, beta=BETA, streams=None):
+        self._environment = environment
+        self._gamma = gamma
+        self._alpha = alpha
+        self._beta = beta
+        self._streams = environment.streams if streams is None else streams
+
+        # heuristic term per neighbourhood rule, a rule moves at most one cell per axis
+        self._heuristic = array([BaseAnt.heuristic(rule.x**2 + rule.y**2, beta) for rule in environment.rules])
+
+    def step(self, ants):
+        """Moves each Ant one cell.
+
+        Args:
+            ants (:obj:`list(SimpleAnt)`): The Ants to move.
+        """
+        foraging = [ant for ant in ants if not ant.mandible_full()]
+
+        if foraging:
+            neighbours, weights = self.weights(foraging)
+            selected = __class__.sample(weights, self._streams.uniforms(len(foraging)))
+
+        for ant in ants:
+            if ant.mandible_full():
+                ant.move(None)  # Ants with a nutrient trace back their path, they do not need cells
+
+        for idx, ant in enumerate(foraging):
+            rule = selected[idx]
+
+            if rule < 0:
+                ant.forage(None)
+
+            else:
+                ant.forage(self._environment.get_flat_cell(int(neighbours[idx, rule])))
+
+    def weights(self, ants):
+        """Computes the unnormalized movement weights of foraging Ants.
+
+        Args:
+            ants (:obj:`list(SimpleAnt)`): The foraging Ants.
+
+        Returns:
+            :obj:`tuple(ndarray, ndarray)`: The flat field indices of the neighbour cells and the movement
+            weights, each of shape (ants, neighbours). Not allowed cells weigh zero.
+        """
+        _, cols = self._environment.size
+
+        cells = array([ant.pos.y * cols + ant.pos.x for ant in ants])
+        neighbours, allowed = self.neighbourhood(cells)
+
+        # visited cells are not allowed, the current cell is visited by the upcoming move which forgets the
+        # oldest cell of a full trail
+        for idx, ant in enumerate(ants):
+            visited, current = ant.visited, int(cells[idx])
+
+            for rule, neighbour in enumerate(neighbours[idx].tolist()):
+                if visited.visits(neighbour, current):
+                    allowed[idx, rule] = False
+
+        return neighbours, self.attractiveness(cells, neighbours, allowed)
+
+    def neighbourhood(self, cells):
+        """Looks up the neighbour cells of many cells in the neighbour table.
+
+        Args:
+            cells (:obj:`ndarray`): Flat field indices of shape (n,).
+
+        Returns:
+            :obj:`tuple(ndarray, ndarray)`: The flat field indices of the neighbour cells and a mask which
+            is false for cells out of field or with an Obstacle, each of shape (n, neighbours).
+            Neighbours out of field are replaced by the cell itself.
+        """
+        neighbours = self._environment.neighbour_table[cells]
+        allowed = neighbours >= 0
+
+        neighbours = where(allowed, neighbours, cells[:, None])
+        allowed &= self._environment.layers.occupancy.reshape(-1)[neighbours] != OBSTACLE
+
+        return neighbours, allowed
+
+    def attractiveness(self, cells, neighbours, allowed):
+        """Computes pheromone**alpha * (1/distance)**beta for neighbour cells.
+
+        Args:
+            cells (:obj:`ndarray`): Flat field indices of the current cells of shape (n,).
+            neighbours (:obj:`ndarray`): Flat field indices of the neighbour cells of shape (n, neighbours).
+            allowed (:obj:`ndarray`): Mask of the allowed neighbour cells of shape (n, neighbours).
+
+        Returns:
+            :obj:`ndarray`: The weights, zero for not allowed cells.
+        """
+        _, cols = self._environment.size
+        layers = self._environment.layers
+
+        y, x = divmod(cells[:, None], cols)
+        ys, xs = divmod(neighbours, cols)
+
+        if self._alpha == layers.alpha and self._gamma == layers.gamma:
+            tau = layers.weight.reshape(-1)[neighbours]
+
+        else:
+            tau = where(layers.pheromone.reshape(-1)[neighbours], layers.intensity.reshape(-1)[neighbours], self._gamma)
+            tau = tau**self._alpha
+
+        # neighbours out of field are replaced by the cell itself, their weight is dropped anyway
+        squared = (xs - x)**2 + (ys - y)**2
+        eta = tile(self._heuristic, (squared.shape[0], 1))
+        wrapped = squared > 2
+
+        if wrapped.any():
+            eta[wrapped] = (1 / sqrt(squared[wrapped] + 0.0000001))**self._beta
+
+        weights = tau * eta
+
+        return where(allowed, weights, 0.)
+
+    @staticmethod
+    def sample(weights, uniforms):
+        """Samples one column per row proportional to the row weights.
+
+        Args:
+            weights (:obj:`ndarray`): Non negative weights of shape (n, m).
+            uniforms (:obj:`ndarray`): Uniform random numbers in [0, 1) of shape (n,).
+
+        Returns:
+            :obj:`ndarray`: The sampled column per row, -1 if all weights of a row are zero.
+        """
+        cumulative = weights.cumsum(axis=1)
+        total = cumulative[:, -1]
+        selected = (cumulative <= (uniforms * total)[:, None]).sum(axis=1)
+
+        return where(total > 0, selected, -1)
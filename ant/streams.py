@@ -0,0 +1,96 @@
+"""
+streams
+*******
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from numpy import array
+from numpy import concatenate
+from numpy import float64
+from numpy.random import Generator
+from numpy.random import default_rng
+
+from ant.settings import SEED
+
+
+class RandomStreams:
+    """Independent random streams of an Environment.
+
+    Both streams are children of one Generator. The spawn stream shuffles the field, orders vacated
+    cells and places the Ants on their cells, the move stream draws the movement of the Ants. Spawning
+    more agents therefore does not change how the Ants move. Movement uniforms are drawn in blocks,
+    single ones are handed out of the current block and many at once continue it, both consume the
+    same sequence.
+
+    Args:
+        rng (:obj:`Generator` or :obj:`int` or :obj:`SeedSequence`, optional): Parent generator or its seed,
+            SEED by default.
+        block (:obj:`int`, optional): Number of uniforms drawn per block.
+
+    Attributes:
+        spawn (:obj:`Generator`): Stream of the spawn positions, the free cell order and the Ant offsets.
+        move (:obj:`Generator`): Stream of the Ant movement.
+    """
+    def __init__(self, rng=None, block=1024):
+        if not isinstance(rng, Generator):
+            rng = default_rng(SEED if rng is None else rng)
+
+        self.spawn, self.move = rng.spawn(2)
+
+        self._block = block
+        self._buffer = list()
+        self._next = 0
+
+    @property
+    def state(self):
+        """:obj:`dict`: State of both streams and the undrawn uniforms of the block, serializable as JSON."""
+        return {
+            'spawn': self.spawn.bit_generator.state,
+            'move': self.move.bit_generator.state,
+            'buffer': self._buffer[self._next:],
+        }
+
+    @state.setter
+    def state(self, value):
+        self.spawn.bit_generator.state = value['spawn']
+        self.move.bit_generator.state = value['move']
+
+        self._buffer = list(value['buffer'])
+        self._next = 0
+
+    def uniform(self):
+        """Draws a uniform number of the move stream.
+
+        Returns:
+            :obj:`float`: Number in [0, 1).
+        """
+        if self._next == len(self._buffer):
+            self._buffer = self.move.random(self._block).tolist()
+            self._next = 0
+
+        value = self._buffer[self._next]
+        self._next += 1
+
+        return value
+
+    def uniforms(self, n):
+        """Draws many uniform numbers of the move stream at once.
+
+        Args:
+            n (:obj:`int`): Number of uniforms.
+
+        Returns:
+            :obj:`ndarray`: Numbers in [0, 1) of shape (n,).
+        """
+        buffered = array(self._buffer[self._next:self._next + n], dtype=float64)
+        self._next += buffered.size
+
+        if buffered.size == n:
+            return buffered
+
+        # the values follow the block in the stream, drawing them at once keeps the sequence
+        return concatenate([buffered, self.move.random(n - buffered.size)])
+
+    def __repr__(self):
+        return '<{}(block={}) at {}>'.format(__class__.__name__, self._block, hex(id(self)))
@@ -0,0 +1,94 @@
+"""
+writer
+******
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from queue import Queue
+from threading import Thread
+
+
+class BackgroundWriter:
+    """Runs write jobs one after another on a daemon thread.
+
+    The tick loop hands over already captured data and returns immediately, serialization and file
+    IO happen on the writer thread. If maxsize jobs are pending submit blocks until one finished,
+    a slow disk therefore throttles the simulation instead of growing the memory. An error of a job
+    is raised by the next call of submit, flush or close.
+
+    Args:
+        maxsize (:obj:`int`, optional): Maximal number of pending jobs, unbounded if zero.
+        name (:obj:`str`, optional): Name of the writer thread.
+    """
+    def __init__(self, maxsize=4, name='writer'):
+        self._jobs = Queue(maxsize)
+        self._error = None
+        self._closed = False
+
+        self._thread = Thread(target=self._work, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        """:obj:`bool`: The writer has unfinished jobs."""
+        return self._jobs.unfinished_tasks > 0
+
+    def submit(self, func, *args, **kwargs):
+        """Queues a job.
+
+        Args:
+            func (:obj:`callable`): The job, called on the writer thread.
+            *args: Positional arguments of func.
+            **kwargs: Keyword arguments of func.
+
+        Raises:
+            RuntimeError: If the writer is closed.
+        """
+        if self._closed:
+            raise RuntimeError('Writer is closed')
+
+        self._raise()
+        self._jobs.put((func, args, kwargs))
+
+    def flush(self):
+        """Blocks until all queued jobs are done."""
+        self._jobs.join()
+        self._raise()
+
+    def close(self):
+        """Finishes the queued jobs and stops the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._jobs.put(None)
+            self._thread.join()
+
+        self._raise()
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+
+            try:
+                if job is None:
+                    return
+
+                func, args, kwargs = job
+                func(*args, **kwargs)
+
+            except Exception as err:
+                self._error = err
+
+            finally:
+                self._jobs.task_done()
+
+    def _raise(self):
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
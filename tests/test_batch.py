@@ -0,0 +1,46 @@
+"""
+Module test_batch
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from unittest import TestCase
+
+from ant import batch
+from ant.settings import ALPHA
+
+
+class TestBatch(TestCase):
+    def test_grid(self):
+        sets = batch.grid(alpha=(1., 2.), size=((5, 5), (8, 8), (9, 9)))
+
+        self.assertEqual(6, len(sets))
+        self.assertEqual((1., (8, 8)), (sets[1]['alpha'], sets[1]['size']))
+        self.assertEqual(batch.PARAMETERS['rho'], sets[1]['rho'])
+
+    def test_grid_defaults(self):
+        self.assertEqual([batch.PARAMETERS], batch.grid())
+
+    def test_grid_unknown(self):
+        with self.assertRaises(ValueError):
+            batch.grid(delta=(1,))
+
+    def test_simulate(self):
+        row = batch.simulate({'size': (8, 8), 'ants': 3}, ticks=20, seed=1, index=2)
+
+        self.assertEqual((8, 8, 3, ALPHA), (row['rows'], row['cols'], row['ants'], row['alpha']))
+        self.assertEqual(20, row['tick'])
+        self.assertEqual(3, row['ants_foraging'] + row['ants_returning'])
+
+    def test_run_reproducible(self):
+        sets = batch.grid(size=((6, 6),), ants=(2, 4), beta=(.5, 2.))
+        rows = batch.run(sets, ticks=15, workers=2, seed=3)
+
+        self.assertEqual(list(range(4)), [row['index'] for row in rows])
+
+        for idx, row in enumerate(rows):
+            expected = batch.simulate(sets[idx], ticks=15, seed=3, index=idx)
+            del row['seconds'], expected['seconds']
+
+            self.assertEqual(expected, row)
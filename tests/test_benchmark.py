@@ -0,0 +1,42 @@
+"""
+Module test_benchmark
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import json
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+from ant import benchmark
+from ant.cli import main
+
+
+class TestBenchmark(TestCase):
+    def test_simulation(self):
+        result = benchmark.simulation((10, 10), 5, 8, True, ticks=5)
+
+        self.assertEqual(5, result['ticks'])
+        self.assertGreater(result['ticks_per_second'], 0)
+        self.assertGreater(result['peak_memory'], 0)
+        self.assertLessEqual(result['latency']['p50'], result['latency']['max'])
+
+    def test_hot_paths(self):
+        result = benchmark.hot_paths((10, 10), 4, False, calls=10)
+
+        for path in ['visible', 'move', 'pheromone_update', 'draw']:
+            self.assertGreater(result[path]['mean'], 0)
+
+    def test_run_matrix(self):
+        result = benchmark.run(sizes=[(5, 5)], ants=[1, 2], ticks=2, calls=2)
+
+        self.assertEqual(8, len(result['simulations']))
+        self.assertEqual(4, len(result['hot_paths']))
+
+    def test_cli(self):
+        result = CliRunner().invoke(main, ['bench', '-f', '5', '5', '-a', '1', '-tk', '2', '-c', '2'])
+
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(4, len(json.loads(result.output)['simulations']))
@@ -17,6 +17,8 @@ from ant.environment import Cell
 from ant.environment import Position
 from ant.errors import CellAgentError
 from ant.errors import CellOccupiedError
+from ant.layers import HOLE
+from ant.layers import FieldLayers
 
 
 class TestCell(TestCase):
@@ -118,6 +120,11 @@ class TestCell(TestCase):
         self.assertTrue(self.cell1.has_pheromone())
         self.assertTrue(isinstance(pheromone, Pheromone))
 
+    def test_standalone_pheromone_gamma(self):
+        pheromone = Pheromone(None, 1, 1, gamma=.25)
+
+        self.assertEqual(.25, pheromone.intensity)
+
     def test_spawn_pheromone_with_occupied_cell(self):
         self.cell1.spawn_pheromone()
 
@@ -134,6 +141,33 @@ class TestCell(TestCase):
 
         self.assertFalse(self.cell1.has_pheromone())
 
+    def test_state_in_layers(self):
+        layers = FieldLayers((3, 3))
+        cell = Cell(Position(2, 1), self.surface, self.rect, layers)
+        view = Cell(Position(2, 1), self.surface, self.rect, layers)
+
+        cell.spawn_hole()
+        self.assertEqual(HOLE, layers.occupancy[1, 2])
+        self.assertTrue(view.has_hole())
+        self.assertTrue(view.hole is cell.hole)
+
+        view.spawn_pheromone().intensity = 2.
+        self.assertEqual(2., cell.pheromone.intensity)
+
+        del cell.hole
+        self.assertFalse(view.has_hole())
+
+    def test_attraction(self):
+        layers = FieldLayers((3, 3), gamma=.5, alpha=2.)
+        cell = Cell(Position(2, 1), self.surface, self.rect, layers)
+
+        self.assertEqual(.25, cell.attraction(2., .5))
+        self.assertEqual(.125, cell.attraction(3., .5))  # parameters of the field differ, computed
+
+        cell.spawn_pheromone().intensity = 3.
+        self.assertEqual(9., cell.attraction(2., .5))
+        self.assertEqual(27., cell.attraction(3., 1.))
+
     def test_spawn_ant_on_holeless_cell(self):
         with self.assertRaises(CellAgentError):
             self.cell1.spawn_ant()
@@ -145,6 +179,26 @@ class TestCell(TestCase):
         self.assertTrue(isinstance(ant, SimpleAnt))
         self.assertTrue(ant.pos == self.cell1.pos)
 
+    def test_ant_home(self):
+        hole = self.cell1.spawn_hole().hole
+        other = self.cell2.spawn_hole().hole
+        ants = self.cell1.spawn_ants(3)
+
+        self.assertEqual(hole.id, ants[0].home)
+        self.assertEqual(3, hole.count)
+        self.assertTrue(hole.home(ants[1]))
+        self.assertFalse(other.home(ants[1]))
+
+    def test_spawn_ants(self):
+        with self.assertRaises(CellAgentError):
+            self.cell1.spawn_ants(2)
+
+        self.cell1.spawn_hole()
+        ants = self.cell1.spawn_ants(3)
+
+        self.assertEqual(3, len(ants))
+        self.assertEqual(ants, self.cell1.hole.ants)
+
     def test_has_hole(self):
         self.assertFalse(self.cell1.has_hole())
 
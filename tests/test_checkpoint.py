@@ -0,0 +1,80 @@
+"""
+Module test_checkpoint
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import array
+
+from ant import checkpoint
+from ant.simulation import Simulation
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'snapshot.npz')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertResumes(self, **kwargs):
+        simulation = Simulation((12, 12), **kwargs)
+        simulation.populate(holes=2, nutrients=2, ants=8, amount=20)
+        simulation.step(60)
+
+        checkpoint.write(self.path, checkpoint.capture(simulation))
+        simulation.step(100)
+
+        resumed = checkpoint.restore(self.path)
+        self.assertEqual(60, resumed.ticks)
+        resumed.step(100)
+
+        self.assertEqual([str(ant) for ant in simulation.ants], [str(ant) for ant in resumed.ants])
+        self.assertEqual(simulation.colony and simulation.colony.position.tolist(),
+                         resumed.colony and resumed.colony.position.tolist())
+        self.assertEqual([str(cell.hole) for cell in simulation.holes], [str(cell.hole) for cell in resumed.holes])
+        self.assertTrue((simulation.environment.layers.intensity == resumed.environment.layers.intensity).all())
+
+    def test_resume(self):
+        self.assertResumes()
+
+    def test_resume_batched_array(self):
+        self.assertResumes(batched=True, storage='array', neighbours=8, torus=True)
+
+    def test_resume_colony(self):
+        self.assertResumes(colony=True)
+
+    def test_resume_colony_memory(self):
+        self.assertResumes(colony=True, memory=3)
+
+    def test_version_mismatch(self):
+        state = checkpoint.capture(Simulation((5, 5)))
+        state['meta'] = array(json.dumps(dict(json.loads(str(state['meta'])), version=checkpoint.VERSION - 1)))
+        checkpoint.write(self.path, state)
+
+        with self.assertRaises(ValueError):
+            checkpoint.restore(self.path)
+
+    def test_info(self):
+        simulation = Simulation((7, 9))
+        checkpoint.write(self.path, checkpoint.capture(simulation))
+
+        self.assertEqual([7, 9], checkpoint.info(self.path)['size'])
+
+    def test_checkpointer(self):
+        simulation = Simulation((10, 10))
+        simulation.populate()
+
+        with checkpoint.Checkpointer(self.path, every=5) as checkpointer:
+            simulation.on_tick.connect(checkpointer)
+            simulation.step(5)
+
+        self.assertEqual(5, checkpoint.info(self.path)['ticks'])
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
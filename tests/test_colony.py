@@ -0,0 +1,141 @@
+"""
+Module test_colony
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from unittest import TestCase
+
+from affine import Affine
+
+from ant.agents.ant import BaseAnt
+from ant.agents.colony import Colony
+from ant.agents.colony import ColonyAnt
+from ant.environment import Environment
+from ant.environment import Position
+from ant.streams import RandomStreams
+
+
+class TestColony(TestCase):
+    def setUp(self):
+        self.environment = Environment(Affine.identity(), None, size=(10, 10), storage='array')
+        self.colony = Colony(self.environment, streams=RandomStreams(0), capacity=2)
+        self.hole = self.environment.get_cell(Position(5, 5)).spawn_hole()
+
+    def test_spawn(self):
+        indices = self.colony.spawn(self.hole, 5)
+
+        self.assertEqual([0, 1, 2, 3, 4], list(indices))
+        self.assertEqual(5, len(self.colony))
+        self.assertTrue((self.colony.position == 55).all())
+        self.assertTrue((self.colony.home == self.hole.hole.id).all())
+
+    def test_step(self):
+        self.colony.spawn(self.hole, 50)
+        self.colony.step()
+
+        for ant in self.colony:
+            self.assertEqual(1, abs(ant.pos.x - 5) + abs(ant.pos.y - 5))
+            self.assertEqual([self.hole], ant.visited)
+
+        self.assertTrue((self.colony.trail_length > .99).all())
+
+    def test_step_avoids_visited_and_obstacles(self):
+        for pos in [Position(5, 4), Position(4, 5), Position(6, 5)]:
+            self.environment.get_cell(pos).spawn_obstacle()
+
+        self.colony.spawn(self.hole, 10)
+        self.colony.step()
+        self.assertTrue(all(ant.pos == Position(5, 6) for ant in self.colony))
+
+        # the only way out is back to the hole which is visited, the ants are stuck
+        self.environment.get_cell(Position(5, 7)).spawn_obstacle()
+        self.environment.get_cell(Position(4, 6)).spawn_obstacle()
+        self.environment.get_cell(Position(6, 6)).spawn_obstacle()
+        self.colony.step()
+
+        self.assertTrue(all(ant.pos == Position(5, 5) for ant in self.colony))
+        self.assertTrue(all(ant.visited == [] for ant in self.colony))
+
+    def test_collect_and_return_home(self):
+        for pos in [Position(5, 4), Position(4, 5), Position(5, 6)]:
+            self.environment.get_cell(pos).spawn_obstacle()
+
+        nutrient = self.environment.get_cell(Position(6, 5)).spawn_nutrient(1)
+        self.colony.spawn(self.hole, 2)
+
+        self.colony.step()
+        self.assertEqual([1, 0], list(self.colony.mandible))
+        self.assertTrue(nutrient.nutrient.empty())
+
+        self.colony.step([0])
+        self.assertTrue(self.environment.get_cell(Position(6, 5)).has_pheromone())
+        self.assertEqual(Position(5, 5), self.colony[0].pos)
+        self.assertEqual(0, self.colony.mandible[0])
+        self.assertEqual(1, self.hole.hole.nutrients)
+
+    def test_memory(self):
+        colony = Colony(self.environment, streams=RandomStreams(0), memory=2)
+        colony.spawn(self.hole, 20)
+
+        for _ in range(10):
+            colony.step()
+            self.assertTrue(all(len(ant.visited) <= 2 for ant in colony))
+
+        with self.assertRaises(ValueError):
+            Colony(self.environment, memory=0)
+
+    def test_cut_short_returns_origin(self):
+        corridor = [Position(5, y) for y in range(5, 10)]
+
+        for y in range(10):
+            for x in range(10):
+                if Position(x, y) not in corridor:
+                    self.environment.get_cell(Position(x, y)).spawn_obstacle()
+
+        self.environment.get_cell(Position(5, 9)).spawn_nutrient(1)
+        colony = Colony(self.environment, streams=RandomStreams(0), memory=2)
+        colony.spawn(self.hole)
+
+        for _ in range(4):
+            colony.step()
+
+        self.assertEqual(1, colony.mandible[0])
+        self.assertEqual([Position(5, 7), Position(5, 8)], [cell.pos for cell in colony[0].visited])
+
+        for pos in [Position(5, 8), Position(5, 7), Position(5, 5)]:
+            colony.step()
+            self.assertEqual(pos, colony[0].pos)
+
+        self.assertEqual(1, self.hole.hole.nutrients)
+
+    def test_view(self):
+        self.colony.spawn(self.hole, 1)
+        ant = self.colony[0]
+
+        self.assertTrue(isinstance(ant, ColonyAnt))
+        self.assertTrue(isinstance(ant, BaseAnt))
+        self.assertFalse(ant.mandible_full())
+        self.assertEqual(Position(5, 5), ant.pos)
+        self.assertTrue(self.hole.hole.home(ant))
+
+        other = self.environment.get_cell(Position(0, 0)).spawn_hole()
+        self.assertFalse(other.hole.home(ant))
+
+        ant.move(None)
+        self.assertEqual(1, abs(ant.pos.x - 5) + abs(ant.pos.y - 5))
+
+    def test_getitem(self):
+        self.colony.spawn(self.hole, 3)
+
+        self.assertEqual(self.colony[2], self.colony[-1])
+        self.assertEqual([self.colony[1], self.colony[2]], self.colony[1:])
+        self.assertEqual(Position(5, 5), self.colony[0:2][1].pos)
+        self.assertIn('POS', str(self.colony[:1][0]))
+
+        with self.assertRaises(IndexError):
+            self.colony[3]
+
+        with self.assertRaises(TypeError):
+            self.colony[1.5]
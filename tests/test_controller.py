@@ -0,0 +1,58 @@
+"""
+Module test_controller
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import os
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest import TestCase
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from ant.controller import FAST_FORWARD_KEY
+from ant.controller import Controller
+from ant.profiler import Profiler
+
+
+class TestController(TestCase):
+    def controller(self, **kwargs):
+        return Controller((100, 100), (10, 10), 4, False, 10, 'simple', **kwargs)
+
+    def test_steps_per_frame(self):
+        controller = self.controller(steps=5)
+
+        self.assertEqual(5, controller.due(1.))
+        self.assertEqual(5, controller.due(0.))
+
+    def test_rate(self):
+        controller = self.controller(rate=30.)
+
+        self.assertEqual([0, 1, 3], [controller.due(elapsed) for elapsed in (.02, .02, .1)])
+        self.assertEqual(30, controller.due(10.))  # a slow frame catches up at most one second
+
+    def test_fast_forward_key(self):
+        controller = self.controller()
+
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=FAST_FORWARD_KEY, unicode='f'))
+        controller.event_loop()
+        self.assertTrue(controller.fast_forward)
+
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=FAST_FORWARD_KEY))
+        controller.event_loop()
+        self.assertFalse(controller.fast_forward)
+
+    def test_close_leaves_report_to_caller(self):
+        profiler = Profiler()
+        controller = self.controller(profiler=profiler)
+        controller.simulation.step(2)
+
+        with redirect_stderr(StringIO()) as stderr:
+            controller.close()
+
+        self.assertEqual('', stderr.getvalue())
+        self.assertEqual(2, profiler.ticks)
@@ -8,12 +8,17 @@ Module: test_environment
 from collections import namedtuple
 from unittest import TestCase
 from unittest.mock import Mock
+from unittest.mock import patch
 
 from affine import Affine
+from numpy import array
+from numpy import zeros
+from pygame import Surface
 
 from ant.environment import Cell
 from ant.environment import Environment
 from ant.environment import Position
+from ant.errors import CellOccupiedError
 from ant.errors import EnvironmentFullError
 from ant.errors import EnvironmentOutOfBoundsError
 
@@ -43,6 +48,52 @@ class TestEnvironment(TestCase):
         self.assertEqual(8, conn2.neighbours)
         self.assertEqual(8, len(conn2._rules))
 
+    def test_init_array_storage(self):
+        array = Environment(self.transform, None, size=(12, 8), storage='array')
+
+        self.assertIsNone(array._field)
+        self.assertEqual(12, len(array))
+        self.assertEqual(8, len(array[0]))
+        self.assertEqual((12, 8), array.layers.shape)
+
+    def test_array_storage_cell_view(self):
+        array = Environment(self.transform, None, storage='array')
+        cell = array.spawn_nutrient(amount=5)
+
+        view = array.get_cell(cell.pos)
+        self.assertTrue(view is not cell)
+        self.assertTrue(view == cell)
+        self.assertTrue(view.has_nutrient())
+
+        _ = view.nutrient.nutrient_unit
+        self.assertEqual(4, array.layers.amount[cell.pos.y, cell.pos.x])
+        self.assertEqual(4, cell.nutrient._amount)
+
+    def test_visible_skips_disabled_log(self):
+        environment = Environment(self.transform, None, size=(5, 5))
+        ant = environment.get_cell(Position(2, 2)).spawn_hole().spawn_ant()
+
+        with patch.object(Cell, '__str__') as formatted:
+            environment.visible(ant)  # debug is disabled by default
+
+        formatted.assert_not_called()
+
+    def test_interned_positions(self):
+        for storage in ['cells', 'array']:
+            environment = Environment(self.transform, None, size=(12, 8), storage=storage)
+
+            self.assertTrue(environment.get_flat_cell(13).pos is environment.get_flat_cell(13).pos)
+            self.assertTrue(environment.get_cell(Position(5, 1)).pos is environment.get_flat_position(13))
+
+    def test_array_storage_full_field(self):
+        array = Environment(self.transform, None, storage='array')
+        [array.spawn_obstacle() for i in range(100)]
+
+        self.assertTrue(array.layers.occupancy.all())
+
+        with self.assertRaises(EnvironmentFullError):
+            array.spawn_hole()
+
     def test_spawn_hole_full_field(self):
         [self.environment.spawn_hole() for i in range(100)]
 
@@ -79,6 +130,62 @@ class TestEnvironment(TestCase):
         self.assertTrue(isinstance(actual, Cell))
         self.assertTrue(actual.has_obstacle())
 
+    def test_spawn_bulk_count(self):
+        holes = self.environment.spawn_holes(2)
+        nutrients = self.environment.spawn_nutrients(3, amounts=7)
+        obstacles = self.environment.spawn_obstacles(95)
+
+        self.assertEqual(100, len(set(holes) | set(nutrients) | set(obstacles)))
+        self.assertTrue(all(self.environment.get_flat_cell(int(cell)).has_hole() for cell in holes))
+        self.assertTrue((self.environment.layers.amount.reshape(-1)[nutrients] == 7).all())
+
+        with self.assertRaises(EnvironmentFullError):
+            self.environment.spawn_obstacles(1)
+
+    def test_spawn_bulk_mask(self):
+        maze = zeros((10, 10), dtype=bool)
+        maze[2, :] = True
+
+        self.environment.spawn_obstacles(maze)
+        self.environment.spawn_nutrients([5, 6], amounts=[10, 20])
+
+        self.assertTrue(self.environment.get_cell(Position(4, 2)).has_obstacle())
+        self.assertEqual('Nutrient 20u', str(self.environment.get_flat_cell(6).nutrient))
+        self.assertEqual(88, self.environment.layers.free_count)
+
+        with self.assertRaises(CellOccupiedError):
+            self.environment.spawn_holes([5])
+
+        for _ in range(88):
+            self.assertFalse(self.environment.spawn_hole().has_obstacle())
+
+    def test_spawn_bulk_rejects(self):
+        with self.assertRaises(ValueError):
+            self.environment.spawn_holes(zeros((5, 20), dtype=bool))
+
+        with self.assertRaises(ValueError):
+            self.environment.spawn_holes(array([[1, 2], [3, 4]]))
+
+        with self.assertRaises(ValueError):
+            self.environment.spawn_holes([1.5])
+
+        with self.assertRaises(EnvironmentOutOfBoundsError):
+            self.environment.spawn_holes([-1])
+
+        with self.assertRaises(EnvironmentOutOfBoundsError):
+            self.environment.spawn_nutrients([3, 100])
+
+        self.assertEqual(100, self.environment.layers.free_count)
+        self.assertEqual(0, self.environment.spawn_obstacles([]).size)
+
+    def test_spawn_nutrients_rejects_amounts(self):
+        with self.assertRaises(ValueError):
+            self.environment.spawn_nutrients([1, 2, 3], amounts=[10, 20])
+
+        self.assertEqual(100, self.environment.layers.free_count)
+        self.assertFalse(self.environment.layers.occupancy.any())
+        self.assertFalse(self.environment.layers.amount.any())
+
     def test_visible_finite_4(self):
         expected = {Position(1, 0), Position(1, 2), Position(0, 1), Position(2, 1)}
         actual = [cell.pos for cell in self.environment.visible(self.mock(Position(1, 1)))]
@@ -171,6 +278,50 @@ class TestEnvironment(TestCase):
         self.assertTrue(len(actual) == 8)
         self.assertTrue(len(expected ^ set(actual)) == 0)
 
+    def test_neighbour_table(self):
+        table = self.environment.neighbour_table
+
+        self.assertEqual((100, 4), table.shape)
+        self.assertEqual([1, 10], sorted(table[0][table[0] >= 0]))
+        self.assertEqual(2, (table[0] < 0).sum())
+
+        self.environment.torus = True
+        self.assertEqual([1, 9, 10, 90], sorted(self.environment.neighbour_table[0]))
+
+    def test_neighbour_table_tiny_torus(self):
+        environment = Environment(self.transform, None, size=(2, 3), neighbours=8, torus=True)
+        table = environment.neighbour_table
+
+        for row in table:
+            valid = row[row >= 0]
+            self.assertEqual(len(valid), len(set(valid)))
+
+    def test_get_flat_cell(self):
+        self.assertTrue(self.environment.get_flat_cell(23).pos == Position(3, 2))
+
+        array = Environment(self.transform, None, storage='array')
+        self.assertTrue(array.get_flat_cell(23).pos == Position(3, 2))
+
+    def test_lazy_surfaces(self):
+        environment = Environment(Affine.scale(10), Surface((100, 100)))
+        cell = environment.get_cell(Position(2, 3)).spawn_nutrient(10)
+        cell.spawn_pheromone().update(1)
+
+        self.assertIsNone(cell._surface)
+        self.assertIsNone(cell.nutrient._surface)
+        self.assertTrue(all(other._surface is None for row in environment for other in row))
+
+        environment.draw()
+        self.assertIsNotNone(cell._surface)
+        self.assertIsNotNone(cell.pheromone._surface)
+        self.assertEqual((5, 5), cell.nutrient.rect.size)
+
+        environment.evaporate(.9, floor=1)
+        self.assertFalse(cell.has_pheromone())
+
+        cell.draw()
+        self.assertIsNone(cell._pheromone)
+
     def test_get_cell_valid_position(self):
         actual = self.environment.get_cell(Position(9, 9))
 
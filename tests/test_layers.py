@@ -0,0 +1,125 @@
+"""
+Module test_layers
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from unittest import TestCase
+
+from numpy import array
+from numpy.random import default_rng
+
+from ant.errors import CellOccupiedError
+from ant.layers import EMPTY
+from ant.layers import HOLE
+from ant.layers import NUTRIENT
+from ant.layers import OBSTACLE
+from ant.layers import FieldLayers
+
+
+class TestFieldLayers(TestCase):
+    def setUp(self):
+        self.layers = FieldLayers((3, 4), gamma=.5)
+
+    def test_init(self):
+        self.assertEqual((3, 4), self.layers.shape)
+        self.assertTrue((self.layers.occupancy == EMPTY).all())
+        self.assertTrue((self.layers.intensity == .5).all())
+        self.assertFalse(self.layers.pheromone.any())
+
+    def test_occupy(self):
+        self.layers.occupy((1, 2), HOLE)
+        self.assertEqual(HOLE, self.layers.occupancy[1, 2])
+
+        with self.assertRaises(CellOccupiedError):
+            self.layers.occupy((1, 2), NUTRIENT)
+
+    def test_vacate(self):
+        self.layers.occupy((0, 0), NUTRIENT)
+        self.layers.amount[0, 0] = 10
+
+        self.layers.vacate((0, 0), HOLE)
+        self.assertEqual(NUTRIENT, self.layers.occupancy[0, 0])
+
+        self.layers.vacate((0, 0), NUTRIENT)
+        self.assertEqual(EMPTY, self.layers.occupancy[0, 0])
+        self.assertEqual(0, self.layers.amount[0, 0])
+
+    def test_free_cells(self):
+        self.assertEqual(12, self.layers.free_count)
+        self.assertEqual(0, self.layers.free_cell())
+
+        self.layers.order_free(array([5, 2, 7, 0, 1, 3, 4, 6, 8, 9, 10, 11]))
+        self.assertEqual(5, self.layers.free_cell())
+
+        self.layers.occupy((0, 2), OBSTACLE)  # flat index 2, not the next free cell
+        self.layers.occupy((1, 1), NUTRIENT)
+        self.assertEqual(10, self.layers.free_count)
+        self.assertEqual(7, self.layers.free_cell())
+
+        self.layers.vacate((0, 2), OBSTACLE)
+        self.assertEqual(11, self.layers.free_count)
+        self.assertEqual(2, self.layers.free_cell())  # without rng a vacated cell is next
+
+    def test_free_cells_full(self):
+        self.layers.order_free(default_rng(0).permutation(12), default_rng(1))
+        taken = set()
+
+        while self.layers.free_cell() is not None:
+            index = self.layers.free_cell()
+            taken.add(index)
+            self.layers.occupy(divmod(index, 4), NUTRIENT)
+
+        self.assertEqual(set(range(12)), taken)
+        self.assertEqual(0, self.layers.free_count)
+
+        self.layers.vacate((2, 1), NUTRIENT)
+        self.assertEqual(9, self.layers.free_cell())
+
+    def test_remove_pheromone(self):
+        self.layers.pheromone[2, 3] = True
+        self.layers.intensity[2, 3] = 3.
+
+        self.layers.remove_pheromone((2, 3))
+
+        self.assertFalse(self.layers.pheromone[2, 3])
+        self.assertEqual(.5, self.layers.intensity[2, 3])
+
+    def test_evaporate(self):
+        self.layers.pheromone[0, 0] = True
+        self.layers.intensity[0, 0] = 2.
+
+        self.layers.evaporate(rho=.5)
+
+        self.assertEqual(1., self.layers.intensity[0, 0])
+        self.assertEqual(.5, self.layers.intensity[0, 1])  # cells without Pheromone keep gamma
+        self.assertTrue(self.layers.pheromone[0, 0])
+
+    def test_evaporate_floor(self):
+        self.layers.pheromone[0, 0] = self.layers.pheromone[1, 1] = True
+        self.layers.intensity[0, 0] = 2.
+        self.layers.intensity[1, 1] = 1.2
+
+        self.layers.evaporate(rho=.5, floor=.8)
+
+        self.assertEqual(1., self.layers.intensity[0, 0])
+        self.assertTrue(self.layers.pheromone[0, 0])
+        self.assertEqual(.5, self.layers.intensity[1, 1])
+        self.assertFalse(self.layers.pheromone[1, 1])
+
+    def test_weight(self):
+        layers = FieldLayers((2, 2), gamma=.5, alpha=2.)
+        self.assertTrue((layers.weight == .25).all())
+
+        layers.add_pheromone((0, 0))
+        layers.set_intensity((0, 0), 3.)
+        self.assertEqual(9., layers.weight[0, 0])
+        self.assertEqual(3., layers.stats.max)
+
+        layers.evaporate(rho=.5)
+        self.assertEqual(2.25, layers.weight[0, 0])
+        self.assertEqual(.25, layers.weight[0, 1])
+
+        layers.evaporate(rho=.5, floor=1.)
+        self.assertEqual(.25, layers.weight[0, 0])
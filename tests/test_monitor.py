@@ -0,0 +1,111 @@
+"""
+Module test_monitor
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import csv
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from ant.environment import Position
+from ant.monitor import CsvSink
+from ant.monitor import JsonLinesSink
+from ant.monitor import Monitor
+from ant.monitor import Tracer
+from ant.monitor import sink
+from ant.simulation import Simulation
+
+
+class TestMonitor(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.simulation = Simulation((10, 10))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_sample(self):
+        environment = self.simulation.environment
+        cell = environment.get_cell(Position(1, 1)).spawn_hole()
+        cell.hole.nutrients = 3
+        environment.get_cell(Position(5, 5)).spawn_nutrient(7)
+        environment.get_cell(Position(2, 2)).spawn_pheromone().update(1)
+        environment.get_cell(Position(3, 2)).spawn_pheromone().update(3)
+        self.simulation.ants.extend(cell.spawn_ants(2))
+        self.simulation.ants[0]._mandible = 1
+
+        record = Monitor.sample(self.simulation)
+
+        self.assertEqual(2, record['pheromone_count'])
+        self.assertLess(record['pheromone_min'], record['pheromone_max'])
+        self.assertAlmostEqual((record['pheromone_min'] + record['pheromone_max']) / 2, record['pheromone_mean'])
+        self.assertEqual(7, record['nutrient_remaining'])
+        self.assertEqual(1, record['nutrient_sites'])
+        self.assertEqual(1, record['ants_foraging'])
+        self.assertEqual(1, record['ants_returning'])
+        self.assertEqual(3, record['hole_{}'.format(cell.hole.id)])
+
+    def test_sample_empty(self):
+        record = Monitor.sample(self.simulation)
+
+        self.assertEqual(0, record['pheromone_count'])
+        self.assertIsNone(record['pheromone_max'])
+
+    def test_json_lines_every(self):
+        self.simulation.populate(holes=1, nutrients=1, ants=3, amount=5)
+
+        with Monitor(JsonLinesSink(self.path('metrics.jsonl')), every=5) as monitor:
+            self.simulation.on_tick.connect(monitor)
+            self.simulation.run(until=20)
+
+        with open(self.path('metrics.jsonl')) as src:
+            records = [json.loads(line) for line in src]
+
+        self.assertEqual([5, 10, 15, 20], [record['tick'] for record in records])
+
+    def test_csv(self):
+        self.simulation.populate(holes=1, nutrients=1, ants=3, amount=5)
+
+        with Monitor(CsvSink(self.path('metrics.csv')), every=2) as monitor:
+            self.simulation.on_tick.connect(monitor)
+            self.simulation.run(until=4)
+
+        with open(self.path('metrics.csv')) as src:
+            rows = list(csv.DictReader(src))
+
+        self.assertEqual(['2', '4'], [row['tick'] for row in rows])
+        self.assertEqual('3', rows[0]['ants_foraging'])
+
+    def test_sink(self):
+        csv_sink = sink(self.path('metrics.csv'))
+        jsonl_sink = sink(self.path('metrics.jsonl'))
+
+        self.assertIsInstance(csv_sink, CsvSink)
+        self.assertNotIsInstance(jsonl_sink, CsvSink)
+
+        csv_sink.close()
+        jsonl_sink.close()
+
+    def test_trace(self):
+        simulation = Simulation((10, 10), colony=True)
+        simulation.populate(ants=3)
+        simulation.ants.extend(simulation.holes[0].spawn_ants(2))
+
+        with Tracer(JsonLinesSink(self.path('trace.jsonl')), every=2) as tracer:
+            simulation.on_tick.connect(tracer)
+            simulation.step(4)
+            expected = [ant.pos.y * 10 + ant.pos.x for ant in simulation.ants] + simulation.colony.position.tolist()
+
+        with open(self.path('trace.jsonl')) as src:
+            records = [json.loads(line) for line in src]
+
+        self.assertEqual([2, 4], [record['tick'] for record in records])
+        self.assertEqual(expected, records[-1]['cells'])
+        self.assertEqual(5, len(records[-1]['loaded']))
@@ -31,3 +31,14 @@ class TestPosition(TestCase):
     def test_not_equal(self):
         self.assertFalse(self.pos1 == self.pos2)
         self.assertFalse(self.pos1 == 1)
+
+    def test_hash(self):
+        self.assertEqual(hash(self.pos1), hash(Position(1, 1)))
+        self.assertEqual(1, len({self.pos1, Position(1, 1)}))
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.pos1.x = 3
+
+        with self.assertRaises(AttributeError):
+            self.pos1.z = 3
@@ -0,0 +1,66 @@
+"""
+Module test_profiler
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import os
+import pstats
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from ant.profiler import Profiler
+from ant.renderer import Renderer
+from ant.simulation import Simulation
+
+
+class TestProfiler(TestCase):
+    def test_phases(self):
+        simulation = Simulation((10, 10), colony=True)
+        simulation.populate(ants=5)
+        simulation.profiler = Profiler()
+
+        simulation.step(4)
+
+        self.assertEqual(4, simulation.profiler.ticks)
+
+        for phase in ['collide', 'move', 'colony', 'evaporate', 'signal']:
+            self.assertEqual(4, simulation.profiler.calls[phase])
+            self.assertGreaterEqual(simulation.profiler.seconds[phase], 0.)
+
+        self.assertEqual(0, simulation.profiler.calls['draw'])
+        self.assertIn('evaporate', simulation.profiler.report())
+        self.assertNotIn('draw', simulation.profiler.report())
+
+    def test_render_phases(self):
+        renderer = Renderer((100, 100), (10, 10))
+        simulation = Simulation((10, 10), renderer=renderer)
+        simulation.populate(ants=2)
+        simulation.profiler = Profiler()
+
+        simulation.run(until=3)
+
+        self.assertEqual(3, simulation.profiler.calls['draw'])
+        self.assertEqual(3, simulation.profiler.calls['display'])
+
+    def test_window(self):
+        simulation = Simulation((10, 10))
+        simulation.populate(ants=2)
+
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'window.pstats')
+
+            with Profiler((2, 4), path) as profiler:
+                simulation.profiler = profiler
+                simulation.step(3)
+                self.assertFalse(os.path.exists(path))
+
+                simulation.step(2)
+                self.assertTrue(os.path.exists(path))
+
+            calls = [stat[1] for func, stat in pstats.Stats(path).stats.items() if func[2] == 'evaporate']
+            self.assertIn(2, calls)
+
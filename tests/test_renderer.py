@@ -0,0 +1,81 @@
+"""
+Module test_renderer
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import os
+from unittest import TestCase
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from ant.environment import Position
+from ant.renderer import Renderer
+from ant.simulation import Simulation
+
+
+class TestRenderer(TestCase):
+    def setUp(self):
+        self.renderer = Renderer((100, 100), (10, 10))
+        self.simulation = Simulation((10, 10), renderer=self.renderer)
+
+    def test_first_frame_dirty(self):
+        state = self.renderer.state(self.simulation)
+        self.assertTrue(self.renderer.dirty(state).all())
+
+    def test_unchanged_clean(self):
+        self.renderer.render(self.simulation)
+
+        state = self.renderer.state(self.simulation)
+        self.assertFalse(self.renderer.dirty(state).any())
+
+    def test_state_change_dirty(self):
+        self.renderer.render(self.simulation)
+
+        self.simulation.environment.get_cell(Position(3, 2)).spawn_obstacle()
+        self.simulation.environment.get_cell(Position(5, 5)).set_selected()
+
+        dirty = self.renderer.dirty(self.renderer.state(self.simulation))
+        self.assertEqual([23, 55], dirty.nonzero()[0].tolist())
+
+    def test_ant_move_dirty(self):
+        hole = self.simulation.environment.get_cell(Position(4, 4)).spawn_hole()
+        ant = hole.spawn_ant()
+        self.simulation.ants.append(ant)
+        self.renderer.render(self.simulation)
+
+        ant.move(self.simulation.environment.visible(ant))
+
+        dirty = self.renderer.dirty(self.renderer.state(self.simulation))
+        self.assertTrue(dirty[44])
+        self.assertTrue(dirty[ant.pos.y * 10 + ant.pos.x])
+
+    def test_incremental_equals_full(self):
+        self.simulation.populate(holes=1, nutrients=3, ants=10, amount=5)
+
+        for _ in range(20):
+            self.simulation.step()
+            self.renderer.render(self.simulation)
+
+        incremental = pygame.image.tostring(self.renderer.background, 'RGB')
+
+        self.renderer.incremental = False
+        self.renderer.render(self.simulation)
+
+        self.assertEqual(incremental, pygame.image.tostring(self.renderer.background, 'RGB'))
+
+    def test_heatmap(self):
+        hole = self.simulation.environment.get_cell(Position(1, 1)).spawn_hole()
+        trail = self.simulation.environment.get_cell(Position(7, 3))
+        trail.spawn_pheromone().update(.001)  # strongest Pheromone so far
+
+        self.renderer.heatmap = True
+        self.renderer.render(self.simulation)
+
+        background = self.renderer.background
+        self.assertEqual((255, 0, 0), tuple(background.get_at(trail.rect.center))[:3])
+        self.assertEqual((255, 255, 255), tuple(background.get_at((95, 95)))[:3])
+        self.assertNotEqual((255, 255, 255), tuple(background.get_at(hole.rect.center))[:3])
@@ -0,0 +1,109 @@
+"""
+Module test_scenario
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from affine import Affine
+from click.testing import CliRunner
+from numpy import array
+from numpy import uint8
+
+from ant.cli import main
+from ant.environment import Environment
+from ant.environment import Position
+from ant.errors import ScenarioError
+from ant.layers import HOLE
+from ant.layers import NUTRIENT
+from ant.layers import OBSTACLE
+from ant.scenario import Scenario
+from ant.simulation import Simulation
+
+
+class TestScenario(TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'world.ants')
+
+        occupancy = array([
+            [0, OBSTACLE, 0, 0, 0],
+            [HOLE, OBSTACLE, 0, NUTRIENT, 0],
+            [0, OBSTACLE, 0, 0, NUTRIENT],
+        ], dtype=uint8)
+        amount = array([
+            [0, 0, 0, 0, 0],
+            [0, 0, 0, 10, 0],
+            [0, 0, 0, 0, 20],
+        ])
+        self.scenario = Scenario(occupancy, amount)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_load(self):
+        self.scenario.save(self.path)
+        loaded = Scenario.load(self.path)
+
+        self.assertEqual((3, 5), loaded.size)
+        self.assertTrue((self.scenario.occupancy == loaded.occupancy).all())
+        self.assertTrue((self.scenario.amount == loaded.amount).all())
+
+    def test_load_malformed(self):
+        with open(self.path, 'wb') as dst:
+            dst.write(b'foo')
+
+        with self.assertRaises(ScenarioError):
+            Scenario.load(self.path)
+
+        self.scenario.save(self.path)
+
+        with open(self.path, 'r+b') as dst:
+            dst.truncate(30)
+
+        with self.assertRaises(ScenarioError):
+            Scenario.load(self.path)
+
+    def test_environment_load(self):
+        environment = Environment(Affine.identity(), None, size=(3, 5), storage='array')
+        holes, nutrients = environment.load(self.scenario)
+
+        self.assertEqual([5], holes.tolist())
+        self.assertEqual([8, 14], nutrients.tolist())
+        self.assertTrue(environment.get_cell(Position(1, 2)).has_obstacle())
+        self.assertEqual('Nutrient 20u', str(environment.get_flat_cell(14).nutrient))
+        self.assertEqual(9, environment.layers.free_count)
+
+        with self.assertRaises(ScenarioError):
+            Environment(Affine.identity(), None, size=(5, 3)).load(self.scenario)
+
+    def test_round_trip_environment(self):
+        simulation = Simulation(size=(3, 5), scenario=self.scenario)
+        self.assertEqual(1, len(simulation.holes))
+        self.assertEqual(2, len(simulation.nutrients))
+
+        Scenario.from_environment(simulation.environment).save(self.path)
+        loaded = Scenario.load(self.path)
+
+        self.assertTrue((self.scenario.occupancy == loaded.occupancy).all())
+        self.assertTrue((self.scenario.amount == loaded.amount).all())
+
+    def test_cli(self):
+        self.scenario.save(self.path)
+
+        with patch('ant.cli.Simulation', wraps=Simulation) as simulation:
+            result = CliRunner().invoke(main, ['--headless', '-tk', '3', '-sc', self.path])
+
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual('array', simulation.call_args.kwargs['storage'])
+        self.assertIn('after 3 ticks', result.output)
+
+        with patch('ant.cli.Simulation', wraps=Simulation) as simulation:
+            CliRunner().invoke(main, ['--headless', '-tk', '1', '-sc', self.path, '-st', 'cells'])
+
+        self.assertEqual('cells', simulation.call_args.kwargs['storage'])
@@ -0,0 +1,86 @@
+"""
+Module test_simulation
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from unittest import TestCase
+from unittest.mock import Mock
+
+from ant.simulation import Simulation
+
+
+class TestSimulation(TestCase):
+    def setUp(self):
+        self.simulation = Simulation(size=(10, 10))
+
+    def test_headless(self):
+        self.assertIsNone(self.simulation.renderer)
+
+        for row in self.simulation.environment:
+            for cell in row:
+                self.assertIsNone(cell.surface)
+
+    def test_populate(self):
+        self.simulation.populate(holes=2, nutrients=3, ants=4, amount=10)
+
+        self.assertEqual(2, len(self.simulation.holes))
+        self.assertEqual(3, len(self.simulation.nutrients))
+        self.assertEqual(4, len(self.simulation.ants))
+        self.assertTrue(all(ant.pos == self.simulation.holes[0].pos for ant in self.simulation.ants))
+
+    def test_step(self):
+        self.simulation.populate(ants=3)
+        self.simulation.step(5)
+
+        self.assertEqual(5, self.simulation.ticks)
+
+    def test_run_until_tick(self):
+        self.simulation.populate()
+        self.simulation.run(until=7)
+
+        self.assertEqual(7, self.simulation.ticks)
+
+    def test_run_until_callable(self):
+        self.simulation.populate()
+        self.simulation.run(until=lambda simulation: simulation.ticks == 3)
+
+        self.assertEqual(3, self.simulation.ticks)
+
+    def test_run_with_renderer(self):
+        renderer = Mock()
+        renderer.background = None
+        renderer.transform = self.simulation.environment._transform
+
+        simulation = Simulation(size=(10, 10), renderer=renderer)
+        simulation.populate()
+        simulation.run(until=4)
+
+        self.assertEqual(4, renderer.render.call_count)
+
+    def test_step_evaporates(self):
+        simulation = Simulation(size=(10, 10), rho=.5, floor=None)
+        layers = simulation.environment.layers
+        layers.pheromone[0, 0] = True
+        layers.intensity[0, 0] = 1.
+
+        simulation.step(2)
+
+        self.assertEqual(.25, layers.intensity[0, 0])
+
+    def test_step_batched(self):
+        simulation = Simulation(size=(10, 10), batched=True)
+        simulation.populate(ants=5)
+        simulation.step(3)
+
+        self.assertEqual(3, simulation.ticks)
+        self.assertTrue(all(len(ant.visited) == 3 for ant in simulation.ants if not ant.mandible_full()))
+
+    def test_step_colony(self):
+        simulation = Simulation(size=(10, 10), colony=True)
+        simulation.populate(ants=5)
+        simulation.step(3)
+
+        self.assertEqual([], simulation.ants)
+        self.assertEqual(5, len(simulation.colony))
@@ -0,0 +1,133 @@
+"""
+Module test_stats
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from unittest import TestCase
+
+from numpy import array
+from numpy.random import RandomState
+
+from ant.layers import FieldLayers
+from ant.simulation import Simulation
+
+
+class TestPheromoneStats(TestCase):
+    def setUp(self):
+        self.layers = FieldLayers((4, 5))
+        self.stats = self.layers.stats
+
+    def deposit(self, index, value):
+        self.layers.add_pheromone(index)
+        self.layers.intensity[index] = value
+        self.stats.update(index, value)
+
+    def test_empty(self):
+        self.assertEqual(0, self.stats.count)
+        self.assertIsNone(self.stats.min)
+        self.assertIsNone(self.stats.max)
+        self.assertIsNone(self.stats.mean)
+
+    def test_update(self):
+        self.deposit((0, 0), 2.)
+        self.deposit((1, 2), 5.)
+        self.deposit((3, 4), 3.)
+
+        self.assertEqual(3, self.stats.count)
+        self.assertEqual(2., self.stats.min)
+        self.assertEqual(5., self.stats.max)
+        self.assertAlmostEqual(10 / 3, self.stats.mean)
+
+    def test_overwrite_shrinks(self):
+        self.deposit((0, 0), 2.)
+        self.deposit((1, 2), 5.)
+        self.deposit((1, 2), 1.)
+
+        self.assertEqual(2, self.stats.count)
+        self.assertEqual(1., self.stats.min)
+        self.assertEqual(2., self.stats.max)
+
+    def test_remove(self):
+        self.deposit((0, 0), 2.)
+        self.deposit((1, 2), 5.)
+        self.layers.remove_pheromone((1, 2))
+
+        self.assertEqual(1, self.stats.count)
+        self.assertEqual(2., self.stats.max)
+
+    def test_evaporate(self):
+        self.deposit((0, 0), .1)
+        self.deposit((1, 2), 1.)
+        self.layers.evaporate(.5, floor=.06)
+
+        self.assertEqual(1, self.stats.count)
+        self.assertEqual(.5, self.stats.min)
+        self.assertEqual(.5, self.stats.max)
+        self.assertEqual(.5, self.stats.mean)
+
+    def test_long_evaporation(self):
+        self.deposit((0, 0), 1.)
+
+        for _ in range(50):
+            self.layers.evaporate(.99)
+
+        self.deposit((2, 2), 1.)
+
+        self.assertEqual(self.layers.intensity[0, 0], self.stats.min)
+        self.assertEqual(1., self.stats.max)
+
+    def test_random_against_scan(self):
+        rng = RandomState(0)
+
+        for _ in range(500):
+            index = tuple(rng.randint((4, 5)))
+            action = rng.randint(4)
+
+            if action == 0:
+                self.layers.remove_pheromone(index)
+
+            elif action == 1:
+                self.layers.evaporate(.1, floor=.05)
+
+            else:
+                self.deposit(index, rng.rand())
+
+            values = self.layers.intensity[self.layers.pheromone]
+            self.assertEqual(values.size, self.stats.count)
+
+            if values.size:
+                self.assertEqual(values.min(), self.stats.min)
+                self.assertEqual(values.max(), self.stats.max)
+                self.assertAlmostEqual(values.mean(), self.stats.mean)
+
+        self.assertLessEqual(len(self.stats._low), 4 * self.stats.count + 64)
+
+    def test_update_many(self):
+        self.layers.pheromone[0, :3] = True
+        self.layers.intensity[0, :3] = [3., 1., 2.]
+        self.stats.update_many(array([0, 1, 2]), self.layers.intensity[0, :3])
+
+        self.assertEqual(3, self.stats.count)
+        self.assertEqual(1., self.stats.min)
+        self.assertEqual(3., self.stats.max)
+
+    def test_rebuild(self):
+        self.layers.pheromone[2, 1:3] = True
+        self.layers.intensity[2, 1:3] = [4., 6.]
+        self.stats.rebuild(self.layers.pheromone)
+
+        self.assertEqual(2, self.stats.count)
+        self.assertEqual(4., self.stats.min)
+        self.assertEqual(5., self.stats.mean)
+
+    def test_environment_scoped(self):
+        first = Simulation((5, 5))
+        second = Simulation((5, 5))
+
+        first.environment.get_flat_cell(0).spawn_pheromone().update(100)
+        second.environment.get_flat_cell(0).spawn_pheromone().update(1)
+
+        self.assertLess(first.environment.layers.stats.max, .1)
+        self.assertGreater(second.environment.layers.stats.max, .9)
@@ -0,0 +1,97 @@
+"""
+Module test_stepper
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from unittest import TestCase
+
+from affine import Affine
+from numpy import array
+from numpy import isclose
+
+from ant.environment import Environment
+from ant.environment import Position
+from ant.simulation import Simulation
+from ant.stepper import ColonyStepper
+from ant.streams import RandomStreams
+
+
+class TestColonyStepper(TestCase):
+    def setUp(self):
+        self.environment = Environment(Affine.identity(), None, size=(10, 10), neighbours=8)
+        self.stepper = ColonyStepper(self.environment, streams=RandomStreams(0))
+
+        self.hole = self.environment.get_cell(Position(5, 5)).spawn_hole()
+        self.environment.get_cell(Position(4, 4)).spawn_obstacle()
+        self.environment.get_cell(Position(6, 5)).spawn_pheromone().intensity = .5
+        self.environment.get_cell(Position(5, 6)).spawn_pheromone().intensity = .2
+
+    def test_sample(self):
+        weights = array([[0., 1., 0.], [1., 0., 3.], [0., 0., 0.]])
+
+        actual = ColonyStepper.sample(weights, array([.7, .5, .3]))
+
+        self.assertEqual([1, 2, -1], list(actual))
+
+    def test_weights_equal_probabilities(self):
+        ant = self.hole.spawn_ant()
+
+        neighbours, weights = self.stepper.weights([ant])
+        expected = weights[0] / weights[0].sum()
+        xs, ys = neighbours % 10, neighbours // 10
+
+        ant.visited.append(ant._current_cell)
+        ant._allowed_cells(self.environment.visible(ant))
+        moves = ant._weights(ant._current_cell)
+        probabilities = dict(zip([cell.pos for cell in ant._allowed], [move / sum(moves) for move in moves]))
+
+        self.assertEqual(7, len(probabilities))
+        self.assertEqual(0, expected[list(zip(xs[0], ys[0])).index((4, 4))])
+
+        for x, y, p in zip(xs[0], ys[0], expected):
+            self.assertTrue(isclose(probabilities.get(Position(int(x), int(y)), 0.), p))
+
+    def test_weights_exclude_visited(self):
+        ant = self.hole.spawn_ant()
+        ant.visited.append(self.environment.get_cell(Position(6, 5)))
+
+        neighbours, weights = self.stepper.weights([ant])
+
+        self.assertEqual(0, weights[0][list(neighbours[0]).index(56)])
+
+    def test_step(self):
+        ants = [self.hole.spawn_ant() for _ in range(20)]
+
+        self.stepper.step(ants)
+
+        for ant in ants:
+            self.assertTrue(max(abs(ant.pos.x - 5), abs(ant.pos.y - 5)) == 1)
+            self.assertTrue(ant.pos != Position(4, 4))
+            self.assertEqual([self.hole], list(ant.visited))
+
+    def test_weights_forget_oldest(self):
+        ant = self.hole.spawn_ant(memory=1)
+        ant.move(self.environment.visible(ant))
+
+        # the hole is forgotten by the upcoming move, the Ant may walk back
+        neighbours, weights = self.stepper.weights([ant])
+
+        self.assertLess(0, weights[0][list(neighbours[0]).index(55)])
+
+    def test_step_equals_per_ant_path_with_memory(self):
+        paths = []
+
+        for batched in [False, True]:
+            simulation = Simulation((20, 20), batched=batched, rng=7, memory=1)
+            simulation.populate(ants=1)
+            path = []
+
+            for _ in range(30):
+                simulation.step()
+                path.append(simulation.ants[0].pos)
+
+            paths.append(path)
+
+        self.assertEqual(paths[0], paths[1])
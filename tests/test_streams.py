@@ -0,0 +1,61 @@
+"""
+Module test_streams
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+import json
+from unittest import TestCase
+
+from numpy import array
+
+from ant.simulation import Simulation
+from ant.streams import RandomStreams
+
+
+class TestRandomStreams(TestCase):
+    def test_seeded(self):
+        self.assertEqual(RandomStreams(7).uniforms(5).tolist(), RandomStreams(7).uniforms(5).tolist())
+        self.assertNotEqual(RandomStreams(7).uniforms(5).tolist(), RandomStreams(8).uniforms(5).tolist())
+
+    def test_spawn_independent_of_move(self):
+        streams = RandomStreams(3)
+        streams.spawn.random(100)
+
+        self.assertEqual(RandomStreams(3).uniforms(4).tolist(), streams.uniforms(4).tolist())
+
+    def test_block_sequence(self):
+        single = RandomStreams(1, block=4)
+        mixed = RandomStreams(1, block=4)
+
+        expected = [single.uniform() for _ in range(11)]
+        drawn = [mixed.uniform()] + mixed.uniforms(2).tolist() + [mixed.uniform()] + mixed.uniforms(7).tolist()
+
+        self.assertEqual(expected, drawn)
+
+    def test_state(self):
+        streams = RandomStreams(5, block=8)
+        streams.uniform()
+
+        state = json.loads(json.dumps(streams.state))
+        expected = (streams.uniforms(20).tolist(), streams.spawn.random())
+
+        restored = RandomStreams(0)
+        restored.state = state
+
+        self.assertEqual(expected, (restored.uniforms(20).tolist(), restored.spawn.random()))
+
+    def test_simulations_independent(self):
+        def positions(seed, other=None):
+            simulation = Simulation((10, 10), rng=seed)
+            simulation.populate(ants=5)
+
+            if other is not None:
+                other.populate(ants=5)  # interleaved simulation must not disturb the streams
+                other.step(10)
+
+            simulation.step(10)
+            return array([(ant.pos.x, ant.pos.y) for ant in simulation.ants]).tolist()
+
+        self.assertEqual(positions(4), positions(4, Simulation((10, 10), rng=4)))
@@ -0,0 +1,185 @@
+"""
+Module test_trail
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from unittest import TestCase
+
+from affine import Affine
+from numpy import arange
+from numpy import array
+
+from ant.agents.ant import BaseAnt
+from ant.agents.trail import Trail
+from ant.agents.trail import TrailSet
+from ant.environment import Environment
+from ant.environment import Position
+from ant.simulation import Simulation
+
+
+class TestTrail(TestCase):
+    def setUp(self):
+        self.environment = Environment(Affine.identity(), None, size=(5, 5))
+        self.cells = [self.environment.get_cell(Position(x, 0)) for x in range(5)]
+
+    def test_membership(self):
+        trail = Trail(self.environment.get_flat_cell)
+        trail.append(self.cells[0])
+        trail.append(self.cells[1])
+
+        self.assertIn(self.cells[1], trail)
+        self.assertNotIn(self.cells[2], trail)
+        self.assertTrue(trail.visits(1))
+        self.assertFalse(trail.visits(2))
+
+    def test_pop_order(self):
+        trail = Trail(self.environment.get_flat_cell)
+
+        for cell in self.cells[:3]:
+            trail.append(cell)
+
+        self.assertEqual(self.cells[2], trail.pop())
+        self.assertNotIn(self.cells[2], trail)
+        self.assertEqual(self.cells[:2], list(trail))
+
+    def test_visits_after_append(self):
+        trail = Trail(self.environment.get_flat_cell, capacity=2)
+        trail.append(self.cells[0])
+        trail.append(self.cells[1])
+
+        self.assertTrue(trail.visits(0))
+        self.assertFalse(trail.visits(0, append=2))
+        self.assertTrue(trail.visits(1, append=2))
+        self.assertTrue(trail.visits(2, append=2))
+
+    def test_revisit_counted(self):
+        trail = Trail(self.environment.get_flat_cell)
+        trail.append(self.cells[0])
+        trail.append(self.cells[1])
+        trail.append(self.cells[0])
+        trail.pop()
+
+        self.assertIn(self.cells[0], trail)
+
+    def test_capacity(self):
+        trail = Trail(self.environment.get_flat_cell, capacity=2)
+
+        for cell in self.cells[:4]:
+            trail.append(cell)
+
+        self.assertEqual(self.cells[2:4], list(trail))
+        self.assertNotIn(self.cells[0], trail)
+        self.assertEqual((self.cells[0], 2), (trail.origin, trail.forgotten))
+
+    def test_widen(self):
+        environment = Environment(Affine.identity(), None, size=(5, 8), storage='array')
+        cells = [environment.get_flat_cell(index) for index in range(40)]
+        trail = Trail(environment.get_flat_cell)
+
+        for cell in cells:
+            trail.append(cell)
+
+        self.assertEqual(cells, list(trail))
+        self.assertEqual(cells[::-1], [trail.pop() for _ in range(40)])
+
+    def test_ring_order(self):
+        trail = Trail(self.environment.get_flat_cell, capacity=3)
+
+        for cell in self.cells + self.cells[:2]:
+            trail.append(cell)
+
+        self.assertEqual([self.cells[4], self.cells[0], self.cells[1]], list(trail))
+        self.assertEqual(self.cells[1], trail.pop())
+        self.assertEqual([self.cells[4], self.cells[0]], list(trail))
+
+    def test_cut_short_returns_origin(self):
+        trail = Trail(self.environment.get_flat_cell, capacity=2)
+
+        for cell in self.cells[:4]:
+            trail.append(cell)
+
+        popped = [trail.pop() for _ in range(3)]
+
+        self.assertEqual([self.cells[3], self.cells[2], self.cells[0]], popped)
+        self.assertEqual(0, trail.forgotten)
+
+        with self.assertRaises(IndexError):
+            trail.pop()
+
+    def test_new_trip_new_origin(self):
+        trail = Trail(self.environment.get_flat_cell)
+        trail.append(self.cells[0])
+        trail.pop()
+        trail.append(self.cells[3])
+
+        self.assertEqual(self.cells[3], trail.origin)
+
+    def test_capacity_too_small(self):
+        with self.assertRaises(ValueError):
+            Trail(self.environment.get_flat_cell, capacity=0)
+
+        instances = BaseAnt.INSTANCES
+        hole = self.environment.get_cell(Position(2, 2)).spawn_hole()
+
+        with self.assertRaises(ValueError):
+            hole.spawn_ant(memory=0)
+
+        self.assertEqual(instances, BaseAnt.INSTANCES)
+
+        with self.assertRaises(ValueError):
+            Simulation((5, 5), memory=0)
+
+    def test_clear(self):
+        trail = Trail(self.environment.get_flat_cell, capacity=1)
+        trail.append(self.cells[0])
+        trail.append(self.cells[1])
+        trail.clear()
+
+        self.assertEqual(0, len(trail))
+        self.assertEqual((None, 0), (trail.origin, trail.forgotten))
+
+    def test_ant_memory(self):
+        hole = self.environment.get_cell(Position(2, 2)).spawn_hole()
+        ant = hole.spawn_ant(memory=3)
+
+        for _ in range(10):
+            ant.move(self.environment.visible(ant))
+
+            if ant.mandible_full():
+                break
+
+            self.assertLessEqual(len(ant.visited), 3)
+
+
+class TestTrailSet(TestCase):
+    def test_membership(self):
+        visits = TrailSet()
+        visits.add(array([3, 7, 7]))
+
+        self.assertEqual([False, True, True], visits.contains(array([0, 3, 7])).tolist())
+        self.assertEqual((2, 2), visits.contains(array([[3, 4], [7, 8]])).shape)
+
+        visits.remove(array([7]))
+        self.assertTrue(visits.contains(array([7]))[0])
+
+        visits.remove(array([7, 3, 11]))
+        self.assertFalse(visits.contains(array([3, 7])).any())
+        self.assertEqual(0, len(visits))
+
+    def test_rebuild(self):
+        visits = TrailSet(capacity=4)
+        visits.add(arange(1000))
+        visits.remove(arange(0, 1000, 2))
+
+        self.assertEqual(500, len(visits))
+        self.assertEqual((arange(1000) % 2 == 1).tolist(), visits.contains(arange(1000)).tolist())
+
+    def test_clear(self):
+        visits = TrailSet()
+        visits.add(arange(10))
+        visits.clear()
+
+        self.assertEqual(0, len(visits))
+        self.assertFalse(visits.contains(arange(10)).any())
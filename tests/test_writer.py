@@ -0,0 +1,39 @@
+"""
+Module test_writer
+****
+
+:Author: tobijjah
+:Date: 18.10.26
+"""
+from threading import get_ident
+from unittest import TestCase
+
+from ant.writer import BackgroundWriter
+
+
+class TestBackgroundWriter(TestCase):
+    def test_jobs_in_order_on_thread(self):
+        done = list()
+
+        with BackgroundWriter() as writer:
+            for idx in range(10):
+                writer.submit(lambda value: done.append((value, get_ident())), idx)
+
+        self.assertEqual(list(range(10)), [value for value, _ in done])
+        self.assertNotIn(get_ident(), {thread for _, thread in done})
+
+    def test_error_raised_on_flush(self):
+        writer = BackgroundWriter()
+        writer.submit(lambda: 1 / 0)
+
+        with self.assertRaises(ZeroDivisionError):
+            writer.flush()
+
+        writer.close()
+
+    def test_closed(self):
+        writer = BackgroundWriter()
+        writer.close()
+
+        with self.assertRaises(RuntimeError):
+            writer.submit(print)